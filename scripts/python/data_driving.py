@@ -1,7 +1,5 @@
 import argparse
-import cv2
 import sys
-import time
 
 from datetime import datetime
 from pathlib import Path
@@ -11,17 +9,24 @@ from src.constants import CameraResolution
 from src.driving.can import CANController, get_can_bus
 from src.driving.gamepad import Gamepad
 from src.driving.modes import ManualDriving
+from src.utils.capture import CaptureWriter
+from src.utils.chunk_store import RecordEncoding
 from src.utils.video_stream import VideoStream
 
 
-def start_collecting(all_cameras: bool = False) -> None:
+def start_collecting(
+        all_cameras: bool = False,
+        encoding: RecordEncoding = RecordEncoding.JPEG,
+        quality: int | None = None
+) -> None:
     """Start collecting data.
 
     :param all_cameras: Whether to use all available cameras (left, center, right).
+    :param encoding: The encoding of the captured frames.
+    :param quality: The JPEG quality or PNG compression level.
     """
     folder_name = datetime.now().strftime("%m_%d_%Y_%H_%M_%S")
-    folder = Path("./data/images/" + folder_name)
-    folder.mkdir(parents=True, exist_ok=True)
+    writer = CaptureWriter(Path("./data/captures/" + folder_name), encoding, quality)
 
     print("Initializing...", file=sys.stderr)  # noqa: T201
 
@@ -42,23 +47,30 @@ def start_collecting(all_cameras: bool = False) -> None:
 
     print("Collecting data...", file=sys.stderr)  # noqa: T201
 
-    try:
-        while True:
-            timestamp = time.time_ns() // 1000000
-            center_image = center_cam.next()
-
-            cv2.imwrite(str(folder / f"{timestamp}_center.jpg"), center_image)
+    cameras = {"center": center_cam}
+    if all_cameras:
+        cameras["left"] = left_cam
+        cameras["right"] = right_cam
 
-            if all_cameras:
-                left_image = left_cam.next()
-                right_image = right_cam.next()
+    # Every frame is written once, by blocking until the camera has published a newer frame.
+    last_sequences = dict.fromkeys(cameras, 0)
 
-                cv2.imwrite(str(folder / f"{timestamp}_left.jpg"), left_image)
-                cv2.imwrite(str(folder / f"{timestamp}_right.jpg"), right_image)
+    try:
+        while cameras:
+            for name, camera in list(cameras.items()):
+                frame = camera.wait_frame(last_sequences[name], timeout=1.0)
+                if frame.sequence != last_sequences[name]:
+                    last_sequences[name] = frame.sequence
+                    writer.write(name, frame.image)
+                elif camera.stopped:
+                    # A stopped camera has no newer frames, so waiting for it would return at once.
+                    print(f"The {name} camera stopped.", file=sys.stderr)  # noqa: T201
+                    del cameras[name]
     except KeyboardInterrupt:
         pass
 
     print("Stopping...", file=sys.stderr)  # noqa: T201
+    writer.close()
 
     center_cam.stop()
     if all_cameras:
@@ -82,8 +94,15 @@ def start_driving() -> None:
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Start collecting images while driving.")
     parser.add_argument("--all", action="store_true", help="Use all available cameras (left, center, right).")
+    parser.add_argument(
+        "--encoding",
+        choices=["raw", "jpeg", "png"],
+        default="jpeg",
+        help="The encoding of the captured frames."
+    )
+    parser.add_argument("--quality", type=int, default=None, help="The JPEG quality or PNG compression level.")
 
     args = parser.parse_args()
 
     start_driving()
-    start_collecting(args.all)
+    start_collecting(args.all, RecordEncoding[args.encoding.upper()], args.quality)
@@ -9,8 +9,8 @@ def view_lidar() -> None:
     lidar = Lidar()
     lidar.start()
 
+    angles = np.radians(np.arange(len(lidar.scan_data)) * lidar.resolution)
     while True:
-        angles = np.linspace(0, 2 * np.pi, 360)
         x = lidar.scan_data * np.cos(angles)
         y = lidar.scan_data * np.sin(angles)
 
@@ -0,0 +1,472 @@
+import argparse
+import json
+import logging
+import numpy as np
+import os
+import threading
+import time
+
+from collections.abc import Callable
+from pathlib import Path
+from queue import Queue
+from typing import Any
+
+from src.calibration.data import CalibrationData
+from src.config import config
+from src.constants import Gear
+from src.driving.can import ICANController
+from src.driving.speed_controller import SpeedController, SpeedControllerState
+from src.lane_assist.lane_assist import LaneAssist
+from src.lane_assist.preprocessing.generator import td_stitched_image_generator
+from src.lane_assist.stop_line_assist import StopLineAssist
+from src.object_recognition.handlers.pedestrian_handler import PedestrianHandler
+from src.object_recognition.handlers.speed_limit_handler import SpeedLimitHandler
+from src.object_recognition.handlers.traffic_light_handler import TrafficLightHandler
+from src.object_recognition.object_controller import ObjectController
+from src.object_recognition.object_detector import ObjectDetector
+from src.telemetry.app import TelemetryServer
+from src.utils.capture import CaptureReader
+from src.utils.frame import Frame
+from src.utils.replay import ImageFolderReplay, ReplaySource, ReplayStream
+
+
+class BenchmarkCANController(ICANController):
+    """A CAN controller that records when steering commands are issued instead of sending them.
+
+    Attributes
+    ----------
+        last_steering (float): The time of the last steering command (time.perf_counter).
+
+    """
+
+    last_steering: float = 0.0
+
+    def add_listener(self, message_id: int, listener: callable) -> None:
+        """Add a listener for a message (ignored).
+
+        :param message_id: The identifier of the message.
+        :param listener: The listener to add.
+        """
+        pass
+
+    def set_brake(self, brake: int) -> None:
+        """Set the brake of the go-kart (ignored).
+
+        :param brake: The brake to set.
+        """
+        pass
+
+    def set_steering(self, angle: float) -> None:  # noqa: ARG002
+        """Record the time of the steering command.
+
+        :param angle: The angle to set.
+        """
+        self.last_steering = time.perf_counter()
+
+    def set_throttle(self, throttle: int, gear: int) -> None:
+        """Set the throttle of the go-kart (ignored).
+
+        :param throttle: The throttle to set.
+        :param gear: The gear to set.
+        """
+        pass
+
+    def start(self) -> None:
+        """Start the CAN controller (ignored)."""
+        pass
+
+
+class StageTimer:
+    """Records the latencies of a single stage of the pipeline.
+
+    Attributes
+    ----------
+        name (str): The name of the stage.
+        samples (list[float]): The recorded latencies in seconds.
+
+    """
+
+    name: str
+    samples: list[float]
+
+    def __init__(self, name: str) -> None:
+        """Initialize the stage timer.
+
+        :param name: The name of the stage.
+        """
+        self.name = name
+        self.samples = []
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a single frame.
+
+        :param seconds: The latency in seconds.
+        """
+        self.samples.append(seconds)
+
+    def summary(self) -> dict[str, float]:
+        """Get the summary of the recorded latencies.
+
+        :return: The number of samples and the mean, median, 95th percentile and maximum latency in milliseconds.
+        """
+        if len(self.samples) == 0:
+            return {"count": 0}
+
+        samples = np.array(self.samples) * 1000
+        return {
+            "count": len(samples),
+            "mean": float(np.mean(samples)),
+            "p50": float(np.percentile(samples, 50)),
+            "p95": float(np.percentile(samples, 95)),
+            "max": float(np.max(samples))
+        }
+
+
+class Benchmark:
+    """A headless benchmark of the lane assist and object detection stack.
+
+    The frames of a recorded session are fed through the full pipeline as fast as possible,
+    without sleeping. Every stage runs on its own thread and processes every frame.
+
+    Attributes
+    ----------
+        results (dict[str, Any]): The results of the last run.
+
+    """
+
+    results: dict[str, Any]
+
+    __can: BenchmarkCANController
+    __controller: ObjectController | None
+    __detector: ObjectDetector | None
+    __frame_count: int = 0
+    __lane_assist: LaneAssist
+    __pinning: dict[str, set[int]]
+    __replay: ReplaySource
+    __streams: tuple[ReplayStream, ReplayStream, ReplayStream]
+    __telemetry: TelemetryServer
+    __threads: dict[str, dict[str, float]]
+    __timers: dict[str, StageTimer]
+    __warmup: int
+
+    def __init__(
+            self,
+            replay: ReplaySource,
+            detection: bool = True,
+            pinning: dict[str, set[int]] | None = None,
+            warmup: int = 10
+    ) -> None:
+        """Initialize the benchmark.
+
+        :param replay: The replay source.
+        :param detection: Whether to run the object detection stage.
+        :param pinning: The cores to pin each stage to, keyed by stage name.
+        :param warmup: The number of frames to exclude from the statistics.
+        """
+        self.results = {}
+        self.__replay = replay
+        self.__pinning = pinning or {}
+        self.__warmup = warmup
+        self.__threads = {}
+        self.__timers = {}
+
+        calibration = CalibrationData.load(config["calibration"]["calibration_file"])
+
+        self.__can = BenchmarkCANController()
+        self.__telemetry = TelemetryServer()
+
+        speed_controller = SpeedController(self.__can)
+        speed_controller.gear = Gear.DRIVE
+        speed_controller.state = SpeedControllerState.DRIVING
+
+        self.__streams = (ReplayStream(), ReplayStream(), ReplayStream())
+        generator = td_stitched_image_generator(calibration, *self.__streams, self.__telemetry)
+
+        stop_line_assist = StopLineAssist(speed_controller, calibration)
+        self.__lane_assist = LaneAssist(
+            generator,
+            stop_line_assist,
+            speed_controller,
+            self.__telemetry,
+            calibration
+        )
+        self.__lane_assist.enabled = True
+
+        self.__controller = None
+        self.__detector = None
+        if detection:
+            self.__controller = ObjectController(calibration, self.__lane_assist, speed_controller)
+            self.__controller.add_handler(PedestrianHandler(self.__controller))
+            self.__controller.add_handler(SpeedLimitHandler(self.__controller))
+            self.__controller.add_handler(TrafficLightHandler(self.__controller))
+
+            self.__detector = ObjectDetector.from_model(config["object_detection"]["model_path"], self.__controller)
+
+    def run(self, max_frames: int | None = None, buffer_size: int = 8) -> dict[str, Any]:
+        """Run the benchmark.
+
+        :param max_frames: The maximum number of frames to replay.
+        :param buffer_size: The maximum number of decoded frames waiting for each stage.
+        :return: The results of the benchmark.
+        """
+        self.__frame_count = len(self.__replay) if max_frames is None else min(max_frames, len(self.__replay))
+        if self.__frame_count <= self.__warmup:
+            raise ValueError("The replay does not contain more frames than the warm-up.")
+
+        queues: list[Queue] = []
+        stages: dict[str, Callable[[Queue], None]] = {"lane": self.__lane_stage}
+        if self.__detector is not None:
+            stages["detection"] = self.__detection_stage
+
+        threads = []
+        for name, target in stages.items():
+            queue = Queue(maxsize=buffer_size)
+            queues.append(queue)
+            threads.append(threading.Thread(target=self.__run_stage, args=(name, target, queue), name=name))
+
+        threads.append(
+            threading.Thread(target=self.__run_stage, args=("source", self.__source_stage, queues), name="source")
+        )
+
+        start = time.perf_counter()
+        process_start = time.process_time()
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        wall_time = time.perf_counter() - start
+        process_time = time.process_time() - process_start
+
+        measured = self.__frame_count - self.__warmup
+        self.results = {
+            "frames": measured,
+            "wall_time": wall_time,
+            "process_cpu": process_time / wall_time * 100,
+            "stages": {name: timer.summary() for name, timer in self.__timers.items()},
+            "threads": {
+                name: {
+                    "fps": measured / stats["wall"] if stats["wall"] > 0 else 0.0,
+                    "cpu": stats["cpu"] / stats["wall"] * 100 if stats["wall"] > 0 else 0.0,
+                    "cores": sorted(self.__pinning.get(name, [])),
+                }
+                for name, stats in self.__threads.items()
+            }
+        }
+
+        return self.results
+
+    def log_results(self) -> None:
+        """Log the results of the last run."""
+        logging.info("Processed %d frames in %.2f seconds.", self.results["frames"], self.results["wall_time"])
+        logging.info("Total CPU utilisation: %.1f%%", self.results["process_cpu"])
+
+        for name, stats in self.results["threads"].items():
+            logging.info(
+                "Thread %-10s %7.2f fps | CPU %5.1f%% | cores: %s",
+                name,
+                stats["fps"],
+                stats["cpu"],
+                stats["cores"] or "any"
+            )
+
+        for name, summary in self.results["stages"].items():
+            if summary["count"] == 0:
+                logging.info("Stage %-17s no samples", name)
+                continue
+
+            logging.info(
+                "Stage %-17s mean %7.2f ms | p50 %7.2f ms | p95 %7.2f ms | max %7.2f ms",
+                name,
+                summary["mean"],
+                summary["p50"],
+                summary["p95"],
+                summary["max"]
+            )
+
+    def __run_stage(self, name: str, target: Callable[..., None], *args: Any) -> None:
+        """Run a stage of the pipeline and measure its thread's CPU time.
+
+        :param name: The name of the stage.
+        :param target: The function that runs the stage.
+        :param args: The arguments for the function.
+        """
+        cores = self.__pinning.get(name)
+        if cores:
+            if hasattr(os, "sched_setaffinity"):
+                os.sched_setaffinity(0, cores)
+            else:
+                logging.warning("Pinning threads to cores is not supported on this platform.")
+
+        stats = {"cpu": 0.0, "wall": 0.0}
+
+        def on_warm() -> None:
+            stats["cpu"] = time.thread_time()
+            stats["wall"] = time.perf_counter()
+
+        on_warm()
+        target(*args, on_warm)
+
+        stats["cpu"] = time.thread_time() - stats["cpu"]
+        stats["wall"] = time.perf_counter() - stats["wall"]
+        self.__threads[name] = stats
+
+    def __timer(self, name: str) -> StageTimer:
+        """Get the timer of a stage, creating it if necessary.
+
+        :param name: The name of the stage.
+        :return: The stage timer.
+        """
+        if name not in self.__timers:
+            self.__timers[name] = StageTimer(name)
+
+        return self.__timers[name]
+
+    def __source_stage(self, queues: list[Queue], on_warm: Callable[[], None]) -> None:
+        """Decode the replayed frames and hand them to every stage, which share their derived views.
+
+        :param queues: The input queues of the stages.
+        :param on_warm: The callback to call once the warm-up has finished.
+        """
+        timer = self.__timer("decode")
+
+        for i in range(self.__frame_count):
+            if i == self.__warmup:
+                on_warm()
+
+            start = time.perf_counter()
+            frames = {camera: Frame(image, i) for camera, image in self.__replay.read(i).items()}
+            if i >= self.__warmup:
+                timer.record(time.perf_counter() - start)
+
+            for queue in queues:
+                queue.put(frames)
+
+        for queue in queues:
+            queue.put(None)
+
+    def __lane_stage(self, queue: Queue, on_warm: Callable[[], None]) -> None:
+        """Run the preprocessing and lane assist on every frame.
+
+        :param queue: The input queue.
+        :param on_warm: The callback to call once the warm-up has finished.
+        """
+        preprocess = self.__timer("preprocessing")
+        lane_assist = self.__timer("lane_assist")
+        steering = self.__timer("frame_to_steering")
+
+        generator = self.__lane_assist.image_generator()
+
+        i = 0
+        while (frames := queue.get()) is not None:
+            if i == self.__warmup:
+                on_warm()
+
+            start = time.perf_counter()
+            for stream, camera in zip(self.__streams, ("left", "center", "right"), strict=True):
+                stream.push(frames[camera])
+
+            image = next(generator)
+            preprocessed = time.perf_counter()
+
+            last_steering = self.__can.last_steering
+            self.__lane_assist.lane_assist_loop(image)
+            end = time.perf_counter()
+
+            if i >= self.__warmup:
+                preprocess.record(preprocessed - start)
+                lane_assist.record(end - preprocessed)
+
+                if self.__can.last_steering != last_steering:
+                    steering.record(self.__can.last_steering - start)
+
+            i += 1
+
+    def __detection_stage(self, queue: Queue, on_warm: Callable[[], None]) -> None:
+        """Run the object detection and the object handlers on every frame.
+
+        :param queue: The input queue.
+        :param on_warm: The callback to call once the warm-up has finished.
+        """
+        inference = self.__timer("detection")
+        handling = self.__timer("object_handling")
+
+        i = 0
+        while (frames := queue.get()) is not None:
+            if i == self.__warmup:
+                on_warm()
+
+            start = time.perf_counter()
+            predictions = self.__detector.detect({camera: frame.image for camera, frame in frames.items()})
+            detected = time.perf_counter()
+
+            self.__detector.handle(predictions)
+            end = time.perf_counter()
+
+            if i >= self.__warmup:
+                inference.record(detected - start)
+                handling.record(end - detected)
+
+            i += 1
+
+
+def parse_pinning(values: list[str]) -> dict[str, set[int]]:
+    """Parse the core pinning arguments.
+
+    :param values: The arguments, formatted as `stage=cores` (e.g. `lane=0,1` or `detection=2-3`).
+    :return: The cores to pin each stage to, keyed by stage name.
+    """
+    pinning = {}
+    for value in values:
+        stage, _, cores = value.partition("=")
+        if not cores:
+            raise argparse.ArgumentTypeError(f"Invalid pinning '{value}', expected 'stage=cores'.")
+
+        pinning[stage] = set()
+        for part in cores.split(","):
+            first, _, last = part.partition("-")
+            pinning[stage].update(range(int(first), int(last or first) + 1))
+
+    return pinning
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    parser = argparse.ArgumentParser(description="Benchmark the driving stack against a recorded session.")
+    parser.add_argument("session", type=Path, help="The capture or image folder of the recorded session.")
+    parser.add_argument("--frames", type=int, default=None, help="The maximum number of frames to replay.")
+    parser.add_argument("--warmup", type=int, default=10, help="The number of frames to exclude from the results.")
+    parser.add_argument("--buffer", type=int, default=8, help="The number of decoded frames to buffer per stage.")
+    parser.add_argument("--no-detection", action="store_true", help="Only benchmark the lane assist.")
+    parser.add_argument(
+        "--tracker",
+        default=None,
+        help="Override the object tracker, e.g. 'builtin' or 'botsort.yaml'.",
+    )
+    parser.add_argument(
+        "--pin",
+        action="append",
+        default=[],
+        help="Pin a stage (source, lane, detection) to the given cores, e.g. 'lane=0,1'.",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Write the results as JSON to this file.")
+
+    args = parser.parse_args()
+    if args.tracker is not None:
+        config.update_nested_key("object_detection.tracker", args.tracker)
+
+    is_capture = (args.session / "index.bin").exists()
+    benchmark = Benchmark(
+        CaptureReader(args.session) if is_capture else ImageFolderReplay(args.session),
+        detection=not args.no_detection,
+        pinning=parse_pinning(args.pin),
+        warmup=args.warmup
+    )
+    benchmark.run(args.frames, args.buffer)
+    benchmark.log_results()
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(benchmark.results, indent=4))
@@ -36,10 +36,12 @@ class CalibrationData(metaclass=SingletonMeta):
     stitched_shape: tuple[int, int]
     topdown_matrix: np.ndarray
 
+    __distance_maps: dict[tuple[int, int], np.ndarray]
     __pool: ThreadPoolExecutor
 
     def __init__(self) -> None:
         """Initialize the calibration data."""
+        self.__distance_maps = {}
         self.__pool = ThreadPoolExecutor()
 
     def transform(self, images: list[np.ndarray]) -> np.ndarray:
@@ -95,16 +97,20 @@ class CalibrationData(metaclass=SingletonMeta):
         :param shape: The shape of the image (width, height).
         :return: The transformed point.
         """
-        x *= self.input_shape[0] / shape[0]
-        y *= self.input_shape[1] / shape[1]
+        point = self.transform_points(np.array([[x, y]]), shape)[0]
+        return int(point[0]), int(point[1])
 
-        x += self.offsets[self.ref_idx][0]
-        y += self.offsets[self.ref_idx][1]
+    def transform_points(self, points: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+        """Transform points to a topdown view.
 
-        src_point = np.array([[[x, y]]], dtype=np.float32)
-        dst_point = cv2.perspectiveTransform(src_point, self.topdown_matrix)
+        :param points: The points in the image (N, 2), as x, y.
+        :param shape: The shape of the image (width, height).
+        :return: The transformed points (N, 2).
+        """
+        scale = np.array(self.input_shape, dtype=np.float32) / np.array(shape, dtype=np.float32)
+        src_points = np.asarray(points, dtype=np.float32).reshape(-1, 2) * scale + self.offsets[self.ref_idx][:2]
 
-        return int(dst_point[0][0][0]), int(dst_point[0][0][1])
+        return cv2.perspectiveTransform(src_points.reshape(-1, 1, 2), self.topdown_matrix).reshape(-1, 2)
 
     def get_distance(self, pixels: int) -> float:
         """Get the distance in meters from pixels.
@@ -137,6 +143,34 @@ class CalibrationData(metaclass=SingletonMeta):
 
         return self.get_distance(int(dist))
 
+    def get_distances_to_y(self, points: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+        """Get the distances in meters from a batch of coordinates, not considering the x-coordinates.
+
+        :param points: The points in the image (N, 2), as x, y.
+        :param shape: The shape of the image (width, height).
+        :return: The distance to every point in meters.
+        """
+        transformed = np.trunc(self.transform_points(points, shape))
+        return (self.output_shape[1] - transformed[:, 1]) / self.pixels_per_meter
+
+    def get_distance_map(self, shape: tuple[int, int]) -> np.ndarray:
+        """Get the distance (not considering the x-coordinate) to every pixel of an image.
+
+        The map is computed once per image shape, after which the distance to a pixel is a lookup.
+
+        :param shape: The shape of the image (width, height).
+        :return: The distance to every pixel in meters (height, width).
+        """
+        shape = (int(shape[0]), int(shape[1]))
+        if shape not in self.__distance_maps:
+            xs, ys = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]))
+            points = np.column_stack((xs.ravel(), ys.ravel()))
+
+            distances = self.get_distances_to_y(points, shape).astype(np.float32)
+            self.__distance_maps[shape] = distances.reshape(shape[1], shape[0])
+
+        return self.__distance_maps[shape]
+
     def get_distance_to_y(self, x: int, y: int, shape: tuple[int, int]) -> float:
         """Get the distance in meters from a coordinate, not considering the x-coordinate.
 
@@ -58,6 +58,7 @@ class AutonomousDriving(DrivingMode):
 
         self.__init_lane_assist(calibration)
         self.__init_object_detection(calibration)
+        self.__init_signals()
 
     def start(self) -> None:
         """Start the autonomous driving system."""
@@ -119,6 +120,22 @@ class AutonomousDriving(DrivingMode):
             lidar.start()
 
         # Initialize the object detector.
-        self.detector = ObjectDetector.from_model(
-            config["object_detection"]["model_path"], object_controller, config["camera_ids"]["center"]
-        )
+        self.detector = ObjectDetector.from_model(config["object_detection"]["model_path"], object_controller)
+
+    def __init_signals(self) -> None:
+        """Initialize the numeric signals that are sent to the dashboard."""
+        signals = self.telemetry.signals
+
+        signals.add_signal("speed", lambda: self.speed_controller.current_speed)
+        signals.add_signal("target_speed", lambda: self.speed_controller.target_speed)
+        signals.add_signal("max_speed", lambda: self.speed_controller.max_speed)
+        signals.add_signal("steering", lambda: self.lane_assist.steering_fraction)
+        signals.add_signal("pid_p", lambda: self.lane_assist.pid_components[0])
+        signals.add_signal("pid_i", lambda: self.lane_assist.pid_components[1])
+        signals.add_signal("pid_d", lambda: self.lane_assist.pid_components[2])
+        signals.add_signal("lane", lambda: self.lane_assist.requested_lane)
+        signals.add_signal("detections", lambda: self.detector.detections)
+        signals.add_signal("lane_assist_ms", lambda: self.lane_assist.latency * 1000)
+        signals.add_signal("detection_ms", lambda: self.detector.latency * 1000)
+        signals.add_signal("detection_rate", lambda: self.detector.scheduler.frame_rate)
+        signals.add_signal("detection_size", lambda: self.detector.scheduler.image_size)
@@ -1,4 +1,5 @@
 import cv2
+import functools
 import numpy as np
 import threading
 import time
@@ -9,6 +10,7 @@ from src.calibration.data import CalibrationData
 from src.config import config
 from src.driving.can import ICANController
 from src.driving.speed_controller import ISpeedController
+from src.lane_assist.lane_index import LaneIndex
 from src.lane_assist.line_detection.line import Line, LineType
 from src.lane_assist.line_detection.line_detector import filter_lines, get_lines
 from src.lane_assist.line_following.dynamic_speed import get_max_path_speed
@@ -24,6 +26,30 @@ colours = {
 }
 
 
+def draw_overlay(image: np.ndarray, path: Path, lines: list[Line], target_point: np.ndarray) -> np.ndarray:
+    """Draw the results of the lane assist on an image.
+
+    :param image: The grayscale topdown image.
+    :param path: The path that is followed.
+    :param lines: The lines in the image.
+    :param target_point: The point on the path that is steered towards.
+    :return: The RGB image with the path, the lines and the target point drawn on it.
+    """
+    rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+
+    # Draw the path on the image.
+    cv2.polylines(rgb, [path.points.astype(np.int32)], False, (255, 255, 0), 2)
+
+    # Draw the lines on the image.
+    for line in lines:
+        for point in line.points:
+            cv2.circle(rgb, (int(point[0]), int(point[1])), 3, colours[line.line_type], -1)
+
+    # Draw the target point on the image.
+    cv2.circle(rgb, (int(target_point[0]), int(target_point[1])), 4, (0, 0, 255), -1)
+    return rgb
+
+
 class LaneAssist:
     """A class to add lane assist to the kart.
 
@@ -37,9 +63,11 @@ class LaneAssist:
         can_controller: The can controller.
         enabled: Whether lane assist is enabled.
         image_generator: A function that generates images.
+        latency: The duration of the last lane assist loop in seconds.
         lines: The lines on the road.
         requested_lane: The lane to follow.
         speed_controller: The speed controller.
+        steering_fraction: The last steering fraction that was sent to the kart.
         telemetry: The telemetry server.
 
     """
@@ -47,12 +75,15 @@ class LaneAssist:
     can_controller: ICANController
     enabled: bool = False
     image_generator: Callable[[], Generator[np.ndarray, None, None]]
+    latency: float = 0.0
     lines: list[Line]
     requested_lane: int
     speed_controller: ISpeedController
+    steering_fraction: float = 0.0
     telemetry: TelemetryServer
 
     __killed: bool = False
+    __lane_index: LaneIndex | None = None
     __path_follower: PathFollower
     __stop_line_assist: StopLineAssist
     __calibration: CalibrationData
@@ -84,6 +115,15 @@ class LaneAssist:
         self.__path_follower = PathFollower(calibration, speed_controller)
         self.__calibration = calibration
 
+    @property
+    def lane_index(self) -> LaneIndex:
+        """The index to find the lanes of points, rebuilt when the lines change."""
+        lines = self.lines
+        if self.__lane_index is None or self.__lane_index.lines is not lines:
+            self.__lane_index = LaneIndex(lines)
+
+        return self.__lane_index
+
     @property
     def requested_lane(self) -> int:
         """The requested lane."""
@@ -97,6 +137,11 @@ class LaneAssist:
         """Set the requested lane."""
         self.__requested_lane = lane
 
+    @property
+    def pid_components(self) -> tuple[float, float, float]:
+        """The proportional, integral and derivative terms of the steering PID controller."""
+        return self.__path_follower.pid_components
+
     def lane_assist_loop(self, image: np.ndarray) -> None:
         """Lane assist loop.
 
@@ -104,6 +149,7 @@ class LaneAssist:
 
         :param image: The image to follow the path in.
         """
+        start = time.perf_counter()
         current_position = (image.shape[1] // 2, image.shape[0] - 1)
 
         lines = get_lines(image, calibration=self.__calibration)
@@ -116,26 +162,13 @@ class LaneAssist:
         # Act on the lines in the image.
         path, target_point = self.__follow_path(filtered_lines, current_position, self.requested_lane)
         self.__stop_line_assist.detect_and_handle(image, filtered_lines)
+        self.latency = time.perf_counter() - start
 
         # If telemetry is enabled, send the image to the telemetry server.
+        # The overlay is drawn by a telemetry worker, so only references to the results are passed along.
         if config["telemetry"]["enabled"] and self.telemetry.any_listening():
-            rgb = cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
-
-            # Draw the path on the image.
-            for i in range(len(path.points) - 1):
-                cv2.line(rgb, (int(path.points[i][0]), int(path.points[i][1])),
-                              (int(path.points[i + 1][0]), int(path.points[i + 1][1])), (255, 255, 0), 2)
-
-            # Draw the lines on the image.
-            for line in filtered_lines:
-                for point in line.points:
-                    cv2.circle(rgb, (point[0], point[1]), 3, colours[line.line_type], -1)
-
-            # Draw the target point on the image.
-            cv2.circle(rgb, (int(target_point[0]), int(target_point[1])), 4, (0, 0, 255), -1)
-
-            # Send the image to the telemetry server.
-            self.telemetry.websocket_handler.send_image("laneassist", rgb)
+            overlay = functools.partial(draw_overlay, path=path, lines=filtered_lines, target_point=target_point)
+            self.telemetry.websocket_handler.send_image("laneassist", image, overlay)
 
     def start(self, multithreading: bool = False) -> threading.Thread | None:
         """Start the lane assist.
@@ -185,6 +218,7 @@ class LaneAssist:
         steering_fraction = self.__path_follower.get_steering_fraction(target_point, position[0])
 
         self.can_controller.set_steering(steering_fraction)
+        self.steering_fraction = steering_fraction
         return path, target_point
 
     def __run(self) -> None:
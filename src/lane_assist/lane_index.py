@@ -0,0 +1,69 @@
+import numpy as np
+
+from src.config import config
+from src.lane_assist.line_detection.line import Line
+
+
+class LaneIndex:
+    """An index to find the lanes of points in the topdown image.
+
+    The lines are resampled to a common grid of rows, so the lane of a point is a row lookup followed
+    by an interval test between every pair of adjacent lines. Above and below a line, its first and
+    last points are used.
+
+    Attributes
+    ----------
+        lines (list[Line]): The lines the index was built from, from left to right.
+        row_step (int): The distance between two rows of the grid in pixels.
+        rows (np.ndarray): The y-coordinates of the rows of the grid.
+        xs (np.ndarray): The x-coordinate of every line at every row (lines, rows).
+
+    """
+
+    lines: list[Line]
+    row_step: int
+    rows: np.ndarray
+    xs: np.ndarray
+
+    def __init__(self, lines: list[Line], row_step: int | None = None) -> None:
+        """Build the index.
+
+        :param lines: The lines on the road, from left to right.
+        :param row_step: The distance between two rows of the grid (defaults to the config).
+        """
+        self.lines = lines
+        self.row_step = row_step or config["line_following"]["lane_index"]["row_step"]
+
+        if len(lines) == 0:
+            self.rows = np.empty(0)
+            self.xs = np.empty((0, 0))
+            return
+
+        top = min(line.points[:, 1].min() for line in lines)
+        bottom = max(line.points[:, 1].max() for line in lines)
+        self.rows = np.arange(top, bottom + self.row_step, self.row_step, dtype=np.float32)
+
+        self.xs = np.empty((len(lines), len(self.rows)), dtype=np.float32)
+        for i, line in enumerate(lines):
+            order = np.argsort(line.points[:, 1], kind="stable")
+            self.xs[i] = np.interp(self.rows, line.points[order, 1], line.points[order, 0])
+
+    def get_lanes(self, points: np.ndarray) -> np.ndarray:
+        """Get the lanes of a batch of points.
+
+        :param points: The points in the topdown image (N, 2), as x, y.
+        :return: The lane of every point (0 is the rightmost lane), or -1 if it is not in a lane.
+        """
+        points = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+        if len(self.lines) < 2:
+            return np.full(len(points), -1, dtype=int)
+
+        rows = np.clip(np.rint((points[:, 1] - self.rows[0]) / self.row_step).astype(int), 0, len(self.rows) - 1)
+        xs = self.xs[:, rows]
+
+        # The point is in the lane between line i and line i + 1 if it lies between them on its row.
+        between = (np.minimum(xs[:-1], xs[1:]) <= points[:, 0]) & (points[:, 0] <= np.maximum(xs[:-1], xs[1:]))
+        found = between.any(axis=0)
+        first = between.argmax(axis=0)
+
+        return np.where(found, len(self.lines) - first - 2, -1)
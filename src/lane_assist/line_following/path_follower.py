@@ -46,6 +46,11 @@ class PathFollower:
             output_limits=(-config["kart"]["max_steering_angle"], config["kart"]["max_steering_angle"]),
         )
 
+    @property
+    def pid_components(self) -> tuple[float, float, float]:
+        """The proportional, integral and derivative terms of the last PID update."""
+        return self.__pid.components
+
     def __calc_lookahead_padding(self) -> float:
         """Get distance traveled since last PID update.
 
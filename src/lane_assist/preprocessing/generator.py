@@ -36,13 +36,10 @@ def td_stitched_image_generator(
     def __generator() -> Generator[np.ndarray, None, None]:
         """Generate a topdown image from the cameras."""
         while left_cam.has_next() and center_cam.has_next() and right_cam.has_next():
-            left_image = left_cam.next()
-            center_image = center_cam.next()
-            right_image = right_cam.next()
-
-            left_image = __transform_img(left_image)
-            center_image = __transform_img(center_image)
-            right_image = __transform_img(right_image)
+            # The grayscale views are shared with the other consumers of the frames.
+            left_image = left_cam.next_frame().gray
+            center_image = center_cam.next_frame().gray
+            right_image = right_cam.next_frame().gray
 
             if config["preprocessing"]["gamma"]["enabled"]:
                 left_image = gamma_adjuster.adjust(left_image, config["preprocessing"]["gamma"]["left"])
@@ -67,7 +64,3 @@ def td_stitched_image_generator(
 
     return __generator
 
-
-def __transform_img(img: np.ndarray) -> np.ndarray:
-    """Convert the image to grayscale."""
-    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
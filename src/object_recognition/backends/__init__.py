@@ -0,0 +1,3 @@
+from .base_backend import BaseBackend
+from .openvino_backend import OpenVINOBackend
+from .ultralytics_backend import UltralyticsBackend
@@ -0,0 +1,33 @@
+import numpy as np
+
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+
+
+class BaseBackend(ABC):
+    """Interface for the object detection backends."""
+
+    @abstractmethod
+    def predict(self, images: list[np.ndarray], image_size: int) -> list[np.ndarray]:
+        """Detect the objects in a batch of images.
+
+        :param images: The images (BGR).
+        :param image_size: The size to resize the images to before inference.
+        :return: The detections of every image (x1, y1, x2, y2, conf, cls) in the coordinates of the image.
+        """
+        pass
+
+    def submit(self, images: list[np.ndarray], image_size: int) -> Future:
+        """Start detecting the objects in a batch of images, without waiting for the detections.
+
+        Backends that can keep several inferences in flight override this, so the batches of a frame (e.g.
+        the full images and their regions) are inferred at the same time. By default, the batch is
+        detected before returning.
+
+        :param images: The images (BGR).
+        :param image_size: The size to resize the images to before inference.
+        :return: A future of the detections of every image (x1, y1, x2, y2, conf, cls).
+        """
+        future = Future()
+        future.set_result(self.predict(images, image_size))
+        return future
@@ -0,0 +1,255 @@
+import cv2
+import logging
+import numpy as np
+import openvino as ov
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+
+from src.config import config
+from src.object_recognition.backends.base_backend import BaseBackend
+
+
+def letterbox(image: np.ndarray, size: tuple[int, int]) -> tuple[np.ndarray, float, tuple[int, int]]:
+    """Resize an image to the input of the model, keeping its aspect ratio and padding the remainder.
+
+    :param image: The image (BGR).
+    :param size: The input size of the model (height, width).
+    :return: The input tensor (1, 3, height, width), the scale of the image and the padding (left, top).
+    """
+    height, width = image.shape[:2]
+    gain = min(size[0] / height, size[1] / width)
+    new_height, new_width = round(height * gain), round(width * gain)
+
+    top = (size[0] - new_height) // 2
+    left = (size[1] - new_width) // 2
+
+    canvas = np.full((size[0], size[1], 3), 114, dtype=np.uint8)
+    canvas[top:top + new_height, left:left + new_width] = cv2.resize(
+        image, (new_width, new_height), interpolation=cv2.INTER_LINEAR
+    )
+
+    tensor = np.ascontiguousarray(canvas[..., ::-1].transpose(2, 0, 1)[None], dtype=np.float32) / 255
+    return tensor, gain, (left, top)
+
+
+def decode(
+        output: np.ndarray,
+        gain: float,
+        padding: tuple[int, int],
+        shape: tuple[int, int],
+        min_confidence: float,
+        iou: float,
+        max_detections: int = 300
+) -> np.ndarray:
+    """Decode the output of a YOLOv8 model.
+
+    :param output: The output of the model (1, 4 + classes, anchors).
+    :param gain: The scale of the letterboxed image.
+    :param padding: The padding of the letterboxed image (left, top).
+    :param shape: The shape of the original image (height, width).
+    :param min_confidence: The minimum confidence of a detection.
+    :param iou: The IoU threshold of the non-maximum suppression.
+    :param max_detections: The maximum number of detections.
+    :return: The detections (x1, y1, x2, y2, conf, cls) in the coordinates of the original image.
+    """
+    predictions = output[0].T
+    scores = predictions[:, 4:]
+
+    classes = scores.argmax(axis=1)
+    confidences = scores[np.arange(len(scores)), classes]
+
+    keep = confidences >= min_confidence
+    boxes, confidences, classes = predictions[keep, :4], confidences[keep], classes[keep]
+    if len(boxes) == 0:
+        return np.empty((0, 6), dtype=np.float32)
+
+    # Convert (cx, cy, w, h) to (x, y, w, h) for the class-aware non-maximum suppression.
+    boxes[:, :2] -= boxes[:, 2:] / 2
+    indices = np.asarray(cv2.dnn.NMSBoxesBatched(boxes, confidences, classes, min_confidence, iou), dtype=int)
+    indices = indices.reshape(-1)[:max_detections]
+
+    xyxy = np.concatenate((boxes[indices, :2], boxes[indices, :2] + boxes[indices, 2:]), axis=1)
+    xyxy -= np.tile(padding, 2)
+    xyxy /= gain
+    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+
+    return np.column_stack((xyxy, confidences[indices], classes[indices])).astype(np.float32)
+
+
+class OpenVINOBackend(BaseBackend):
+    """Detects objects with an OpenVINO model, keeping several inference requests in flight.
+
+    The images are letterboxed on a separate thread and submitted to an asynchronous inference queue. If
+    the batch dimension of the model is dynamic, the images are split into one batch per inference request,
+    otherwise every image is its own request. A request is submitted as soon as its images are ready, so
+    preprocessing overlaps with inference. The outputs are decoded in the completion callbacks, which
+    complete the future returned by `submit`, so several batches can be in flight at once.
+
+    A model with a dynamic input shape is compiled once for every image size that is requested. A model
+    with a static input shape always uses its own size, and a warning is logged when another size is
+    requested.
+
+    Attributes
+    ----------
+        device (str): The device to run the model on.
+        requests (int): The number of inference requests that can be in flight.
+
+    """
+
+    device: str
+    requests: int
+
+    __batched: bool
+    __core: ov.Core
+    __ignored_sizes: set[int]
+    __lock: Lock
+    __model: ov.Model
+    __preprocessor: ThreadPoolExecutor
+    __queues: dict[tuple[int, int], ov.AsyncInferQueue]
+    __static_size: tuple[int, int] | None
+
+    def __init__(self, model_path: str | Path, device: str = "CPU", requests: int = 2) -> None:
+        """Initialize the backend.
+
+        :param model_path: The path to the OpenVINO model (.xml), or the directory it was exported to.
+        :param device: The device to run the model on.
+        :param requests: The number of inference requests that can be in flight.
+        """
+        path = Path(model_path)
+        if path.suffix != ".xml":
+            path = next(path.glob("*.xml"))
+
+        self.__core = ov.Core()
+        self.__model = self.__core.read_model(path)
+
+        shape = self.__model.input(0).get_partial_shape()
+        self.__batched = shape[0].is_dynamic
+        self.__static_size = (
+            (shape[2].get_length(), shape[3].get_length()) if shape[2].is_static and shape[3].is_static else None
+        )
+
+        self.device = device
+        self.requests = requests
+        self.__ignored_sizes = set()
+        self.__lock = Lock()
+        self.__preprocessor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="letterbox")
+        self.__queues = {}
+
+    def predict(self, images: list[np.ndarray], image_size: int) -> list[np.ndarray]:
+        """Detect the objects in a batch of images.
+
+        :param images: The images (BGR).
+        :param image_size: The size to resize the images to before inference (ignored for static models).
+        :return: The detections of every image (x1, y1, x2, y2, conf, cls) in the coordinates of the image.
+        """
+        return self.submit(images, image_size).result()
+
+    def submit(self, images: list[np.ndarray], image_size: int) -> Future:
+        """Start detecting the objects in a batch of images, without waiting for the detections.
+
+        :param images: The images (BGR).
+        :param image_size: The size to resize the images to before inference (ignored for static models).
+        :return: A future of the detections of every image (x1, y1, x2, y2, conf, cls).
+        """
+        future = Future()
+        results = [None] * len(images)
+        if not images:
+            future.set_result(results)
+            return future
+
+        input_size = self.__get_input_size(image_size)
+        queue = self.__get_queue(input_size)
+
+        inputs = [self.__preprocessor.submit(letterbox, image, input_size) for image in images]
+        if self.__batched:
+            batches = [batch.tolist() for batch in np.array_split(range(len(images)), min(self.requests, len(images)))]
+        else:
+            batches = [[i] for i in range(len(images))]
+
+        # Waits for an idle request when all of them are in flight.
+        for batch in batches:
+            tensors, gains, paddings = zip(*(inputs[i].result() for i in batch), strict=True)
+            shapes = [images[i].shape[:2] for i in batch]
+            queue.start_async({0: np.concatenate(tensors)}, (future, results, batch, gains, paddings, shapes))
+
+        return future
+
+    def __get_input_size(self, image_size: int) -> tuple[int, int]:
+        """Get the input size of the model for a requested image size.
+
+        :param image_size: The requested image size.
+        :return: The input size of the model (height, width).
+        """
+        if self.__static_size is None:
+            return image_size, image_size
+
+        if self.__static_size != (image_size, image_size) and image_size not in self.__ignored_sizes:
+            self.__ignored_sizes.add(image_size)
+            logging.warning(
+                "The model has a static input size of %s, so the image size %d is ignored. "
+                "Export the model with dynamic=True to detect at other sizes.",
+                self.__static_size, image_size
+            )
+
+        return self.__static_size
+
+    def __get_queue(self, input_size: tuple[int, int]) -> ov.AsyncInferQueue:
+        """Get the inference queue for an input size, compiling the model if needed.
+
+        :param input_size: The input size of the model (height, width).
+        :return: The inference queue.
+        """
+        if input_size in self.__queues:
+            return self.__queues[input_size]
+
+        if self.__static_size is None:
+            batch = -1 if self.__batched else 1
+            self.__model.reshape(ov.PartialShape([batch, 3, *input_size]))
+
+        compiled = self.__core.compile_model(self.__model, self.device, {
+            "PERFORMANCE_HINT": "THROUGHPUT",
+            "PERFORMANCE_HINT_NUM_REQUESTS": str(self.requests)
+        })
+
+        queue = ov.AsyncInferQueue(compiled, self.requests)
+        queue.set_callback(self.__on_result)
+
+        self.__queues[input_size] = queue
+        return queue
+
+    def __on_result(self, request: ov.InferRequest, userdata: tuple) -> None:
+        """Decode the output of a finished inference request, completing the future once all requests are done.
+
+        :param request: The finished inference request.
+        :param userdata: The future and the results of the submission, and the indices, gains, paddings and
+            shapes of the images in the request.
+        """
+        future, results, batch, gains, paddings, shapes = userdata
+        output = request.get_output_tensor(0).data
+
+        try:
+            detections = [
+                decode(
+                    output[j:j + 1],
+                    gains[j],
+                    paddings[j],
+                    shapes[j],
+                    config["object_detection"]["min_confidence"],
+                    config["object_detection"]["iou"]
+                ) for j in range(len(batch))
+            ]
+        except Exception as e:
+            with self.__lock:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        with self.__lock:
+            for i, data in zip(batch, detections, strict=True):
+                results[i] = data
+
+            if not future.done() and all(data is not None for data in results):
+                future.set_result(results)
@@ -0,0 +1,45 @@
+import numpy as np
+
+from pathlib import Path
+from ultralytics import YOLO
+
+from src.config import config
+from src.object_recognition.backends.base_backend import BaseBackend
+
+
+class UltralyticsBackend(BaseBackend):
+    """Detects objects using the ultralytics predictor.
+
+    Attributes
+    ----------
+        model (YOLO): The model.
+
+    """
+
+    model: YOLO
+
+    def __init__(self, model_path: str | Path) -> None:
+        """Initialize the backend.
+
+        :param model_path: The path to the model (any format supported by ultralytics).
+        """
+        self.model = YOLO(model_path)
+
+    def predict(self, images: list[np.ndarray], image_size: int) -> list[np.ndarray]:
+        """Detect the objects in a batch of images.
+
+        :param images: The images (BGR).
+        :param image_size: The size to resize the images to before inference.
+        :return: The detections of every image (x1, y1, x2, y2, conf, cls) in the coordinates of the image.
+        """
+        results = self.model.predict(
+            images,
+            imgsz=image_size,
+            conf=config["object_detection"]["min_confidence"],
+            iou=config["object_detection"]["iou"],
+            verbose=config["object_detection"]["verbose"],
+            batch=len(images),
+            device="cpu"
+        )
+
+        return [result.boxes.data.cpu().numpy() for result in results]
@@ -0,0 +1,97 @@
+import numpy as np
+
+from src.config import config
+from src.object_recognition.object_controller import ObjectController
+
+
+class DetectionScheduler:
+    """Chooses the frame rate and the image size of the object detection at runtime.
+
+    When a handler is active (e.g. a pedestrian near a crosswalk or a red light), the objects are
+    detected as often and as precisely as possible. Otherwise, the frame rate scales with the speed
+    of the go-kart and slow driving uses a smaller image size, leaving the CPU to the lane assist.
+
+    The measured duration of the detections is kept per image size. When the detection at an image size
+    takes longer than the interval of the frame rate, the smaller image size is used instead, and the frame
+    rate is capped at the rate the detection can keep up with.
+
+    Attributes
+    ----------
+        active (bool): Whether any of the handlers was active at the last update.
+        controller (ObjectController): The object controller.
+        frame_rate (float): The frame rate to detect objects at.
+        image_size (int): The size to resize the images to before inference.
+
+    """
+
+    active: bool = True
+    controller: ObjectController
+    frame_rate: float
+    image_size: int
+
+    __latencies: dict[int, float]
+
+    def __init__(self, controller: ObjectController) -> None:
+        """Initialize the scheduler.
+
+        :param controller: The object controller.
+        """
+        self.controller = controller
+        self.frame_rate = config["object_detection"]["max_frame_rate"]
+        self.image_size = config["object_detection"]["image_size"]
+
+        self.__latencies = {}
+
+    def update(self, latency: float | None = None) -> None:
+        """Choose the frame rate and the image size of the next detection.
+
+        :param latency: The duration of the last detection in seconds, at the current image size.
+        """
+        max_frame_rate = config["object_detection"]["max_frame_rate"]
+        image_size = config["object_detection"]["image_size"]
+        if not config["object_detection"]["scheduler"]["enabled"]:
+            self.frame_rate, self.image_size = max_frame_rate, image_size
+            return
+
+        scheduler = config["object_detection"]["scheduler"]
+        if latency is not None:
+            previous = self.__latencies.get(self.image_size, latency)
+            smoothing = scheduler["latency_smoothing"]
+            self.__latencies[self.image_size] = (1 - smoothing) * previous + smoothing * latency
+
+        self.active = any(handler.is_active() for handler in self.controller.handlers)
+        if self.active:
+            self.__set_within_budget(max_frame_rate, image_size)
+            return
+
+        # Scale the frame rate linearly between the idle speed and the full speed.
+        speed = self.controller.speed_controller.current_speed
+        frame_rate = float(np.interp(
+            speed,
+            [scheduler["idle_speed"], scheduler["full_speed"]],
+            [scheduler["min_frame_rate"], max_frame_rate]
+        ))
+
+        if speed < scheduler["idle_speed"]:
+            image_size = scheduler["idle_image_size"]
+
+        self.__set_within_budget(frame_rate, image_size)
+
+    def __set_within_budget(self, frame_rate: float, image_size: int) -> None:
+        """Set the frame rate and the image size, lowering them if the detection cannot keep up.
+
+        :param frame_rate: The preferred frame rate.
+        :param image_size: The preferred image size.
+        """
+        min_image_size = min(image_size, config["object_detection"]["scheduler"]["idle_image_size"])
+        if self.__latencies.get(image_size, 0.0) > 1 / frame_rate:
+            image_size = min_image_size
+
+        latency = self.__latencies.get(image_size)
+        self.frame_rate = frame_rate if latency is None else min(frame_rate, 1 / latency)
+        self.image_size = image_size
+
+    @property
+    def interval(self) -> float:
+        """The time between the starts of two detections in seconds."""
+        return 1 / self.frame_rate
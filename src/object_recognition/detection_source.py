@@ -0,0 +1,88 @@
+import numpy as np
+
+from ultralytics.engine.results import Boxes
+
+from src.config import config
+
+
+class DetectionSource:
+    """A camera, or a region of a camera, to detect objects in.
+
+    Objects in a region are reported in the coordinates of the full camera frame, so the handlers
+    do not need to know whether a prediction came from a crop.
+
+    Attributes
+    ----------
+        camera (str): The name of the camera (see `camera_ids` in the config).
+        crop (tuple[int, int, int, int] | None): The region of the frame (x, y, width, height), or None for all of it.
+        name (str): The name of the source.
+        regions (list[tuple[int, int, int, int]]): The regions of the source (x, y, width, height) to detect
+            small objects in at a high resolution (see `RegionPlanner`).
+
+    """
+
+    camera: str
+    crop: tuple[int, int, int, int] | None
+    name: str
+    regions: list[tuple[int, int, int, int]]
+
+    def __init__(
+            self,
+            name: str,
+            camera: str,
+            crop: tuple[int, int, int, int] | None = None,
+            regions: list[tuple[int, int, int, int]] | None = None
+    ) -> None:
+        """Initialize the detection source.
+
+        :param name: The name of the source.
+        :param camera: The name of the camera.
+        :param crop: The region of the frame (x, y, width, height), or None for the full frame.
+        :param regions: The high-resolution regions of the source (x, y, width, height).
+        """
+        self.name = name
+        self.camera = camera
+        self.crop = crop
+        self.regions = regions or []
+
+    def extract(self, frame: np.ndarray) -> np.ndarray:
+        """Get the region of the source from a camera frame.
+
+        :param frame: The frame of the camera.
+        :return: A view of the region.
+        """
+        if self.crop is None:
+            return frame
+
+        x, y, width, height = self.crop
+        return frame[y:y + height, x:x + width]
+
+    def to_frame(self, predictions: Boxes, shape: tuple[int, ...]) -> Boxes:
+        """Convert predictions in the region to the coordinates of the camera frame.
+
+        :param predictions: The predictions in the region.
+        :param shape: The shape of the camera frame.
+        :return: The predictions in the camera frame.
+        """
+        if self.crop is None:
+            return predictions
+
+        data = predictions.data.numpy().copy()
+        data[:, [0, 2]] += self.crop[0]
+        data[:, [1, 3]] += self.crop[1]
+
+        return Boxes(data, shape[:2])
+
+    @classmethod
+    def from_config(cls) -> list["DetectionSource"]:
+        """Create the detection sources from the config.
+
+        :return: The detection sources.
+        """
+        sources = []
+        for name, source in config["object_detection"]["sources"].items():
+            crop = source.get("crop")
+            regions = [tuple(region) for region in source.get("regions") or []]
+            sources.append(cls(name, source["camera"], tuple(crop) if crop is not None else None, regions))
+
+        return sources
@@ -0,0 +1,146 @@
+import numpy as np
+
+from collections.abc import Iterable
+from ultralytics.engine.results import Boxes
+
+from src.calibration.data import CalibrationData
+
+
+class Detections:
+    """The detected objects of a frame, with their geometry computed once for all handlers.
+
+    The detections are sorted by class, so the detections of a set of classes are contiguous slices.
+    The areas, the ground points and the distances are computed in a single vectorized pass when the
+    detections are created, and are sliced along with the detections. The distances are looked up in
+    the distance map of the calibration.
+
+    Attributes
+    ----------
+        areas (np.ndarray): The area of every bounding box in pixels.
+        data (np.ndarray): The detections (x1, y1, x2, y2, [track_id], conf, cls).
+        distances (np.ndarray): The distance to the ground point of every detection in meters.
+        ground (np.ndarray): The point where every object touches the ground (bottom center, x, y).
+        orig_shape (tuple[int, int]): The shape of the image (height, width).
+
+    """
+
+    areas: np.ndarray
+    data: np.ndarray
+    distances: np.ndarray
+    ground: np.ndarray
+    orig_shape: tuple[int, int]
+
+    def __init__(
+            self,
+            data: np.ndarray,
+            orig_shape: tuple[int, int],
+            areas: np.ndarray,
+            ground: np.ndarray,
+            distances: np.ndarray
+    ) -> None:
+        """Initialize the detections.
+
+        :param data: The detections (x1, y1, x2, y2, [track_id], conf, cls), sorted by class.
+        :param orig_shape: The shape of the image (height, width).
+        :param areas: The area of every bounding box.
+        :param ground: The ground point of every detection.
+        :param distances: The distance to the ground point of every detection.
+        """
+        self.data = data
+        self.orig_shape = orig_shape
+        self.areas = areas
+        self.ground = ground
+        self.distances = distances
+
+    def __len__(self) -> int:
+        """The number of detections."""
+        return len(self.data)
+
+    @property
+    def cls(self) -> np.ndarray:
+        """The class of every detection."""
+        return self.data[:, -1]
+
+    @property
+    def conf(self) -> np.ndarray:
+        """The confidence of every detection."""
+        return self.data[:, -2]
+
+    @property
+    def id(self) -> np.ndarray | None:
+        """The track ID of every detection, if the detections are tracked."""
+        return self.data[:, 4] if self.is_track else None
+
+    @property
+    def is_track(self) -> bool:
+        """Whether the detections are tracked."""
+        return self.data.shape[1] == 7
+
+    @property
+    def xyxy(self) -> np.ndarray:
+        """The bounding boxes (x1, y1, x2, y2)."""
+        return self.data[:, :4]
+
+    def closest(self) -> int | None:
+        """Get the index of the closest detection. We assume the largest bounding box is the closest.
+
+        :return: The index of the closest detection, or None if there are none.
+        """
+        if len(self.data) == 0:
+            return None
+
+        return int(np.argmax(self.areas))
+
+    def of_classes(self, classes: Iterable[int]) -> "Detections":
+        """Get the detections of the given classes.
+
+        :param classes: The classes to select.
+        :return: The detections of the classes (views of this object for a single class).
+        """
+        classes = sorted(set(classes))
+        cls = self.cls
+
+        starts = np.searchsorted(cls, classes, side="left")
+        ends = np.searchsorted(cls, classes, side="right")
+        ranges = [(start, end) for start, end in zip(starts, ends, strict=True) if end > start]
+
+        if len(ranges) == 1:
+            return self.__select(slice(*ranges[0]))
+
+        return self.__select(np.concatenate([np.arange(start, end) for start, end in ranges] or [[]]).astype(int))
+
+    def __select(self, index: slice | np.ndarray) -> "Detections":
+        """Select a subset of the detections.
+
+        :param index: The slice or the indices of the detections.
+        :return: The selected detections.
+        """
+        return Detections(
+            self.data[index],
+            self.orig_shape,
+            self.areas[index],
+            self.ground[index],
+            self.distances[index]
+        )
+
+    @classmethod
+    def from_boxes(cls, boxes: Boxes, calibration: CalibrationData) -> "Detections":
+        """Create the detections of a frame from the output of the object detector.
+
+        :param boxes: The detected objects.
+        :param calibration: The calibration data, to calculate the distances.
+        :return: The detections.
+        """
+        data = np.asarray(boxes.data, dtype=np.float32)
+        data = data[np.argsort(data[:, -1], kind="stable")]
+        shape = tuple(boxes.orig_shape)
+
+        areas = (data[:, 2] - data[:, 0]) * (data[:, 3] - data[:, 1])
+        ground = np.column_stack(((data[:, 0] + data[:, 2]) / 2, data[:, 3]))
+
+        distance_map = calibration.get_distance_map(shape[::-1])
+        xs = np.clip(ground[:, 0].astype(int), 0, shape[1] - 1)
+        ys = np.clip(ground[:, 1].astype(int), 0, shape[0] - 1)
+        distances = distance_map[ys, xs]
+
+        return cls(data, shape, areas, ground, distances)
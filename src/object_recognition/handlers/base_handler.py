@@ -2,7 +2,8 @@ import numpy as np
 
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
-from ultralytics.engine.results import Boxes
+
+from src.object_recognition.detections import Detections
 
 
 if TYPE_CHECKING:
@@ -17,34 +18,50 @@ class BaseObjectHandler(ABC):
         allowed_classes (list[int]): The allowed classes for the handler.
         controller (ObjectController): The object controller.
         manual_mode (bool): Whether the handler will be used in manual mode.
+        manoeuvres (bool): Whether the handler starts manoeuvres, so it is skipped while one runs.
+        sources (tuple[str, ...]): The names of the detection sources the handler handles.
 
     """
 
     allowed_classes: list[int]
     controller: "ObjectController"
     manual_mode: bool = False
-
-    def __init__(self, controller: "ObjectController", allowed_classes: list[int], manual_mode: bool = False) -> None:
+    manoeuvres: bool = False
+    sources: tuple[str, ...]
+
+    def __init__(
+            self,
+            controller: "ObjectController",
+            allowed_classes: list[int],
+            manual_mode: bool = False,
+            sources: tuple[str, ...] = ("center",)
+    ) -> None:
         """Initializes the handler.
 
         :param controller: The object controller.
         :param allowed_classes: The allowed classes for the handler.
         :param manual_mode: Whether the handler will be used in manual mode.
+        :param sources: The names of the detection sources the handler handles.
         """
         self.allowed_classes = allowed_classes
         self.controller = controller
         self.manual_mode = manual_mode
+        self.sources = sources
 
-    def filter_predictions(self, predictions: Boxes) -> Boxes:
+    def filter_predictions(self, predictions: Detections) -> Detections:
         """Filters the predictions.
 
         :param predictions: The predictions to filter.
-        :return: The filtered predictions.
+        :return: The predictions of the allowed classes.
         """
-        data = predictions.data.numpy()
-        data = data[np.in1d(data[:, -1], self.allowed_classes)]
+        return predictions.of_classes(self.allowed_classes)
+
+    def is_active(self) -> bool:
+        """Checks if the handler needs objects to be detected as often as possible.
 
-        return Boxes(data, predictions.orig_shape)
+        :return: Whether the handler has stopped the go-kart.
+        """
+        return self.controller.stopped_by is self
 
     def is_stopped_by_other(self) -> bool:
         """Checks if another handler has stopped the go-kart.
@@ -54,25 +71,20 @@ class BaseObjectHandler(ABC):
         return self.controller.has_stopped() and self.controller.stopped_by != self
 
     @staticmethod
-    def get_closest_prediction(predictions: Boxes) -> np.ndarray | None:
+    def get_closest_prediction(predictions: Detections) -> np.ndarray | None:
         """Gets the closest prediction to the go-kart. We assume the largest bounding box is the closest.
 
         :param predictions: The predictions to search.
         :return: The closest prediction.
         """
-        largest_area = 0
-        closest_prediction = None
-
-        for box in predictions.data:
-            area = box[2] * box[3]
-            if area > largest_area:
-                largest_area = area
-                closest_prediction = box
+        index = predictions.closest()
+        if index is None:
+            return None
 
-        return closest_prediction
+        return predictions.data[index]
 
     @abstractmethod
-    def handle(self, predictions: Boxes) -> None:
+    def handle(self, predictions: Detections) -> None:
         """Handles the predictions.
 
         :param predictions: The predictions to handle.
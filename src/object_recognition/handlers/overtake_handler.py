@@ -1,13 +1,14 @@
 import logging
+import numpy as np
 import time
 
-from ultralytics.engine.results import Boxes
-
 from src.config import config
 from src.constants import Label
+from src.object_recognition.detections import Detections
 from src.object_recognition.handlers.base_handler import BaseObjectHandler
 from src.object_recognition.object_controller import ObjectController
 from src.utils.lidar import BaseLidar
+from src.utils.manoeuvre import Manoeuvre, ManoeuvreStep
 
 
 class OvertakeHandler(BaseObjectHandler):
@@ -20,7 +21,9 @@ class OvertakeHandler(BaseObjectHandler):
     """
 
     lidar: BaseLidar
+    manoeuvres: bool = True
     __known_vehicles: set[int]
+    __vehicle_seen: float = 0.0
 
     def __init__(self, controller: ObjectController, lidar: BaseLidar) -> None:
         """Initializes the overtaking handler.
@@ -33,7 +36,7 @@ class OvertakeHandler(BaseObjectHandler):
         self.lidar = lidar
         self.__known_vehicles = set()
 
-    def handle(self, predictions: Boxes) -> None:
+    def handle(self, predictions: Detections) -> None:
         """Handles the detected overtaking vehicles.
 
         :param predictions: The detected overtaking vehicles (.data: x1, y1, x2, y2, track_id, conf, cls).
@@ -46,44 +49,39 @@ class OvertakeHandler(BaseObjectHandler):
         if current_lane not in full_lanes:
             return
 
-        logging.info("Vehicle detected in the current lane. Switching to the next lane.")
-        self.__switch_lane(1)
-
         for track_id in full_lanes[current_lane]:
             self.__known_vehicles.add(track_id)
 
-        self.__wait_until_seen(config["overtake"]["consecutive_scans"])
-        self.__wait_until_safe(config["overtake"]["consecutive_scans"])
+        self.controller.start_manoeuvre(self.__overtake())
 
-        logging.info("The right lane is free. Returning to the previous lane.")
-        self.__switch_lane(0)
+    def is_active(self) -> bool:
+        """Checks if a vehicle was recently seen close to the go-kart.
 
-    def __get_full_lanes(self, predictions: Boxes) -> dict[int, list[int]]:
+        :return: Whether the handler is active.
+        """
+        hold_time = config["object_detection"]["scheduler"]["active_hold_time"]
+        return time.perf_counter() - self.__vehicle_seen < hold_time
+
+    def __get_full_lanes(self, predictions: Detections) -> dict[int, list[int]]:
         """Gets the lanes with detected vehicles.
 
         :param predictions: The detected vehicles.
         :return: The lanes with detected vehicles.
         """
         full_lanes: dict[int, list[int]] = {}
-        for x1, _, x2, y2, track_id, _, _ in predictions.data:
-            if track_id in self.__known_vehicles:
-                continue
-
-            cx = (x1 + x2) // 2
+        reaction_distance = self.controller.get_reaction_distance()
 
-            distance = self.controller.calibration.get_distance_to_y(cx, y2, predictions.orig_shape[::-1])
-            reaction_distance = self.controller.get_reaction_distance()
+        total_distances = predictions.distances - reaction_distance
+        unknown = ~np.isin(predictions.id, list(self.__known_vehicles))
+        close = unknown & (total_distances <= config["overtake"]["min_distance"])
+        if not close.any():
+            return full_lanes
 
-            total_distance = distance - reaction_distance
-            if total_distance > config["overtake"]["min_distance"]:
-                continue
-
-            lane = self.controller.get_object_lane(cx, y2, predictions.orig_shape[::-1])
-            if lane is not None:
-                if lane not in full_lanes:
-                    full_lanes[lane] = []
-
-                full_lanes[lane].append(track_id)
+        self.__vehicle_seen = time.perf_counter()
+        lanes = self.controller.get_object_lanes(predictions.ground[close], predictions.orig_shape[::-1])
+        for track_id, lane in zip(predictions.id[close], lanes, strict=True):
+            if lane >= 0:
+                full_lanes.setdefault(int(lane), []).append(track_id)
 
         return full_lanes
 
@@ -99,50 +97,80 @@ class OvertakeHandler(BaseObjectHandler):
             config["overtake"]["max_points"]
         )
 
-    def __switch_lane(self, lane: int) -> None:
-        """Switch to the specified lane.
+    def __overtake(self) -> Manoeuvre:
+        """Declare the manoeuvre that overtakes the vehicle in the current lane.
 
-        :param lane: The lane to switch to.
+        :return: The overtaking manoeuvre.
         """
-        is_left = lane > self.controller.get_current_lane()
-        config_key = "force_move" if is_left else "force_return"
-
-        self.controller.set_lane(lane)
-
-        if config["overtake"][config_key]["enabled"]:
-            self.controller.lane_assist.toggle()
-            self.controller.set_steering(config["overtake"][config_key]["angle"])
+        consecutive = config["overtake"]["consecutive_scans"]
+        current_lane = self.controller.get_current_lane()
 
-            time.sleep(config["overtake"][config_key]["duration"])
-            self.controller.set_steering(0.0)
+        # Wait until the lidar sees the vehicle next to the go-kart, and then until it has passed it.
+        steps = [
+            ManoeuvreStep(
+                "announce overtake",
+                lambda: logging.info("Vehicle detected in the current lane. Switching to the next lane.")
+            ),
+            *self.__switch_lane(current_lane, 1),
+            ManoeuvreStep(
+                "wait for the vehicle",
+                condition=lambda: not self.__is_safe_to_return(),
+                consecutive=consecutive,
+                trigger=self.lidar.scan_trigger()
+            ),
+            ManoeuvreStep(
+                "wait until passed",
+                condition=self.__is_safe_to_return,
+                consecutive=consecutive,
+                trigger=self.lidar.scan_trigger()
+            ),
+            ManoeuvreStep(
+                "announce return",
+                lambda: logging.info("The right lane is free. Returning to the previous lane.")
+            ),
+            *self.__switch_lane(1, 0),
+        ]
+
+        return Manoeuvre("overtake", steps, lambda outcome: self.__restore(outcome, current_lane))
+
+    def __restore(self, outcome: str, lane: int) -> None:
+        """Return to the original lane and hand the steering back if the overtake was cancelled or failed.
+
+        :param outcome: The outcome of the manoeuvre.
+        :param lane: The lane the go-kart was in before the overtake.
+        """
+        if outcome == "done":
+            return
 
-            time.sleep(config["overtake"][config_key]["straight_duration"])
+        self.controller.set_lane(lane)
+        self.controller.set_steering(0.0)
+        if not self.controller.lane_assist.enabled:
             self.controller.lane_assist.toggle()
 
-    def __wait_until_safe(self, consecutive: int = 3) -> None:
-        """Wait until it is safe to return to the original lane.
+    def __steer(self, angle: float) -> None:
+        """Take the steering over from the lane assist.
 
-        :param consecutive: The number of consecutive scans the lane should be free.
+        :param angle: The steering angle.
         """
-        count = 0
-        while count < consecutive:
-            if self.__is_safe_to_return():
-                count += 1
-            else:
-                count = 0
+        self.controller.lane_assist.toggle()
+        self.controller.set_steering(angle)
 
-            time.sleep(0.1)
+    def __switch_lane(self, current_lane: int, lane: int) -> list[ManoeuvreStep]:
+        """Declare the steps that switch to the specified lane.
 
-    def __wait_until_seen(self, consecutive: int = 3) -> None:
-        """Wait until the vehicle is seen.
-
-        :param consecutive: The number of consecutive scans the vehicle should be detected.
+        :param current_lane: The lane the go-kart is in when switching.
+        :param lane: The lane to switch to.
+        :return: The steps of the lane switch.
         """
-        count = 0
-        while count < consecutive:
-            if self.__is_safe_to_return():
-                count = 0
-            else:
-                count += 1
-
-            time.sleep(0.1)
+        config_key = "force_move" if lane > current_lane else "force_return"
+        force = config["overtake"][config_key]
+
+        steps = [ManoeuvreStep(f"switch to lane {lane}", lambda: self.controller.set_lane(lane))]
+        if force["enabled"]:
+            steps += [
+                ManoeuvreStep("steer", lambda: self.__steer(force["angle"]), force["duration"]),
+                ManoeuvreStep("straighten", lambda: self.controller.set_steering(0.0), force["straight_duration"]),
+                ManoeuvreStep("resume lane assist", self.controller.lane_assist.toggle),
+            ]
+
+        return steps
@@ -1,9 +1,8 @@
 import numpy as np
 
-from ultralytics.engine.results import Boxes
-
 from src.config import config
 from src.constants import Label
+from src.object_recognition.detections import Detections
 from src.object_recognition.handlers.base_handler import BaseObjectHandler
 from src.object_recognition.object_controller import ObjectController
 from src.utils.lidar import BaseLidar
@@ -13,6 +12,7 @@ from src.utils.parking import ParkingManoeuvre
 class ParkingHandler(BaseObjectHandler):
     """A handler for parking spaces."""
 
+    manoeuvres: bool = True
     __lidar: BaseLidar
 
     def __init__(self, controller: ObjectController, lidar: BaseLidar) -> None:
@@ -24,7 +24,7 @@ class ParkingHandler(BaseObjectHandler):
         super().__init__(controller, [Label.PARKING_SPACE])
         self.__lidar = lidar
 
-    def handle(self, predictions: Boxes) -> None:
+    def handle(self, predictions: Detections) -> None:
         """Check if there is a parking space available. If so, set the state to parking.
 
         :param predictions: The detected parking spaces.
@@ -35,44 +35,25 @@ class ParkingHandler(BaseObjectHandler):
         if not self.__any_within_distance(predictions):
             return
 
-        self.controller.stop()
-
-        manoeuvre = ParkingManoeuvre(self.__lidar, self.controller.lane_assist)
-        manoeuvre.park()
+        parking = ParkingManoeuvre(self.__lidar, self.controller.lane_assist)
+        self.controller.start_manoeuvre(parking.manoeuvre(self.__parked))
 
-    def __any_within_distance(self, predictions: Boxes) -> bool:
-        """Check if any parking space is within the distance threshold.
+    def __parked(self, outcome: str) -> None:
+        """Stop handling objects once the go-kart has parked, or has stopped before a parking space that is too small.
 
-        :param predictions: The detected parking spaces.
-        :return: Whether any parking space is within the distance threshold.
+        :param outcome: The outcome of the parking manoeuvre.
         """
-        for bbox in predictions.xyxy:
-            if not self.__is_on_my_right(bbox, predictions.orig_shape):
-                continue
-
-            if self.__is_within_distance(bbox, predictions.orig_shape):
-                return True
-
-        return False
-
-    def __is_within_distance(self, bbox: np.ndarray, shape: tuple[int, int]) -> bool:
-        """Check if the parking space is within the distance threshold.
-
-        :param bbox: The bounding box of the parking space.
-        :param shape: The shape of the image (height, width).
-        :return: Whether the parking space is within the distance threshold.
-        """
-        x, y = (bbox[0] + bbox[2]) // 2, bbox[3]
-        distance = self.controller.calibration.get_distance_to_y(x, y, shape[::-1])
-
-        return distance < config["parking"]["min_distance"]
+        if outcome in ("done", "aborted"):
+            self.controller.stop()
 
     @staticmethod
-    def __is_on_my_right(bbox: np.ndarray, shape: tuple[int, int]) -> bool:
-        """Check if the parking space is on the right side of the go-kart.
+    def __any_within_distance(predictions: Detections) -> bool:
+        """Check if any parking space on the right side of the go-kart is within the distance threshold.
 
-        :param bbox: The bounding box of the parking space.
-        :param shape: The shape of the image (height, width).
-        :return: Whether the parking space is on the right side of the go-kart.
+        :param predictions: The detected parking spaces.
+        :return: Whether any parking space is within the distance threshold.
         """
-        return bbox[0] > shape[1] // 2
+        on_my_right = predictions.xyxy[:, 0] > predictions.orig_shape[1] // 2
+        within_distance = predictions.distances < config["parking"]["min_distance"]
+
+        return bool(np.any(on_my_right & within_distance))
@@ -1,11 +1,11 @@
 import logging
 import numpy as np
-
-from ultralytics.engine.results import Boxes
+import time
 
 from src.config import config
 from src.constants import Label
 from src.driving.speed_controller import SpeedControllerState
+from src.object_recognition.detections import Detections
 from src.object_recognition.handlers.base_handler import BaseObjectHandler
 from src.object_recognition.object_controller import ObjectController
 
@@ -22,6 +22,7 @@ class PedestrianHandler(BaseObjectHandler):
 
     safe_zone_frames: dict[int, int]
     track_history: dict[int, np.ndarray]
+    __crosswalk_seen: float = 0.0
 
     def __init__(self, controller: ObjectController) -> None:
         """Initializes the pedestrian handler.
@@ -32,7 +33,7 @@ class PedestrianHandler(BaseObjectHandler):
         self.safe_zone_frames = {}
         self.track_history = {}
 
-    def handle(self, predictions: Boxes) -> None:
+    def handle(self, predictions: Detections) -> None:
         """Handles the detected pedestrians.
 
         :param predictions: The detected pedestrians (.data: x1, y1, x2, y2, track_id, conf, cls).
@@ -54,6 +55,14 @@ class PedestrianHandler(BaseObjectHandler):
             self.controller.stopped_by = self
             self.controller.set_state(SpeedControllerState.STOPPED)
 
+    def is_active(self) -> bool:
+        """Checks if the go-kart is stopped for or approaching a crosswalk.
+
+        :return: Whether the handler is active.
+        """
+        hold_time = config["object_detection"]["scheduler"]["active_hold_time"]
+        return super().is_active() or time.perf_counter() - self.__crosswalk_seen < hold_time
+
     def __get_direction(self, history: np.ndarray) -> int:
         """Calculates the direction of the pedestrian.
 
@@ -140,24 +149,18 @@ class PedestrianHandler(BaseObjectHandler):
 
         return history[-1][0] > 1 - margin
 
-    def __should_brake(self, crosswalk: np.ndarray, shape: tuple[int, int]) -> bool:
+    def __should_brake(self, distance: float) -> bool:
         """Checks if the crosswalk is close enough to stop.
 
-        :param crosswalk: The bounding box of the crosswalk.
-        :param shape: The shape of the image (width, height).
+        :param distance: The distance to the crosswalk in meters.
         :return: Whether the crosswalk is close enough to stop.
         """
-        x = (crosswalk[0] + crosswalk[2]) // 2
-        y = int(crosswalk[3])
-
-        # Calculate the distance to the crosswalk.
-        distance = self.controller.calibration.get_distance_to_y(x, y, shape)
         stopping_distance = self.controller.get_stopping_distance()
         total_distance = distance - stopping_distance
 
         return total_distance < config["crosswalk"]["min_distance"]
 
-    def __should_stop(self, predictions: Boxes) -> bool:
+    def __should_stop(self, predictions: Detections) -> bool:
         """Checks if the go-kart should stop.
 
         :param predictions: The detected pedestrians.
@@ -166,16 +169,17 @@ class PedestrianHandler(BaseObjectHandler):
         if not predictions.is_track:
             return False
 
-        crosswalks = predictions.data[predictions.cls == Label.CROSSWALK]
-        pedestrians = predictions.data[predictions.cls == Label.PERSON]
+        crosswalks = predictions.of_classes([Label.CROSSWALK])
+        pedestrians = predictions.of_classes([Label.PERSON]).data
 
         if len(crosswalks) == 0 or len(pedestrians) == 0:
             return False
 
-        for crosswalk in crosswalks:
-            if not self.__should_brake(crosswalk, predictions.orig_shape[::-1]):
+        for crosswalk, distance in zip(crosswalks.data, crosswalks.distances, strict=True):
+            if not self.__should_brake(distance):
                 continue
 
+            self.__crosswalk_seen = time.perf_counter()
             for pedestrian in pedestrians:
                 relative_position = self.__get_relative_position(crosswalk, pedestrian)
                 if not self.__overlaps(relative_position):
@@ -1,9 +1,8 @@
 import logging
 import numpy as np
 
-from ultralytics.engine.results import Boxes
-
 from src.config import config
+from src.object_recognition.detections import Detections
 from src.object_recognition.handlers.base_handler import BaseObjectHandler
 from src.object_recognition.object_controller import ObjectController
 
@@ -19,7 +18,7 @@ class SpeedLimitHandler(BaseObjectHandler):
         allowed_classes = list(config["speed_limit"]["class_to_speed"].keys())
         super().__init__(controller, allowed_classes, manual_mode=True)
 
-    def handle(self, predictions: Boxes) -> None:
+    def handle(self, predictions: Detections) -> None:
         """Updates the speed limit based on the detected objects.
 
         :param predictions: The detected speed limit signs.
@@ -28,8 +27,11 @@ class SpeedLimitHandler(BaseObjectHandler):
         if closest is None:
             return
 
+        # The distance to the ground point of the sign is a lookup in the distance map of the camera.
         x, y = self.__get_sign_coords(closest)
-        distance = self.controller.calibration.get_distance_to_y(x, y, predictions.orig_shape[::-1])
+        height, width = predictions.orig_shape
+        distance_map = self.controller.calibration.get_distance_map((width, height))
+        distance = float(distance_map[np.clip(int(y), 0, height - 1), np.clip(int(x), 0, width - 1)])
 
         stopping_distance = self.controller.get_stopping_distance()
         total_distance = distance - stopping_distance
@@ -51,7 +53,7 @@ class SpeedLimitHandler(BaseObjectHandler):
         """
         height = (bbox[3] - bbox[1]) * config["speed_limit"]["height_ratio"]
 
-        x = bbox[0] + bbox[2] // 2
+        x = (bbox[0] + bbox[2]) / 2
         y = bbox[1] + height
 
         return x, y
@@ -1,7 +1,7 @@
-from ultralytics.engine.results import Boxes
-
+from src.config import config
 from src.constants import Label
 from src.driving.speed_controller import SpeedControllerState
+from src.object_recognition.detections import Detections
 from src.object_recognition.handlers.base_handler import BaseObjectHandler
 from src.object_recognition.object_controller import ObjectController
 
@@ -14,9 +14,14 @@ class TrafficLightHandler(BaseObjectHandler):
 
         :param controller: The object controller.
         """
-        super().__init__(controller, [Label.TRAFFIC_LIGHT_RED, Label.TRAFFIC_LIGHT_GREEN], manual_mode=True)
-
-    def handle(self, predictions: Boxes) -> None:
+        super().__init__(
+            controller,
+            [Label.TRAFFIC_LIGHT_RED, Label.TRAFFIC_LIGHT_GREEN],
+            manual_mode=True,
+            sources=tuple(config["traffic_light"]["sources"])
+        )
+
+    def handle(self, predictions: Detections) -> None:
         """Sets the state of the speed controller based on the detected traffic light.
 
         :param predictions: The detected traffic light.
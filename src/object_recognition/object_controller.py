@@ -6,8 +6,9 @@ from src.calibration.data import CalibrationData
 from src.config import config
 from src.driving.speed_controller import ISpeedController, SpeedControllerState
 from src.lane_assist.lane_assist import LaneAssist
+from src.object_recognition.detections import Detections
 from src.object_recognition.handlers.base_handler import BaseObjectHandler
-from src.utils.other import is_point_between
+from src.utils.manoeuvre import Manoeuvre, ManoeuvreExecutor
 
 
 class ObjectController:
@@ -17,20 +18,28 @@ class ObjectController:
     ----------
         calibration (CalibrationData): The calibration data.
         disabled (bool): Whether the object controller is disabled.
+        frame_interval (float): The measured time between two detections in seconds.
         handlers (list[BaseObjectHandler]): The object handlers.
         lane_assist (LaneAssist): The lane assist.
         speed_controller (SpeedController): The speed controller.
         stopped_by (BaseObjectHandler): The handler that stopped the go-kart.
 
+    Manoeuvres (e.g. overtaking or parking) run on the timer thread of a manoeuvre executor, so the object
+    detection and the lane assist keep running at their full rate. While a manoeuvre runs, only the handlers
+    that start manoeuvres are skipped; the others (e.g. pedestrians and traffic lights) keep running.
+
     """
 
     calibration: CalibrationData
     disabled: bool = False
+    frame_interval: float
     handlers: list[BaseObjectHandler]
     lane_assist: LaneAssist
     speed_controller: ISpeedController
     stopped_by: BaseObjectHandler = None
 
+    __manoeuvres: ManoeuvreExecutor
+
     def __init__(
             self,
             calibration: CalibrationData,
@@ -44,10 +53,18 @@ class ObjectController:
         :param speed_controller: The speed controller.
         """
         self.calibration = calibration
+        self.frame_interval = 1 / config["object_detection"]["max_frame_rate"]
         self.handlers = []
         self.lane_assist = lane_assist
         self.speed_controller = speed_controller
 
+        self.__manoeuvres = ManoeuvreExecutor()
+
+    @property
+    def manoeuvring(self) -> bool:
+        """Whether a manoeuvre is running."""
+        return self.__manoeuvres.running
+
     def add_handler(self, handler: BaseObjectHandler) -> None:
         """Adds a handler to the object controller.
 
@@ -55,6 +72,19 @@ class ObjectController:
         """
         self.handlers.append(handler)
 
+    def cancel_manoeuvre(self) -> None:
+        """Cancel the running manoeuvre."""
+        self.__manoeuvres.cancel()
+
+    def start_manoeuvre(self, manoeuvre: Manoeuvre, preempt: bool = False) -> bool:
+        """Run a manoeuvre on the manoeuvre thread.
+
+        :param manoeuvre: The manoeuvre to run.
+        :param preempt: Whether to cancel the running manoeuvre for this one.
+        :return: Whether the manoeuvre was started (only one manoeuvre can run at a time).
+        """
+        return self.__manoeuvres.start(manoeuvre, preempt)
+
     def stop(self) -> None:
         """Stops checking for new objects."""
         self.disabled = True
@@ -81,31 +111,30 @@ class ObjectController:
         :param shape: The shape of the image (width, height).
         :return: The lane the object is in.
         """
-        if len(self.lane_assist.lines) < 2:
-            return None
+        lane = self.get_object_lanes(np.array([[x, y]]), shape)[0]
+        return None if lane < 0 else int(lane)
 
-        point = np.array(self.calibration.transform_point(x, y, shape))
-        for i in range(len(self.lane_assist.lines) - 1):
-            line_left = self.lane_assist.lines[i].points
-            line_right = self.lane_assist.lines[i + 1].points
+    def get_object_lanes(self, points: np.ndarray, shape: tuple[int, int]) -> np.ndarray:
+        """Gets the lanes a batch of objects are in.
 
-            closest_left = np.argmin(np.linalg.norm(line_left - point, axis=1))
-            closest_right = np.argmin(np.linalg.norm(line_right - point, axis=1))
-
-            if is_point_between(line_left[closest_left], line_right[closest_right], point):
-                return len(self.lane_assist.lines) - i - 2
+        :param points: The ground points of the objects in the image (N, 2), as x, y.
+        :param shape: The shape of the image (width, height).
+        :return: The lane of every object, or -1 if it is not in a lane.
+        """
+        lane_index = self.lane_assist.lane_index
+        if len(lane_index.lines) < 2 or len(points) == 0:
+            return np.full(len(points), -1, dtype=int)
 
-        return None
+        return lane_index.get_lanes(self.calibration.transform_points(points, shape))
 
     def get_reaction_distance(self) -> float:
         """Calculates the reaction distance of the go-kart.
 
         :return: The reaction distance in meters.
         """
-        time_until_next = 1 / config["object_detection"]["max_frame_rate"]
         meters_per_second = self.speed_controller.current_speed / 3.6
 
-        return meters_per_second * time_until_next
+        return meters_per_second * self.frame_interval
 
     def get_stopping_distance(self) -> float:
         """Calculates the stopping distance of the go-kart.
@@ -114,24 +143,46 @@ class ObjectController:
         """
         return self.get_reaction_distance() + self.get_braking_distance()
 
-    def handle(self, predictions: Boxes) -> None:
+    def handle(self, predictions: Boxes, source: str = "center") -> None:
         """Handles the predictions.
 
+        The predictions are partitioned by class once, after which every handler gets the detections of
+        its own classes.
+
         :param predictions: The predictions to handle.
+        :param source: The name of the detection source of the predictions.
         """
+        detections = None
         for handler in self.handlers:
             if self.disabled:
                 break
 
+            if handler.manoeuvres and self.manoeuvring:
+                continue
+
+            if source not in handler.sources:
+                continue
+
             if not self.lane_assist.enabled and handler.manual_mode:
                 continue
 
-            filtered_predictions = handler.filter_predictions(predictions)
-            if len(filtered_predictions.data) == 0:
+            if detections is None:
+                detections = Detections.from_boxes(predictions, self.calibration)
+
+            filtered_predictions = handler.filter_predictions(detections)
+            if len(filtered_predictions) == 0:
                 continue
 
             handler.handle(filtered_predictions)
 
+    def update_frame_interval(self, interval: float) -> None:
+        """Update the measured time between two detections.
+
+        :param interval: The time since the previous detection in seconds.
+        """
+        smoothing = config["object_detection"]["scheduler"]["interval_smoothing"]
+        self.frame_interval += smoothing * (interval - self.frame_interval)
+
     def has_stopped(self) -> bool:
         """Checks if the go-kart has stopped.
 
@@ -1,43 +1,86 @@
 import logging
+import numpy as np
 import time
+import torch
 
 from pathlib import Path
 from threading import Thread
 from ultralytics import YOLO
+from ultralytics.engine.results import Boxes
+from ultralytics.trackers.track import TRACKER_MAP
+from ultralytics.utils import IterableSimpleNamespace, yaml_load
+from ultralytics.utils.checks import check_yaml
 
 from src.config import config
+from src.object_recognition.backends import BaseBackend, OpenVINOBackend, UltralyticsBackend
+from src.object_recognition.detection_scheduler import DetectionScheduler
+from src.object_recognition.detection_source import DetectionSource
 from src.object_recognition.object_controller import ObjectController
+from src.object_recognition.regions import RegionPlanner, merge_detections
+from src.object_recognition.tracker import IoUTracker
 from src.utils.video_stream import VideoStream
 
 
 class ObjectDetector:
-    """A class to detect objects in a video stream.
+    """A class to detect objects in one or more video streams.
+
+    The frames of all sources are detected together once per tick, using the backend from the config
+    (see `backends`). Every source has its own tracker, so the track IDs of different sources do not interfere.
+    The tracker is either the built-in `IoUTracker` or one of the trackers of ultralytics. The frame rate
+    and the image size are chosen by the `DetectionScheduler` before every detection. When tiling is enabled,
+    a high image size is replaced by a low-resolution pass over the full images and high-resolution passes
+    over the regions chosen by a `RegionPlanner`.
 
     Attributes
     ----------
         controller (ObjectController): The object controller.
+        detections (int): The number of objects in the last frames.
+        latency (float): The duration of the last detection and handling in seconds.
         model_path (str | Path): The path to the object detection model.
-        stream (VideoStream): The video stream.
+        scheduler (DetectionScheduler): Chooses the frame rate and the image size of the detection.
+        sources (list[DetectionSource]): The sources to detect objects in.
+        streams (dict[str, VideoStream]): The video streams of the cameras, keyed by camera name.
 
     """
 
     controller: ObjectController
+    detections: int = 0
+    latency: float = 0.0
     model_path: str | Path
-    stream: VideoStream
+    scheduler: DetectionScheduler
+    sources: list[DetectionSource]
+    streams: dict[str, VideoStream]
+    __backend: BaseBackend | None = None
+    __planners: dict[str, RegionPlanner]
+    __previous: dict[str, np.ndarray]
     __ready: bool = False
     __thread: Thread
+    __trackers: dict[str, object]
 
-    def __init__(self, model_path: str | Path, controller: ObjectController, camera_id: int) -> None:
+    def __init__(
+            self,
+            model_path: str | Path,
+            controller: ObjectController,
+            sources: list[DetectionSource] | None = None
+    ) -> None:
         """Initializes the object detector.
 
         :param model_path: The path to the object detection model.
         :param controller: The object controller.
-        :param camera_id: The camera ID.
+        :param sources: The sources to detect objects in (defaults to the sources in the config).
         """
         self.controller = controller
         self.model_path = model_path
-        self.stream = VideoStream(camera_id)
+        self.scheduler = DetectionScheduler(controller)
+        self.sources = sources if sources is not None else DetectionSource.from_config()
+        self.streams = {
+            source.camera: VideoStream(config["camera_ids"][source.camera]) for source in self.sources
+        }
+
+        self.__planners = {source.name: RegionPlanner(source.regions) for source in self.sources}
+        self.__previous = {}
         self.__thread = Thread(target=self.__track_video_stream, daemon=True)
+        self.__trackers = {}
 
     @property
     def ready(self) -> bool:
@@ -45,8 +88,10 @@ class ObjectDetector:
         return self.__ready
 
     def start(self) -> None:
-        """Start looking for objects in the video stream."""
-        self.stream.start()
+        """Start looking for objects in the video streams."""
+        for stream in self.streams.values():
+            stream.start()
+
         self.__thread.start()
 
         while not self.ready:
@@ -55,47 +100,170 @@ class ObjectDetector:
         logging.info("Started the object detection model.")
 
     def stop(self) -> None:
-        """Stop looking for objects in the video stream."""
+        """Stop looking for objects in the video streams."""
         self.controller.disabled = True
         self.__thread.join()
 
-    def __track_video_stream(self) -> None:
-        """Track the objects in the video stream."""
-        model = YOLO(self.model_path)
+    def detect(self, frames: dict[str, np.ndarray], image_size: int | None = None) -> dict[str, Boxes]:
+        """Detect and track the objects in the frames of all sources.
+
+        :param frames: The frames of the cameras, keyed by camera name.
+        :param image_size: The size to resize the images to before inference (defaults to the config).
+        :return: The detected objects in the coordinates of the camera frames, keyed by source name.
+        """
+        if self.__backend is None:
+            self.__backend = self.__create_backend()
+
+        sources = [source for source in self.sources if source.camera in frames]
+        images = [source.extract(frames[source.camera]) for source in sources]
+
+        image_size = image_size or config["object_detection"]["image_size"]
+        tiling = config["object_detection"]["tiling"]
+        if tiling["enabled"] and image_size > tiling["image_size"]:
+            detections = self.__predict_tiled(sources, images)
+        else:
+            detections = self.__backend.predict(images, image_size)
+
+        predictions = {}
+        for source, image, data in zip(sources, images, detections, strict=True):
+            boxes = self.__track(source.name, Boxes(torch.as_tensor(data), image.shape[:2]), image)
+            self.__previous[source.name] = boxes.data.numpy()
+            predictions[source.name] = source.to_frame(boxes, frames[source.camera].shape)
+
+        return predictions
+
+    def handle(self, predictions: dict[str, Boxes]) -> None:
+        """Hand the detected objects of every source to the object controller.
+
+        :param predictions: The detected objects, keyed by source name.
+        """
+        for source, boxes in predictions.items():
+            self.controller.handle(boxes, source)
+
+    def __create_backend(self) -> BaseBackend:
+        """Create the object detection backend from the config.
+
+        :return: The backend.
+        """
+        match config["object_detection"]["backend"]:
+            case "openvino":
+                return OpenVINOBackend(
+                    self.model_path,
+                    config["object_detection"]["openvino"]["device"],
+                    config["object_detection"]["openvino"]["requests"]
+                )
+            case "ultralytics":
+                return UltralyticsBackend(self.model_path)
+            case backend:
+                raise ValueError(f"Unknown object detection backend: {backend}")
+
+    def __predict_tiled(self, sources: list[DetectionSource], images: list[np.ndarray]) -> list[np.ndarray]:
+        """Detect the objects in the images at a low resolution and in their regions at a high resolution.
+
+        The regions are planned from the detections of the previous frames, so both passes are submitted to
+        the backend before waiting for either of them.
+
+        :param sources: The sources of the images.
+        :param images: The images of the sources.
+        :return: The merged detections of every image (x1, y1, x2, y2, conf, cls).
+        """
+        tiling = config["object_detection"]["tiling"]
+        full = self.__backend.submit(images, tiling["image_size"])
+
+        crops = []
+        owners = []
+        for i, (source, image) in enumerate(zip(sources, images, strict=True)):
+            for x, y, width, height in self.__planners[source.name].plan(image.shape, self.__previous.get(source.name)):
+                crops.append(image[y:y + height, x:x + width])
+                owners.append((i, (x, y, width, height)))
+
+        regions = self.__backend.submit(crops, tiling["region_size"]) if crops else None
+
+        detections = [[data] for data in full.result()]
+        if regions is not None:
+            for (i, region), data in zip(owners, regions.result(), strict=True):
+                detections[i].append(RegionPlanner.to_image(data, region, images[i].shape))
+
+        return [merge_detections(data, config["object_detection"]["iou"]) for data in detections]
+
+    def __track(self, source: str, detections: Boxes, image: np.ndarray) -> Boxes:
+        """Update the tracker of a source with its detections.
+
+        :param source: The name of the source.
+        :param detections: The detections of the source (.data: x1, y1, x2, y2, conf, cls).
+        :param image: The image of the source.
+        :return: The tracked objects (.data: x1, y1, x2, y2, track_id, conf, cls).
+        """
+        if source not in self.__trackers:
+            self.__trackers[source] = self.__create_tracker()
+
+        tracker = self.__trackers[source]
+        if isinstance(tracker, IoUTracker):
+            return Boxes(torch.as_tensor(tracker.update(detections.data.numpy())), detections.orig_shape)
+
+        if len(detections) == 0:
+            return detections
 
-        while not self.controller.disabled and self.stream.has_next():
+        tracks = tracker.update(detections.numpy(), image)
+        if len(tracks) == 0:
+            return Boxes(torch.empty((0, 7)), detections.orig_shape)
+
+        return Boxes(torch.as_tensor(tracks[:, :-1]), detections.orig_shape)
+
+    @staticmethod
+    def __create_tracker() -> object:
+        """Create a tracker from the config.
+
+        :return: The built-in tracker, or the ultralytics tracker of the given config file.
+        """
+        if config["object_detection"]["tracker"] == "builtin":
+            return IoUTracker()
+
+        cfg = IterableSimpleNamespace(**yaml_load(check_yaml(config["object_detection"]["tracker"])))
+        return TRACKER_MAP[cfg.tracker_type](args=cfg, frame_rate=30)
+
+    def __track_video_stream(self) -> None:
+        """Track the objects in the video streams."""
+        previous = None
+        while not self.controller.disabled and all(stream.has_next() for stream in self.streams.values()):
             start = time.perf_counter()
-            frame = self.stream.next()
-            results = model.track(
-                frame,
-                imgsz=config["object_detection"]["image_size"],
-                conf=config["object_detection"]["min_confidence"],
-                verbose=config["object_detection"]["verbose"],
-                persist=True,
-                device="cpu"
-            )
+            if previous is not None:
+                self.controller.update_frame_interval(start - previous)
+
+            frames = {camera: stream.next() for camera, stream in self.streams.items()}
+            predictions = self.detect(frames, self.scheduler.image_size)
 
             self.__ready = True
-            self.controller.handle(results[0].boxes)
+            self.handle(predictions)
             end = time.perf_counter()
 
-            # Sleep for the remaining time to keep the FPS constant.
-            sleep_time = 1 / config["object_detection"]["max_frame_rate"] - (end - start)
-            time.sleep(max(0, sleep_time))
+            self.detections = sum(len(boxes) for boxes in predictions.values())
+            self.latency = end - start
+            self.scheduler.update(self.latency)
+
+            # Sleep for the remaining time to keep the FPS of the scheduler.
+            previous = start
+            time.sleep(max(0, self.scheduler.interval - (end - start)))
 
     @classmethod
-    def from_model(cls, path: str | Path, controller: ObjectController, camera_id: int) -> "ObjectDetector":
+    def from_model(
+            cls,
+            path: str | Path,
+            controller: ObjectController,
+            sources: list[DetectionSource] | None = None
+    ) -> "ObjectDetector":
         """Creates a new instance of the object detector from a model file.
 
         :param path: The path to the model file.
         :param controller: The object controller.
-        :param camera_id: The camera ID.
+        :param sources: The sources to detect objects in (defaults to the sources in the config).
         :return: The object detector instance.
         """
         path = Path(path)
         ov_path = path.parent / f"{path.stem}_int8_openvino_model/"
         if not ov_path.exists():
+            # A dynamic model can be detected at every image size the scheduler picks, with all sources in one batch.
             model = YOLO(path)
-            model.export(format="openvino", int8=True)
+            model.export(format="openvino", int8=True, dynamic=True, imgsz=config["object_detection"]["image_size"])
 
-        return cls(ov_path, controller, camera_id)
+        return cls(ov_path, controller, sources)
@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+
+from src.config import config
+
+
+def merge_detections(detections: list[np.ndarray], iou: float) -> np.ndarray:
+    """Merge the detections of overlapping passes with a class-aware non-maximum suppression.
+
+    :param detections: The detections of every pass (N, 6), as x1, y1, x2, y2, conf, cls.
+    :param iou: The IoU threshold of the non-maximum suppression.
+    :return: The merged detections (N, 6).
+    """
+    data = np.concatenate(detections).astype(np.float32) if detections else np.empty((0, 6), dtype=np.float32)
+    if len(data) == 0:
+        return data
+
+    xywh = np.column_stack((data[:, :2], data[:, 2:4] - data[:, :2]))
+    indices = cv2.dnn.NMSBoxesBatched(xywh, data[:, 4], data[:, 5].astype(int), 0.0, iou)
+
+    return data[np.asarray(indices, dtype=int).reshape(-1)]
+
+
+class RegionPlanner:
+    """Chooses the regions of an image to detect objects in at a high resolution.
+
+    The full image is detected at a low resolution, which is enough for large objects. Small objects,
+    such as distant signs, are detected in regions at their native resolution. These are the fixed
+    regions of the source (e.g. where signs appear) and the regions around small objects that were
+    detected in the previous frame.
+
+    Attributes
+    ----------
+        regions (list[tuple[int, int, int, int]]): The fixed regions (x, y, width, height).
+
+    """
+
+    regions: list[tuple[int, int, int, int]]
+
+    def __init__(self, regions: list[tuple[int, int, int, int]]) -> None:
+        """Initialize the planner.
+
+        :param regions: The fixed regions (x, y, width, height).
+        """
+        self.regions = regions
+
+    def plan(self, shape: tuple[int, ...], previous: np.ndarray | None) -> list[tuple[int, int, int, int]]:
+        """Choose the regions to detect objects in.
+
+        :param shape: The shape of the image.
+        :param previous: The objects of the previous frame (.data: x1, y1, x2, y2, ...), if any.
+        :return: The regions (x, y, width, height), clipped to the image.
+        """
+        tiling = config["object_detection"]["tiling"]
+        size = tiling["region_size"]
+        regions = list(self.regions)
+
+        if previous is not None and len(previous) > 0:
+            # Follow the smallest objects, as the large ones are found by the low-resolution pass.
+            widths = previous[:, 2] - previous[:, 0]
+            small = previous[widths < tiling["max_object_size"]]
+            small = small[np.argsort(small[:, 2] - small[:, 0])][:tiling["max_tracked_regions"]]
+
+            for x1, y1, x2, y2 in small[:, :4]:
+                cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+                regions.append((int(cx - size / 2), int(cy - size / 2), size, size))
+
+        height, width = shape[:2]
+        clipped = []
+        for x, y, w, h in regions:
+            x, y = min(max(x, 0), max(width - w, 0)), min(max(y, 0), max(height - h, 0))
+            clipped.append((x, y, min(w, width - x), min(h, height - y)))
+
+        return clipped
+
+    @staticmethod
+    def to_image(
+            detections: np.ndarray,
+            region: tuple[int, int, int, int],
+            shape: tuple[int, ...]
+    ) -> np.ndarray:
+        """Convert the detections in a region to the coordinates of the image.
+
+        Objects that touch the border of a region (but not of the image) are cut off, so they are
+        left to the low-resolution pass.
+
+        :param detections: The detections in the region (N, 6), as x1, y1, x2, y2, conf, cls.
+        :param region: The region (x, y, width, height).
+        :param shape: The shape of the image.
+        :return: The detections that lie within the region, in the coordinates of the image.
+        """
+        x, y, width, height = region
+        margin = config["object_detection"]["tiling"]["border_margin"]
+
+        cut_left = (detections[:, 0] < margin) & (x > 0)
+        cut_top = (detections[:, 1] < margin) & (y > 0)
+        cut_right = (detections[:, 2] > width - margin) & (x + width < shape[1])
+        cut_bottom = (detections[:, 3] > height - margin) & (y + height < shape[0])
+
+        data = detections[~(cut_left | cut_top | cut_right | cut_bottom)].copy()
+        data[:, [0, 2]] += x
+        data[:, [1, 3]] += y
+
+        return data
@@ -0,0 +1,182 @@
+import numpy as np
+
+from scipy.optimize import linear_sum_assignment
+
+from src.config import config
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Calculate the intersection over union of every pair of boxes.
+
+    :param a: The first boxes (N, 4), as x1, y1, x2, y2.
+    :param b: The second boxes (M, 4), as x1, y1, x2, y2.
+    :return: The intersection over union of every pair (N, M).
+    """
+    top_left = np.maximum(a[:, None, :2], b[None, :, :2])
+    bottom_right = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    intersection = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+
+    area_a = np.prod(a[:, 2:] - a[:, :2], axis=1)
+    area_b = np.prod(b[:, 2:] - b[:, :2], axis=1)
+    union = area_a[:, None] + area_b[None, :] - intersection
+
+    return np.divide(intersection, union, out=np.zeros_like(intersection), where=union > 0)
+
+
+def match_greedy(scores: np.ndarray, min_score: float) -> tuple[np.ndarray, np.ndarray]:
+    """Match rows to columns by repeatedly taking the best remaining pair.
+
+    :param scores: The score of every pair (N, M).
+    :param min_score: The minimum score of a match.
+    :return: The indices of the matched rows and columns.
+    """
+    rows, cols = np.nonzero(scores >= min_score)
+    order = np.argsort(-scores[rows, cols], kind="stable")
+
+    used_rows = np.zeros(scores.shape[0], dtype=bool)
+    used_cols = np.zeros(scores.shape[1], dtype=bool)
+    matches = []
+    for row, col in zip(rows[order], cols[order], strict=True):
+        if not used_rows[row] and not used_cols[col]:
+            used_rows[row] = used_cols[col] = True
+            matches.append((row, col))
+
+    if not matches:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    return tuple(np.array(matches, dtype=int).T)
+
+
+def match_hungarian(scores: np.ndarray, min_score: float) -> tuple[np.ndarray, np.ndarray]:
+    """Match rows to columns with the highest total score (Hungarian algorithm).
+
+    :param scores: The score of every pair (N, M).
+    :param min_score: The minimum score of a match.
+    :return: The indices of the matched rows and columns.
+    """
+    rows, cols = linear_sum_assignment(scores, maximize=True)
+    keep = scores[rows, cols] >= min_score
+
+    return rows[keep], cols[keep]
+
+
+class IoUTracker:
+    """A lightweight multi-object tracker that associates detections by their overlap.
+
+    Every track is predicted to its next position with a constant velocity, after which the detections
+    are matched to the tracks of the same class by their IoU. The state of all tracks is kept in arrays,
+    so a frame only takes a few vectorized operations.
+
+    Attributes
+    ----------
+        boxes (np.ndarray): The boxes of the tracks (N, 4), as x1, y1, x2, y2.
+        classes (np.ndarray): The class of every track.
+        confidences (np.ndarray): The confidence of the last detection of every track.
+        hits (np.ndarray): The number of frames every track was detected in.
+        ids (np.ndarray): The identifier of every track.
+        misses (np.ndarray): The number of frames since every track was last detected.
+        velocities (np.ndarray): The velocity of the boxes of the tracks (N, 4), in pixels per frame.
+
+    """
+
+    boxes: np.ndarray
+    classes: np.ndarray
+    confidences: np.ndarray
+    hits: np.ndarray
+    ids: np.ndarray
+    misses: np.ndarray
+    velocities: np.ndarray
+
+    __matching: str
+    __max_age: int
+    __min_hits: int
+    __min_iou: float
+    __next_id: int = 1
+    __smoothing: float
+
+    def __init__(self) -> None:
+        """Initialize the tracker."""
+        self.__matching = config["object_detection"]["builtin_tracker"]["matching"]
+        self.__max_age = config["object_detection"]["builtin_tracker"]["max_age"]
+        self.__min_hits = config["object_detection"]["builtin_tracker"]["min_hits"]
+        self.__min_iou = config["object_detection"]["builtin_tracker"]["min_iou"]
+        self.__smoothing = config["object_detection"]["builtin_tracker"]["velocity_smoothing"]
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Remove all tracks."""
+        self.boxes = np.empty((0, 4), dtype=np.float32)
+        self.velocities = np.empty((0, 4), dtype=np.float32)
+        self.classes = np.empty(0, dtype=np.float32)
+        self.confidences = np.empty(0, dtype=np.float32)
+        self.hits = np.empty(0, dtype=int)
+        self.ids = np.empty(0, dtype=int)
+        self.misses = np.empty(0, dtype=int)
+
+    def update(self, detections: np.ndarray) -> np.ndarray:
+        """Update the tracks with the detections of a frame.
+
+        :param detections: The detections (N, 6), as x1, y1, x2, y2, conf, cls.
+        :return: The tracks that were detected in this frame (M, 7), as x1, y1, x2, y2, track_id, conf, cls.
+        """
+        detections = np.asarray(detections, dtype=np.float32).reshape(-1, 6)
+        predicted = self.boxes + self.velocities
+
+        # Only allow detections to be matched to tracks of the same class.
+        scores = box_iou(predicted, detections[:, :4])
+        scores[self.classes[:, None] != detections[None, :, 5]] = 0.0
+
+        match = match_hungarian if self.__matching == "hungarian" else match_greedy
+        tracks, matched = match(scores, self.__min_iou)
+
+        # Update the matched tracks.
+        velocities = detections[matched, :4] - self.boxes[tracks]
+        self.velocities[tracks] += self.__smoothing * (velocities - self.velocities[tracks])
+        self.boxes[tracks] = detections[matched, :4]
+        self.confidences[tracks] = detections[matched, 4]
+        self.hits[tracks] += 1
+
+        # Let the unmatched tracks coast along their velocity.
+        self.misses += 1
+        self.misses[tracks] = 0
+        lost = self.misses > 0
+        self.boxes[lost] = predicted[lost]
+
+        # Start new tracks for the unmatched detections.
+        new = np.ones(len(detections), dtype=bool)
+        new[matched] = False
+        self.__add(detections[new])
+
+        # Remove the tracks that have been lost for too long.
+        alive = self.misses <= self.__max_age
+        self.boxes, self.velocities = self.boxes[alive], self.velocities[alive]
+        self.classes, self.confidences = self.classes[alive], self.confidences[alive]
+        self.hits, self.ids, self.misses = self.hits[alive], self.ids[alive], self.misses[alive]
+
+        visible = (self.misses == 0) & (self.hits >= self.__min_hits)
+        return np.column_stack((
+            self.boxes[visible],
+            self.ids[visible],
+            self.confidences[visible],
+            self.classes[visible]
+        )).astype(np.float32)
+
+    def __add(self, detections: np.ndarray) -> None:
+        """Start a new track for every detection.
+
+        :param detections: The detections (N, 6), as x1, y1, x2, y2, conf, cls.
+        """
+        count = len(detections)
+        if count == 0:
+            return
+
+        self.boxes = np.concatenate((self.boxes, detections[:, :4]))
+        self.velocities = np.concatenate((self.velocities, np.zeros((count, 4), dtype=np.float32)))
+        self.classes = np.concatenate((self.classes, detections[:, 5]))
+        self.confidences = np.concatenate((self.confidences, detections[:, 4]))
+        self.hits = np.concatenate((self.hits, np.ones(count, dtype=int)))
+        self.ids = np.concatenate((self.ids, np.arange(self.__next_id, self.__next_id + count)))
+        self.misses = np.concatenate((self.misses, np.zeros(count, dtype=int)))
+
+        self.__next_id += count
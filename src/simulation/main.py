@@ -14,6 +14,7 @@ from src.lane_assist.stop_line_assist import StopLineAssist
 from src.simulation.can_controller import SimCANController
 from src.simulation.sim_lidar import SimLidar
 from src.telemetry.app import TelemetryServer
+from src.utils.manoeuvre import ManoeuvreExecutor
 from src.utils.parking import ParkingManoeuvre
 
 
@@ -110,8 +111,10 @@ def simulate_lane_assist(park: bool = False) -> None:
         lidar = SimLidar(client)
         lidar.start()
 
-        manoeuvre = ParkingManoeuvre(lidar, lane_assist)
-        manoeuvre.park()
+        # Without an object controller, the simulation runs the parking manoeuvre on an executor of its own.
+        executor = ManoeuvreExecutor()
+        executor.start(ParkingManoeuvre(lidar, lane_assist).manoeuvre())
+        executor.wait()
 
 
 def start_simulator() -> None:
@@ -25,7 +25,6 @@ class SimLidar(BaseLidar):
         """Initializes the lidar."""
         super().__init__()
         self.client = client
-        self.scan_data = np.full(360, np.inf, dtype=np.float32)
         self.thread = Thread(target=self.__listen, daemon=True)
 
     def start(self) -> None:
@@ -51,13 +50,7 @@ class SimLidar(BaseLidar):
                 ),
                 2,
             )
-            angles = angles.astype(int)
-
             distances *= 13.5
             distances[distances > 6000] = np.inf
 
-            angle_starts = np.unique(angles, return_index=True)[1]
-            updating_angles = (angles[angle_starts] + 180) % 360
-
-            for i, angle in enumerate(updating_angles):
-                self.scan_data[angle] = distances[angle_starts[i]]
+            self.update_scan((angles[:, 0] + 180) % 360, distances[:, 0])
@@ -4,15 +4,22 @@ import sys
 import threading
 import uvicorn
 
+from datetime import datetime
 from fastapi import HTTPException
+from pathlib import Path
 from starlette.responses import HTMLResponse
 from starlette.staticfiles import StaticFiles
 from typing import Any
 
 from src.config import config
+from src.telemetry.data_stream.log_forwarder import LogForwarder
 from src.telemetry.data_stream.routes import create_router
+from src.telemetry.data_stream.signals import SignalSampler
 from src.telemetry.data_stream.websocket_handler import WebsocketHandler
 from src.telemetry.file_io_wrapper import FileIOWrapper
+from src.telemetry.recording.player import TelemetryPlayer
+from src.telemetry.recording.recorder import TelemetryRecorder
+from src.telemetry.recording.routes import create_recording_router
 from src.telemetry.update_config.routes import create_config_router
 from src.utils.ip_loader import get_ip
 
@@ -27,7 +34,15 @@ def get_path(rel_path: str) -> str:
 
 
 class TelemetryServer:
-    """A class to represent a telemetry server."""
+    """A class to represent a telemetry server.
+
+    Attributes
+    ----------
+        player (TelemetryPlayer | None): The player of the recording that is being played back.
+
+    """
+
+    player: TelemetryPlayer | None = None
 
     def __init__(self) -> None:
         """Initialize the telemetry server."""
@@ -36,14 +51,18 @@ class TelemetryServer:
         self.thread = threading.Thread(target=self.__start, daemon=True)
         self.__app = fastapi.FastAPI()
 
-        sys.stdout = FileIOWrapper(self, sys.stdout)
-        sys.stderr = FileIOWrapper(self, sys.stderr)
-
         self.available_functions = {}
 
         self.websocket_handler = WebsocketHandler()
+        self.logs = LogForwarder(self.websocket_handler)
+        self.signals = SignalSampler(self.websocket_handler)
+
+        sys.stdout = FileIOWrapper(self, sys.stdout)
+        sys.stderr = FileIOWrapper(self, sys.stderr)
+
         self.__app.include_router(create_router(self.websocket_handler))
         self.__app.include_router(create_config_router())
+        self.__app.include_router(create_recording_router(self))
 
         self.__app.get("/")(self.__index_route)
         self.__app.post("/execute_function/{name}")(self.__execute_function)
@@ -69,6 +88,66 @@ class TelemetryServer:
         """Start the telemetry server."""
         if config["telemetry"]["enabled"]:
             self.thread.start()
+            self.logs.start()
+            self.signals.start()
+
+            if config["telemetry"]["recording"]["enabled"]:
+                self.start_recording()
+
+    def get_recording_path(self, name: str) -> Path:
+        """Get the directory of a recording.
+
+        :param name: The name of the recording.
+        :return: The directory of the recording.
+        """
+        if Path(name).name != name:
+            raise ValueError(f"Invalid recording name: {name}")
+
+        return Path(config["telemetry"]["recording"]["path"]) / name
+
+    def start_recording(self) -> Path:
+        """Start recording all channels into a new recording.
+
+        :return: The directory of the recording.
+        """
+        self.stop_recording()
+
+        path = self.get_recording_path(datetime.now().strftime("%m_%d_%Y_%H_%M_%S"))
+        self.websocket_handler.start_recording(TelemetryRecorder(path))
+
+        return path
+
+    def stop_recording(self) -> None:
+        """Stop recording the channels."""
+        recorder = self.websocket_handler.stop_recording()
+        if recorder is not None:
+            recorder.close()
+
+    def play(self, name: str, position: float = 0.0) -> TelemetryPlayer:
+        """Play a recording back to the clients.
+
+        Until the playback is stopped, the live telemetry is not sent to the clients, but it is still
+        recorded if a recording is running. The played back records are never recorded again.
+
+        :param name: The name of the recording.
+        :param position: The position to start at in seconds.
+        :return: The player.
+        """
+        self.stop_playback()
+
+        self.player = TelemetryPlayer(self.get_recording_path(name), self.websocket_handler)
+        self.websocket_handler.playback = True
+        self.player.start(position)
+
+        return self.player
+
+    def stop_playback(self) -> None:
+        """Stop playing back a recording."""
+        if self.player is not None:
+            self.player.stop()
+            self.player = None
+
+        self.websocket_handler.playback = False
 
     def __start(self) -> None:
         """Start the telemetry server."""
@@ -0,0 +1,145 @@
+import cv2
+import logging
+import numpy as np
+import threading
+import time
+
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from src.config import config
+from src.telemetry.data_stream.quality import QualityLevel, get_quality_levels
+
+
+class ImagePublisher:
+    """Encodes the images of the telemetry channels on a worker pool.
+
+    Publishing an image only stores a reference to it. Every channel is encoded at most once at a time
+    and at most at its configured frame rate; images that arrive while the channel is being encoded,
+    or too soon after the previous image, are dropped. An image is encoded once for every quality level
+    that is used by the clients of its channel.
+
+    Attributes
+    ----------
+        dropped (dict[str, int]): The number of dropped images per channel.
+
+    """
+
+    dropped: dict[str, int]
+
+    __busy: set[str]
+    __deliver: Callable[[str, dict[int, bytes], int], None]
+    __get_levels: Callable[[str], set[int]]
+    __last_published: dict[str, float]
+    __levels: list[QualityLevel]
+    __lock: threading.Lock
+    __pool: ThreadPoolExecutor
+    __sequences: dict[str, int]
+
+    def __init__(
+            self,
+            deliver: Callable[[str, dict[int, bytes], int], None],
+            get_levels: Callable[[str], set[int]]
+    ) -> None:
+        """Initialize the image publisher.
+
+        :param deliver: The function that sends the JPEG images per quality level and their sequence number
+                        to the clients of a channel.
+        :param get_levels: The function that returns the quality levels used by the clients of a channel.
+        """
+        self.dropped = {}
+
+        self.__busy = set()
+        self.__deliver = deliver
+        self.__get_levels = get_levels
+        self.__last_published = {}
+        self.__levels = get_quality_levels()
+        self.__sequences = {}
+        self.__lock = threading.Lock()
+        self.__pool = ThreadPoolExecutor(
+            max_workers=config["telemetry"]["images"]["workers"],
+            thread_name_prefix="telemetry"
+        )
+
+    def publish(
+            self,
+            name: str,
+            image: np.ndarray,
+            render: Callable[[np.ndarray], np.ndarray] | None = None
+    ) -> bool:
+        """Publish an image on a channel.
+
+        The image is not copied, so it should not be modified afterwards.
+
+        :param name: The name of the channel.
+        :param image: The image to publish.
+        :param render: An optional function that draws on the image before it is encoded (e.g. an overlay).
+                       It is called on a worker thread and should not modify the given image in place.
+        :return: Whether the image will be encoded.
+        """
+        now = time.monotonic()
+        interval = 1 / self.__get_max_frame_rate(name)
+
+        with self.__lock:
+            if name in self.__busy or now - self.__last_published.get(name, -interval) < interval:
+                self.dropped[name] = self.dropped.get(name, 0) + 1
+                return False
+
+            self.__busy.add(name)
+            self.__last_published[name] = now
+            sequence = self.__sequences.get(name, -1) + 1
+            self.__sequences[name] = sequence
+
+        self.__pool.submit(self.__encode, name, image, sequence, render)
+        return True
+
+    def __encode(
+            self,
+            name: str,
+            image: np.ndarray,
+            sequence: int,
+            render: Callable[[np.ndarray], np.ndarray] | None
+    ) -> None:
+        """Render and encode an image and deliver it to the clients of the channel.
+
+        :param name: The name of the channel.
+        :param image: The image to encode.
+        :param sequence: The sequence number of the image within the channel.
+        :param render: The function that draws on the image, if any.
+        """
+        try:
+            if render is not None:
+                image = render(image)
+
+            buffers = {level: self.__encode_level(image, level) for level in self.__get_levels(name)}
+            if buffers:
+                self.__deliver(name, buffers, sequence)
+        except Exception as e:
+            logging.error("Failed to encode the image of channel '%s': %s", name, e)
+        finally:
+            with self.__lock:
+                self.__busy.discard(name)
+
+    def __encode_level(self, image: np.ndarray, level: int) -> bytes:
+        """Encode an image at a quality level.
+
+        :param image: The image to encode.
+        :param level: The index of the quality level.
+        :return: The JPEG encoded image.
+        """
+        settings = self.__levels[level]
+        if settings.scale != 1.0:
+            image = cv2.resize(image, None, fx=settings.scale, fy=settings.scale, interpolation=cv2.INTER_AREA)
+
+        _, buffer = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, settings.quality])
+        return buffer.tobytes()
+
+    @staticmethod
+    def __get_max_frame_rate(name: str) -> float:
+        """Get the maximum frame rate of a channel.
+
+        :param name: The name of the channel.
+        :return: The maximum frame rate.
+        """
+        rates = config["telemetry"]["images"]["max_frame_rate"]
+        return rates.get(name, rates["default"])
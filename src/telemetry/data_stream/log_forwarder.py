@@ -0,0 +1,83 @@
+import threading
+import time
+
+from collections import deque
+
+from src.config import config
+from src.telemetry.data_stream.websocket_handler import WebsocketHandler
+
+
+class LogForwarder:
+    """Forwards log lines to the dashboard in batches.
+
+    Adding a line only appends it to a queue. A background thread coalesces the queued lines
+    into a single message at a fixed interval. The most recent lines are kept, so newly connected
+    clients receive the history first.
+
+    Attributes
+    ----------
+        channel (str): The name of the websocket channel.
+
+    """
+
+    channel: str
+
+    __handler: WebsocketHandler
+    __history: deque[str]
+    __lock: threading.Lock
+    __pending: deque[str]
+    __thread: threading.Thread
+
+    def __init__(self, handler: WebsocketHandler, channel: str = "logs") -> None:
+        """Initialize the log forwarder.
+
+        :param handler: The websocket handler to send the lines with.
+        :param channel: The name of the websocket channel.
+        """
+        self.channel = channel
+
+        self.__handler = handler
+        self.__history = deque(maxlen=config["telemetry"]["logs"]["history"])
+        self.__lock = threading.Lock()
+        self.__pending = deque(maxlen=config["telemetry"]["logs"]["max_pending"])
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+        handler.set_greeting(channel, self.__describe)
+
+    def put(self, line: str) -> None:
+        """Queue a line to be forwarded.
+
+        If the lines are not forwarded fast enough, the oldest queued lines are dropped.
+
+        :param line: The line to forward.
+        """
+        self.__pending.append(line)
+
+    def start(self) -> None:
+        """Start forwarding the queued lines."""
+        self.__thread.start()
+
+    def __describe(self) -> str:
+        """Get the recent lines for a new client.
+
+        :return: The recent lines, separated by newlines.
+        """
+        with self.__lock:
+            return "\n".join(self.__history)
+
+    def __run(self) -> None:
+        """Forward the queued lines in batches."""
+        while True:
+            time.sleep(config["telemetry"]["logs"]["flush_interval"])
+            if not self.__pending:
+                continue
+
+            lines = []
+            while self.__pending:
+                lines.append(self.__pending.popleft())
+
+            # The lines are sent while holding the lock, so a client that connects meanwhile receives them
+            # either in its history or in this batch, never twice.
+            with self.__lock:
+                self.__history.extend(lines)
+                self.__handler.send_text(self.channel, "\n".join(lines))
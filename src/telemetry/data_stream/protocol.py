@@ -0,0 +1,62 @@
+import numpy as np
+import struct
+import time
+
+from enum import IntEnum
+
+
+PROTOCOL_VERSION = 1
+
+# version, encoding, channel name length, padding, sequence, timestamp (ms since epoch)
+FRAME_HEADER = struct.Struct("<BBBxId")
+
+# number of samples, number of signals
+SIGNALS_HEADER = struct.Struct("<HH")
+
+
+class FrameEncoding(IntEnum):
+    """The encoding of the payload of a binary websocket frame."""
+
+    JPEG = 1
+    SIGNALS = 2
+
+
+def pack_frame(
+        channel: str,
+        sequence: int,
+        encoding: FrameEncoding,
+        payload: bytes,
+        timestamp: float | None = None
+) -> bytes:
+    """Pack a payload into a binary websocket frame.
+
+    The frame starts with a fixed-size header, followed by the UTF-8 encoded channel name and the payload.
+
+    :param channel: The name of the channel.
+    :param sequence: The sequence number of the frame within the channel.
+    :param encoding: The encoding of the payload.
+    :param payload: The payload.
+    :param timestamp: The timestamp of the frame in milliseconds since epoch (defaults to now).
+    :return: The binary frame.
+    """
+    if timestamp is None:
+        timestamp = time.time() * 1000
+
+    name = channel.encode("utf-8")
+    header = FRAME_HEADER.pack(PROTOCOL_VERSION, encoding, len(name), sequence & 0xFFFFFFFF, timestamp)
+
+    return b"".join((header, name, payload))
+
+
+def pack_signals(timestamps: np.ndarray, values: np.ndarray) -> bytes:
+    """Pack a batch of signal samples into the payload of a binary websocket frame.
+
+    The payload starts with the number of samples and signals, followed by the timestamps of the samples
+    (float64, ms since epoch) and the values of the signals (float32, one row per sample).
+
+    :param timestamps: The timestamps of the samples.
+    :param values: The values of the signals, with shape (samples, signals).
+    :return: The payload.
+    """
+    header = SIGNALS_HEADER.pack(*values.shape)
+    return b"".join((header, timestamps.astype("<f8").tobytes(), values.astype("<f4").tobytes()))
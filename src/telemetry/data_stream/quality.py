@@ -0,0 +1,158 @@
+import dataclasses
+import math
+import threading
+import time
+
+from src.config import config
+
+
+@dataclasses.dataclass
+class QualityLevel:
+    """A quality level for the images sent to a client.
+
+    Attributes
+    ----------
+        quality: The JPEG quality.
+        scale: The scale of the image relative to the original resolution.
+        max_frame_rate: The maximum frame rate per channel.
+
+    """
+
+    quality: int
+    scale: float
+    max_frame_rate: float
+
+
+def get_quality_levels() -> list[QualityLevel]:
+    """Get the quality levels, from best to worst.
+
+    The first level sends the images at full resolution and the configured quality, without a rate limit.
+
+    :return: The quality levels.
+    """
+    best = QualityLevel(config["telemetry"]["images"]["quality"], 1.0, math.inf)
+    return [best] + [
+        QualityLevel(level["quality"], level["scale"], level["max_frame_rate"])
+        for level in config["telemetry"]["clients"]["levels"]
+    ]
+
+
+class ClientQuality:
+    """Adapts the quality of the images sent to a client based on its backpressure.
+
+    Clients acknowledge every image they have displayed. The bytes that have been sent but not yet
+    acknowledged and the time until an image is acknowledged are used to lower or raise the quality level.
+    Clients that never acknowledge an image always receive the best quality level.
+
+    Attributes
+    ----------
+        acknowledging (bool): Whether the client acknowledges the images.
+        latency (float): The smoothed acknowledgement latency in seconds.
+        level (int): The index of the current quality level.
+        levels (list[QualityLevel]): The available quality levels.
+
+    """
+
+    acknowledging: bool = False
+    latency: float = 0.0
+    level: int = 0
+    levels: list[QualityLevel]
+
+    __good_acks: int = 0
+    __in_flight: dict[int, tuple[float, int]]
+    __last_accepted: float = -math.inf
+    __last_change: float = -math.inf
+    __lock: threading.Lock
+
+    def __init__(self) -> None:
+        """Initialize the client quality."""
+        self.levels = get_quality_levels()
+
+        self.__in_flight = {}
+        self.__lock = threading.Lock()
+
+    @property
+    def in_flight_bytes(self) -> int:
+        """The number of bytes that have been sent, but not yet acknowledged."""
+        with self.__lock:
+            return sum(size for _, size in self.__in_flight.values())
+
+    def accepts(self) -> bool:
+        """Check whether a new image should be sent to the client.
+
+        :return: Whether the frame rate and the in-flight bytes of the current level allow a new image.
+        """
+        now = time.monotonic()
+        if now - self.__last_accepted < 1 / self.levels[self.level].max_frame_rate:
+            return False
+
+        if self.acknowledging and self.in_flight_bytes > config["telemetry"]["clients"]["max_in_flight_bytes"]:
+            self.__change_level(1, now)
+            return False
+
+        self.__last_accepted = now
+        return True
+
+    def on_ack(self, sequence: int) -> None:
+        """Handle the acknowledgement of an image.
+
+        :param sequence: The sequence number of the acknowledged image.
+        """
+        now = time.monotonic()
+        self.acknowledging = True
+
+        with self.__lock:
+            sent = self.__in_flight.get(sequence)
+
+            # Images that were sent before the acknowledged image will not be acknowledged anymore.
+            for seq in [seq for seq in self.__in_flight if seq <= sequence]:
+                del self.__in_flight[seq]
+
+        if sent is None:
+            return
+
+        self.latency = 0.8 * self.latency + 0.2 * (now - sent[0])
+
+        max_latency = config["telemetry"]["clients"]["max_ack_latency"]
+        if self.latency > max_latency:
+            self.__change_level(1, now)
+        elif self.latency < max_latency / 2:
+            self.__good_acks += 1
+            if self.__good_acks >= config["telemetry"]["clients"]["upgrade_after"]:
+                self.__change_level(-1, now)
+
+    def on_dropped(self) -> None:
+        """Handle an image that was dropped because the client's queue was full.
+
+        Only the acknowledgements raise the level again, so the level of a client that does not acknowledge
+        the images is kept, and its queue drops the stale images instead.
+        """
+        if self.acknowledging:
+            self.__change_level(1, time.monotonic())
+
+    def on_sent(self, sequence: int, size: int) -> None:
+        """Handle an image that was sent to the client.
+
+        :param sequence: The sequence number of the image.
+        :param size: The size of the image in bytes.
+        """
+        if not self.acknowledging:
+            return
+
+        with self.__lock:
+            self.__in_flight[sequence] = (time.monotonic(), size)
+
+    def __change_level(self, step: int, now: float) -> None:
+        """Lower (positive step) or raise (negative step) the quality level.
+
+        :param step: The number of levels to move.
+        :param now: The current time.
+        """
+        self.__good_acks = 0
+        if now - self.__last_change < config["telemetry"]["clients"]["adapt_interval"]:
+            return
+
+        level = min(max(self.level + step, 0), len(self.levels) - 1)
+        if level != self.level:
+            self.level = level
+            self.__last_change = now
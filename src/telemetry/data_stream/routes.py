@@ -1,4 +1,5 @@
 import asyncio
+import contextlib
 
 from fastapi import APIRouter, WebSocket
 from starlette.websockets import WebSocketDisconnect
@@ -23,10 +24,13 @@ def create_router(websocket_handler: WebsocketHandler) -> APIRouter:
         """
         await websocket.accept()
         client = websocket_handler.add_socket(name, websocket, asyncio.get_event_loop())
+        sender = asyncio.create_task(client.send_messages())
         try:
-            await client.rec_messages()
-        except WebSocketDisconnect:
-            websocket_handler.websocket_clients[name].remove(client)
+            with contextlib.suppress(WebSocketDisconnect):
+                await client.rec_messages()
+        finally:
+            sender.cancel()
+            websocket_handler.remove_client(name, client)
 
     return router
 
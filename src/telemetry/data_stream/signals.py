@@ -0,0 +1,138 @@
+import json
+import logging
+import numpy as np
+import threading
+import time
+
+from collections.abc import Callable
+
+from src.config import config
+from src.telemetry.data_stream.protocol import FrameEncoding, pack_frame, pack_signals
+from src.telemetry.data_stream.websocket_handler import WebsocketHandler
+
+
+class SignalSampler:
+    """Samples numeric signals at a fixed rate and sends them to the dashboard in binary batches.
+
+    Every signal is read from a provider function. The samples are collected while a client listens
+    to the channel and sent as a single binary frame per batch (see `pack_signals`). The names of the
+    signals are sent as JSON text when a client connects and whenever a signal is added.
+
+    Attributes
+    ----------
+        channel (str): The name of the websocket channel.
+        names (list[str]): The names of the signals.
+
+    """
+
+    channel: str
+    names: list[str]
+
+    __handler: WebsocketHandler
+    __lock: threading.Lock
+    __providers: list[Callable[[], float]]
+    __sequence: int = 0
+    __thread: threading.Thread
+
+    def __init__(self, handler: WebsocketHandler, channel: str = "signals") -> None:
+        """Initialize the signal sampler.
+
+        :param handler: The websocket handler to send the samples with.
+        :param channel: The name of the websocket channel.
+        """
+        self.channel = channel
+        self.names = []
+
+        self.__handler = handler
+        self.__lock = threading.Lock()
+        self.__providers = []
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+
+        handler.set_greeting(channel, self.__describe)
+
+    def add_signal(self, name: str, provider: Callable[[], float]) -> None:
+        """Add a signal to sample.
+
+        :param name: The name of the signal.
+        :param provider: The function that returns the current value of the signal.
+        """
+        with self.__lock:
+            self.names.append(name)
+            self.__providers.append(provider)
+
+        self.__handler.send_text(self.channel, self.__describe())
+
+    def sample(self) -> np.ndarray:
+        """Read the current values of all signals.
+
+        Signals that can not be read are NaN.
+
+        :return: The values of the signals.
+        """
+        with self.__lock:
+            providers = list(self.__providers)
+
+        values = np.full(len(providers), np.nan, dtype=np.float32)
+        for i, provider in enumerate(providers):
+            try:
+                values[i] = provider()
+            except Exception as e:
+                logging.debug("Failed to sample signal '%s': %s", self.names[i], e)
+
+        return values
+
+    def start(self) -> None:
+        """Start sampling the signals."""
+        self.__thread.start()
+
+    def __describe(self) -> str:
+        """Describe the signals of the batches.
+
+        :return: The names of the signals as JSON.
+        """
+        return json.dumps({"signals": self.names})
+
+    def __run(self) -> None:
+        """Sample the signals and send them in batches."""
+        rates = config["telemetry"]["signals"]
+        period = 1 / rates["sample_rate"]
+        batch_size = max(1, round(rates["sample_rate"] / rates["batch_rate"]))
+
+        timestamps = []
+        samples = []
+        deadline = time.monotonic()
+
+        while True:
+            # Skip the missed samples instead of catching up when the sampler falls behind.
+            deadline = max(deadline + period, time.monotonic())
+            time.sleep(max(0.0, deadline - time.monotonic()))
+
+            if not self.__handler.is_listening(self.channel):
+                timestamps.clear()
+                samples.clear()
+                continue
+
+            values = self.sample()
+            if samples and len(values) != len(samples[0]):
+                timestamps.clear()
+                samples.clear()
+
+            timestamps.append(time.time() * 1000)
+            samples.append(values)
+
+            if len(samples) >= batch_size:
+                self.__send(np.array(timestamps), np.stack(samples))
+                timestamps.clear()
+                samples.clear()
+
+    def __send(self, timestamps: np.ndarray, values: np.ndarray) -> None:
+        """Send a batch of samples.
+
+        :param timestamps: The timestamps of the samples in milliseconds since epoch.
+        :param values: The values of the signals, with shape (samples, signals).
+        """
+        payload = pack_signals(timestamps, values)
+        frame = pack_frame(self.channel, self.__sequence, FrameEncoding.SIGNALS, payload, timestamps[0])
+
+        self.__sequence += 1
+        self.__handler.send_bytes(self.channel, frame)
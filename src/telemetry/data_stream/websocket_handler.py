@@ -1,13 +1,42 @@
+import asyncio
 import base64
-import cv2
+import contextlib
 import numpy as np
+import threading
 
 from asyncio import AbstractEventLoop
+from collections import deque
+from collections.abc import Callable
 from fastapi import WebSocket
+from typing import TYPE_CHECKING
+
+from src.config import config
+from src.telemetry.data_stream.image_publisher import ImagePublisher
+from src.telemetry.data_stream.protocol import FrameEncoding, pack_frame
+from src.telemetry.data_stream.quality import ClientQuality
+from src.utils.chunk_store import RecordEncoding
+
+
+if TYPE_CHECKING:
+    from src.telemetry.recording.recorder import TelemetryRecorder
 
 
 class WebsocketDataStream:
-    """A class to represent a websocket data stream."""
+    """A class to represent a websocket data stream.
+
+    Clients that send "binary" after connecting receive images as binary frames (see `pack_frame`),
+    other clients receive them as base64 encoded text. Binary clients may acknowledge the images
+    they have displayed with "ack <sequence>", which lowers or raises their quality level.
+
+    Messages can be sent from any thread. They are queued per client and sent by `send_messages`,
+    which is the only coroutine that writes to the websocket. The event loop is woken up at most once
+    per batch of queued messages. The image queue is short, so a slow client skips stale images
+    instead of building up a backlog.
+    """
+
+    dropped: int = 0
+
+    __scheduled: bool = False
 
     def __init__(self, ws: WebSocket, loop: AbstractEventLoop) -> None:
         """Initialize the websocket data stream.
@@ -16,34 +45,83 @@ class WebsocketDataStream:
         :param loop: The event loop.
         """
         self.ws = ws
+        self.binary = False
         self.sending = True
+        self.quality = ClientQuality()
+
+        self.__images = deque(maxlen=config["telemetry"]["clients"]["image_queue_depth"])
+        self.__messages = deque(maxlen=config["telemetry"]["clients"]["text_queue_depth"])
         self.__loop = loop
+        self.__wakeup = asyncio.Event()
 
-    def send_image(self, image: np.ndarray) -> bool | None:
-        """Send image to the websocket.
+    @property
+    def level(self) -> int:
+        """The quality level of the images for this client."""
+        return self.quality.level if self.binary else 0
 
-        :param image: The image to be sent.
-        :return: True if the image was sent successfully.
+    def send_bytes(self, data: bytes) -> bool | None:
+        """Send bytes to the websocket.
+
+        :param data: The bytes to be sent.
+        :return: True if the bytes were queued successfully.
         """
         if not self.sending:
             return None
 
-        _, buffer = cv2.imencode(".jpg", image)
-        image_bytes = base64.b64encode(buffer)
-        b64_str = image_bytes.decode("utf-8")
-
-        return self.send_text(b64_str)
+        self.__messages.append((data, None))
+        self.__wake()
+        return True
 
     def send_text(self, text: str) -> bool | None:
         """Send text to the websocket.
 
         :param text: The text to be sent.
-        :return: True if the text was sent successfully.
+        :return: True if the text was queued successfully.
         """
         if not self.sending:
             return None
 
-        self.__loop.create_task(self.ws.send_text(text))
+        self.__messages.append((text, None))
+        self.__wake()
+        return True
+
+    def send_image(self, data: bytes | str, sequence: int) -> bool:
+        """Send an encoded image to the websocket.
+
+        If the image queue is full, the oldest image is dropped and the quality level is lowered.
+
+        :param data: The binary frame or the base64 encoded image.
+        :param sequence: The sequence number of the image.
+        :return: Whether the image was queued.
+        """
+        if not self.sending or not self.quality.accepts():
+            return False
+
+        if len(self.__images) == self.__images.maxlen:
+            self.dropped += 1
+            self.quality.on_dropped()
+
+        self.__images.append((data, sequence))
+        self.__wake()
+        return True
+
+    async def send_messages(self) -> None:
+        """Send the queued messages to the websocket."""
+        while True:
+            await self.__wakeup.wait()
+            self.__wakeup.clear()
+
+            # Messages that are queued from now on need a new wake-up.
+            self.__scheduled = False
+            while self.__messages or self.__images:
+                data, sequence = self.__messages.popleft() if self.__messages else self.__images.popleft()
+                if sequence is not None:
+                    self.quality.on_sent(sequence, len(data))
+
+                if isinstance(data, bytes):
+                    await self.ws.send_bytes(data)
+                else:
+                    await self.ws.send_text(data)
 
     async def rec_messages(self) -> None:
         """Receive messages from the websocket."""
@@ -51,16 +129,62 @@ class WebsocketDataStream:
             data = await self.ws.receive_text()
             if data == "toggle":
                 self.sending = not self.sending
+            elif data == "binary":
+                self.binary = True
+            elif data.startswith("ack "):
+                try:
+                    sequence = int(data[4:])
+                except ValueError:
+                    # A malformed acknowledgement is ignored, instead of ending the connection.
+                    continue
+
+                self.quality.on_ack(sequence)
+
+    def __wake(self) -> None:
+        """Wake up the sender from any thread, unless a wake-up is already scheduled."""
+        if self.__scheduled:
+            return
+
+        self.__scheduled = True
+
+        # The event loop may already have been closed.
+        with contextlib.suppress(RuntimeError):
+            self.__loop.call_soon_threadsafe(self.__wakeup.set)
 
 
 class WebsocketHandler:
-    """A class to represent a websocket handler."""
+    """A class to represent a websocket handler.
 
+    The clients are added and removed on the event loop, while messages are sent from other threads.
+    The lists of clients are therefore never modified in place, but replaced while holding a lock,
+    so sending can iterate over them without locking.
+
+    While a recorder is set, every channel counts as listened to and all messages are recorded. While a
+    recording is played back, the live messages are only recorded and not sent to the clients, so they do
+    not interleave with the played back records, which are sent with `send_record` and never recorded.
+
+    Attributes
+    ----------
+        playback (bool): Whether a recording is being played back to the clients.
+        recorder (TelemetryRecorder | None): The recorder of the live messages.
+        websocket_clients (dict[str, list[WebsocketDataStream]]): The clients, keyed by channel name.
+
+    """
+
+    playback: bool = False
+    recorder: "TelemetryRecorder | None" = None
     websocket_clients: dict[str, list[WebsocketDataStream]]
 
+    __greetings: dict[str, Callable[[], str]]
+    __lock: threading.Lock
+    __publisher: ImagePublisher
+
     def __init__(self) -> None:
         """Initialize the websocket handler."""
         self.websocket_clients = {}
+        self.__greetings = {}
+        self.__lock = threading.Lock()
+        self.__publisher = ImagePublisher(self.__publish_jpeg, self.__get_levels)
 
     def add_socket(self, name: str, websocket: WebSocket, loop: AbstractEventLoop) -> WebsocketDataStream:
         """Add a websocket client to the list of clients.
@@ -70,28 +194,101 @@ class WebsocketHandler:
         :param loop: The event loop.
         :return: The websocket data stream.
         """
-        if name not in self.websocket_clients:
-            self.websocket_clients[name] = []
+        client = WebsocketDataStream(websocket, loop)
+
+        # The client is greeted and added at once, so the messages that follow the greeting reach it.
+        with self.__lock:
+            greeting = self.__greetings[name]() if name in self.__greetings else None
+            if greeting:
+                client.send_text(greeting)
 
-        self.websocket_clients[name].append(WebsocketDataStream(websocket, loop))
-        return self.websocket_clients[name][-1]
+            self.websocket_clients[name] = [*self.websocket_clients.get(name, []), client]
+
+        return client
 
     def any_active(self) -> bool:
         """Check if there are any active websockets.
 
         :return: Whether there are any active websockets.
         """
-        return any(len(clients) > 0 for clients in self.websocket_clients.values())
+        if self.recorder is not None:
+            return True
+
+        return not self.playback and any(len(clients) > 0 for clients in list(self.websocket_clients.values()))
+
+    def is_listening(self, name: str) -> bool:
+        """Check if any client of a channel wants to receive messages.
+
+        :param name: The name of the channel.
+        :return: Whether any client of the channel is receiving.
+        """
+        if self.recorder is not None:
+            return True
 
-    def send_image(self, name: str, image: np.ndarray) -> None:
+        return not self.playback and any(ws.sending for ws in self.websocket_clients.get(name, []))
+
+    def send_image(
+            self,
+            name: str,
+            image: np.ndarray,
+            render: Callable[[np.ndarray], np.ndarray] | None = None
+    ) -> None:
         """Send image on channel with the given name.
 
+        The image is rendered and encoded in the background, so this does not block the caller.
+        The image should not be modified afterwards.
+
         :param name: The name of the channel.
         :param image: The image to be sent.
+        :param render: An optional function that draws on the image in the background.
+        """
+        if self.is_listening(name):
+            self.__publisher.publish(name, image, render)
+
+    def send_bytes(self, name: str, data: bytes) -> None:
+        """Send bytes on channel with the given name.
+
+        :param name: The name of the channel.
+        :param data: The bytes to be sent.
+        """
+        if self.recorder is not None:
+            self.recorder.record(name, data, RecordEncoding.BINARY)
+
+        if not self.playback:
+            self.__send_bytes(name, data)
+
+    def send_jpeg(self, name: str, buffer: bytes, sequence: int) -> None:
+        """Send an already encoded image on channel with the given name.
+
+        :param name: The name of the channel.
+        :param buffer: The JPEG encoded image.
+        :param sequence: The sequence number of the image within the channel.
+        """
+        self.__publish_jpeg(name, {0: buffer}, sequence)
+
+    def send_record(self, name: str, data: bytes, encoding: RecordEncoding, sequence: int) -> None:
+        """Send a played back record to the clients of a channel, without recording it.
+
+        :param name: The name of the channel.
+        :param data: The data of the record.
+        :param encoding: The encoding of the record.
+        :param sequence: The sequence number of the record, used for the images.
+        """
+        match encoding:
+            case RecordEncoding.JPEG:
+                self.__send_jpeg(name, {0: data}, sequence)
+            case RecordEncoding.TEXT:
+                self.__send_text(name, data.decode("utf-8"))
+            case _:
+                self.__send_bytes(name, data)
+
+    def set_greeting(self, name: str, greeting: Callable[[], str]) -> None:
+        """Set the message that is sent to new clients of a channel, unless it is empty.
+
+        :param name: The name of the channel.
+        :param greeting: The function that returns the message.
         """
-        if name in self.websocket_clients:
-            for ws in self.websocket_clients[name]:
-                ws.send_image(image)
+        self.__greetings[name] = greeting
 
     def send_text(self, name: str, text: str) -> None:
         """Send text on channel with the given name.
@@ -99,13 +296,122 @@ class WebsocketHandler:
         :param name: The name of the channel.
         :param text: The text to be sent.
         """
-        if name in self.websocket_clients:
-            for ws in self.websocket_clients[name]:
-                ws.send_text(text)
+        if self.recorder is not None:
+            self.recorder.record(name, text, RecordEncoding.TEXT)
+
+        if not self.playback:
+            self.__send_text(name, text)
+
+    def start_recording(self, recorder: "TelemetryRecorder") -> None:
+        """Start recording all channels.
+
+        The greetings of the channels are recorded first, so a playback starts in the same state.
+
+        :param recorder: The recorder.
+        """
+        for name, greeting in list(self.__greetings.items()):
+            text = greeting()
+            if text:
+                recorder.record(name, text, RecordEncoding.TEXT)
+
+        self.recorder = recorder
+
+    def stop_recording(self) -> "TelemetryRecorder | None":
+        """Stop recording the channels.
+
+        :return: The recorder, if any.
+        """
+        recorder = self.recorder
+        self.recorder = None
+
+        return recorder
+
+    def __get_levels(self, name: str) -> set[int]:
+        """Get the quality levels used by the receiving clients of a channel.
+
+        :param name: The name of the channel.
+        :return: The indices of the quality levels.
+        """
+        levels = {ws.level for ws in self.websocket_clients.get(name, []) if ws.sending}
+        if self.recorder is not None:
+            levels.add(0)
+
+        return levels
+
+    def __publish_jpeg(self, name: str, buffers: dict[int, bytes], sequence: int) -> None:
+        """Record a live encoded image and send it to the clients of a channel, unless a recording is played back.
+
+        :param name: The name of the channel.
+        :param buffers: The JPEG encoded image per quality level.
+        :param sequence: The sequence number of the image within the channel.
+        """
+        if self.recorder is not None and 0 in buffers:
+            self.recorder.record(name, buffers[0], RecordEncoding.JPEG)
+
+        if not self.playback:
+            self.__send_jpeg(name, buffers, sequence)
+
+    def __send_bytes(self, name: str, data: bytes) -> None:
+        """Send bytes to the clients of a channel.
+
+        :param name: The name of the channel.
+        :param data: The bytes to be sent.
+        """
+        for ws in self.websocket_clients.get(name, []):
+            ws.send_bytes(data)
+
+    def __send_jpeg(self, name: str, buffers: dict[int, bytes], sequence: int) -> None:
+        """Send an encoded image to the clients of a channel.
+
+        The binary frame and the base64 text of a quality level are each built at most once,
+        regardless of the number of clients.
+
+        :param name: The name of the channel.
+        :param buffers: The JPEG encoded image per quality level.
+        :param sequence: The sequence number of the image within the channel.
+        """
+        frames = {}
+        texts = {}
+
+        for ws in self.websocket_clients.get(name, []):
+            # The client may have changed its level while the image was encoded.
+            buffer = buffers.get(ws.level, buffers.get(0))
+            if buffer is None:
+                continue
+
+            if ws.binary:
+                if ws.level not in frames:
+                    frames[ws.level] = pack_frame(name, sequence, FrameEncoding.JPEG, buffer)
+
+                ws.send_image(frames[ws.level], sequence)
+            else:
+                if ws.level not in texts:
+                    texts[ws.level] = base64.b64encode(buffer).decode("utf-8")
+
+                ws.send_image(texts[ws.level], sequence)
+
+    def __send_text(self, name: str, text: str) -> None:
+        """Send text to the clients of a channel.
+
+        :param name: The name of the channel.
+        :param text: The text to be sent.
+        """
+        for ws in self.websocket_clients.get(name, []):
+            ws.send_text(text)
+
+    def remove_client(self, name: str, client: WebsocketDataStream) -> None:
+        """Remove a single websocket client from a channel.
+
+        :param name: The name of the channel.
+        :param client: The client to remove.
+        """
+        with self.__lock:
+            self.websocket_clients[name] = [ws for ws in self.websocket_clients.get(name, []) if ws is not client]
 
     def remove_socket(self, name: str) -> None:
         """Remove a websocket client from the list of clients.
 
         :param name: The name of the websocket.
         """
-        del self.websocket_clients[name]
+        with self.__lock:
+            del self.websocket_clients[name]
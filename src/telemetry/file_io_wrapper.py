@@ -19,10 +19,12 @@ class FileIOWrapper:
     def write(self, message: str) -> None:
         """Write the message to the log.
 
+        The message is only queued for the telemetry server, so writing does not wait for the clients.
+
         :param: The message to be written.
         """
         if message != "\n":
-            self.telemetry_server.websocket_handler.send_text("logs", message)
+            self.telemetry_server.logs.put(message.rstrip("\n"))
         self.buffer.write(message)
 
     def flush(self) -> None:
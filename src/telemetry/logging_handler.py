@@ -1,8 +1,12 @@
+import atexit
 import logging
+import queue
 
+from logging.handlers import QueueHandler, QueueListener
 
-class LoggingHandler(logging.Handler):
-    """A class to represent a logging handler."""
+
+class PrintHandler(logging.Handler):
+    """A logging handler that prints the records to stdout."""
 
     def emit(self, record: logging.LogRecord) -> None:
         """Emit the record.
@@ -10,3 +14,27 @@ class LoggingHandler(logging.Handler):
         :param record: The record.
         """
         print(self.format(record))  # noqa: T201
+
+
+class LoggingHandler(QueueHandler):
+    """A class to represent a logging handler.
+
+    Logging a record only formats it and puts it in a queue. The records are printed by a background
+    listener, so logging on the control threads never waits for stdout or the telemetry clients.
+
+    Attributes
+    ----------
+        listener (QueueListener): The listener that prints the queued records.
+
+    """
+
+    listener: QueueListener
+
+    def __init__(self) -> None:
+        """Initialize the logging handler and start the listener."""
+        super().__init__(queue.SimpleQueue())
+
+        self.listener = QueueListener(self.queue, PrintHandler())
+        self.listener.start()
+
+        atexit.register(self.listener.stop)
@@ -0,0 +1,154 @@
+import numpy as np
+import threading
+import time
+
+from pathlib import Path
+
+from src.telemetry.data_stream.websocket_handler import WebsocketHandler
+from src.utils.chunk_store import ChunkReader
+
+
+class TelemetryPlayer:
+    """Plays a telemetry recording back to the clients of the telemetry channels.
+
+    The records of all channels are sent in the order and at the pace they were recorded. Seeking
+    is a binary search in the index. After seeking, the last record of every channel before the new
+    position is sent first, so every dashboard component immediately shows the state at that time.
+
+    Attributes
+    ----------
+        duration (float): The duration of the recording in seconds.
+        path (Path): The directory of the recording.
+        speed (float): The playback speed.
+
+    """
+
+    duration: float
+    path: Path
+    speed: float
+
+    __anchor: tuple[float, int] = (0.0, 0)
+    __changed: threading.Event
+    __cursor: int = 0
+    __entries: np.ndarray
+    __handler: WebsocketHandler
+    __latest: list[tuple[str, np.ndarray]]
+    __lock: threading.Lock
+    __reader: ChunkReader
+    __sequence: int = 0
+    __stopped: bool = False
+    __thread: threading.Thread | None = None
+
+    def __init__(self, path: Path | str, handler: WebsocketHandler, speed: float = 1.0) -> None:
+        """Initialize the telemetry player.
+
+        :param path: The directory of the recording.
+        :param handler: The websocket handler to send the records with.
+        :param speed: The playback speed.
+        """
+        self.path = Path(path)
+        self.speed = speed
+
+        self.__changed = threading.Event()
+        self.__handler = handler
+        self.__lock = threading.Lock()
+        self.__reader = ChunkReader(self.path)
+
+        index = self.__reader.index
+        self.__entries = index[np.argsort(index["timestamp"], kind="stable")]
+        self.duration = self.__seconds(self.__entries["timestamp"][-1]) if len(self.__entries) > 0 else 0.0
+
+        # The records of every channel and encoding, used to restore the state after seeking.
+        self.__latest = []
+        for stream, name in enumerate(self.__reader.streams):
+            records = self.__reader.records(stream)
+            for encoding in np.unique(records["encoding"]):
+                self.__latest.append((name, records[records["encoding"] == encoding]))
+
+    @property
+    def playing(self) -> bool:
+        """Whether the recording is being played."""
+        return self.__thread is not None and self.__thread.is_alive()
+
+    @property
+    def position(self) -> float:
+        """The position of the next record in seconds since the start of the recording."""
+        with self.__lock:
+            if self.__cursor >= len(self.__entries):
+                return self.duration
+
+            return self.__seconds(self.__entries["timestamp"][self.__cursor])
+
+    def seek(self, position: float) -> None:
+        """Continue the playback at the given position.
+
+        :param position: The position in seconds since the start of the recording.
+        """
+        if len(self.__entries) == 0:
+            return
+
+        timestamp = self.__entries["timestamp"][0] + int(max(0.0, position) * 1e9)
+        with self.__lock:
+            self.__cursor = int(np.searchsorted(self.__entries["timestamp"], timestamp, side="left"))
+            self.__anchor = (time.monotonic(), timestamp)
+
+        for name, records in self.__latest:
+            idx = np.searchsorted(records["timestamp"], timestamp, side="left") - 1
+            if idx >= 0:
+                self.__send(name, records[idx])
+
+        self.__changed.set()
+
+    def start(self, position: float = 0.0) -> None:
+        """Start the playback.
+
+        :param position: The position in seconds since the start of the recording.
+        """
+        self.seek(position)
+
+        self.__thread = threading.Thread(target=self.__run, daemon=True)
+        self.__thread.start()
+
+    def stop(self) -> None:
+        """Stop the playback."""
+        self.__stopped = True
+        self.__changed.set()
+
+    def __run(self) -> None:
+        """Send the records at the pace they were recorded."""
+        while not self.__stopped:
+            with self.__lock:
+                cursor = self.__cursor
+                if cursor >= len(self.__entries):
+                    return
+
+                entry = self.__entries[cursor]
+                started, timestamp = self.__anchor
+                delay = (entry["timestamp"] - timestamp) / 1e9 / self.speed - (time.monotonic() - started)
+
+            if delay > 0 and self.__changed.wait(delay):
+                # The position has changed while waiting.
+                self.__changed.clear()
+                continue
+
+            self.__send(self.__reader.streams[entry["stream"]], entry)
+            with self.__lock:
+                if self.__cursor == cursor:
+                    self.__cursor += 1
+
+    def __seconds(self, timestamp: int) -> float:
+        """Convert a timestamp to seconds since the start of the recording.
+
+        :param timestamp: The timestamp in nanoseconds.
+        :return: The number of seconds since the start of the recording.
+        """
+        return (int(timestamp) - int(self.__entries["timestamp"][0])) / 1e9
+
+    def __send(self, channel: str, entry: np.void) -> None:
+        """Send a record to the clients of its channel.
+
+        :param channel: The name of the channel.
+        :param entry: The index entry of the record.
+        """
+        self.__sequence += 1
+        self.__handler.send_record(channel, self.__reader.read(entry).tobytes(), entry["encoding"], self.__sequence)
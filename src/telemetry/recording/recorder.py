@@ -0,0 +1,63 @@
+import logging
+import threading
+import time
+
+from pathlib import Path
+
+from src.utils.chunk_store import ChunkWriter, RecordEncoding
+
+
+class TelemetryRecorder:
+    """Records the messages of the telemetry channels into a chunk store.
+
+    Every channel is stored as a separate stream. Images are stored as the JPEG bytes that were sent
+    to the clients, binary messages as-is and text messages as UTF-8.
+
+    Attributes
+    ----------
+        path (Path): The directory of the recording.
+
+    """
+
+    path: Path
+
+    __lock: threading.Lock
+    __streams: dict[str, int]
+    __writer: ChunkWriter
+
+    def __init__(self, path: Path | str, chunk_size: int = 64 * 1024 * 1024) -> None:
+        """Initialize the telemetry recorder.
+
+        :param path: The directory to write the recording to.
+        :param chunk_size: The size of a chunk file in bytes.
+        """
+        self.path = Path(path)
+
+        self.__lock = threading.Lock()
+        self.__streams = {}
+        self.__writer = ChunkWriter(self.path, chunk_size, metadata={"type": "telemetry"})
+
+    def record(self, channel: str, data: bytes | str, encoding: RecordEncoding) -> None:
+        """Record a message of a channel.
+
+        :param channel: The name of the channel.
+        :param data: The message.
+        :param encoding: The encoding of the message (JPEG, BINARY or TEXT).
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        with self.__lock:
+            if channel not in self.__streams:
+                self.__streams[channel] = self.__writer.add_stream(channel)
+
+            stream = self.__streams[channel]
+
+        try:
+            self.__writer.append(stream, time.time_ns(), data, encoding)
+        except ValueError as e:
+            logging.debug("Failed to record a message of channel '%s': %s", channel, e)
+
+    def close(self) -> None:
+        """Close the recording."""
+        self.__writer.close()
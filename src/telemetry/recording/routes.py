@@ -0,0 +1,76 @@
+from fastapi import APIRouter, HTTPException
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.config import config
+
+
+if TYPE_CHECKING:
+    from src.telemetry.app import TelemetryServer
+
+
+def create_recording_router(telemetry: "TelemetryServer") -> APIRouter:
+    """Create a router for recording and playing back the telemetry.
+
+    :param telemetry: The telemetry server.
+    :return: The router.
+    """
+    router = APIRouter()
+
+    @router.get("/recordings")
+    def get_recordings() -> list[str]:
+        """Get the names of the recordings."""
+        path = Path(config["telemetry"]["recording"]["path"])
+        if not path.exists():
+            return []
+
+        return sorted(folder.name for folder in path.iterdir() if (folder / "index.bin").exists())
+
+    @router.post("/recording/start")
+    def start_recording() -> dict:
+        """Start recording all channels."""
+        return {"name": telemetry.start_recording().name}
+
+    @router.post("/recording/stop")
+    def stop_recording() -> None:
+        """Stop recording."""
+        telemetry.stop_recording()
+
+    @router.get("/playback")
+    def get_playback() -> dict:
+        """Get the state of the playback."""
+        player = telemetry.player
+        if player is None:
+            return {"playing": False}
+
+        return {
+            "name": player.path.name,
+            "playing": player.playing,
+            "position": player.position,
+            "duration": player.duration
+        }
+
+    @router.post("/playback/start/{name}")
+    def start_playback(name: str, position: float = 0.0) -> dict:
+        """Play a recording back to the dashboard."""
+        try:
+            player = telemetry.play(name, position)
+        except (FileNotFoundError, ValueError) as e:
+            raise HTTPException(status_code=404, detail=str(e)) from e
+
+        return {"name": name, "duration": player.duration}
+
+    @router.post("/playback/seek")
+    def seek_playback(position: float) -> None:
+        """Continue the playback at the given position in seconds."""
+        if telemetry.player is None:
+            raise HTTPException(status_code=404, detail="No recording is being played")
+
+        telemetry.player.seek(position)
+
+    @router.post("/playback/stop")
+    def stop_playback() -> None:
+        """Stop the playback."""
+        telemetry.stop_playback()
+
+    return router
@@ -0,0 +1,102 @@
+/**
+ * PlaybackComponent is a custom HTML element to record the telemetry and play recordings back.
+ * The recordings are played back through the existing channels, so all other components show them.
+ */
+class PlaybackComponent extends HTMLElement {
+    /**
+     * Constructor of the PlaybackComponent.
+     * Calls the render method to create the component's UI and loads the recordings.
+     */
+    constructor() {
+        super();
+
+        this.render();
+        this.loadRecordings();
+    }
+
+    /**
+     * Render the component with buttons to record and play, a recording selector and a seek slider.
+     */
+    render() {
+        const header = document.createElement('h4')
+        header.textContent = 'playback';
+
+        const record = document.createElement('button');
+        record.textContent = 'Start recording';
+        record.onclick = () => this.post('/recording/start').then(() => this.loadRecordings());
+
+        const stopRecord = document.createElement('button');
+        stopRecord.textContent = 'Stop recording';
+        stopRecord.onclick = () => this.post('/recording/stop').then(() => this.loadRecordings());
+
+        this.select = document.createElement('select');
+
+        const play = document.createElement('button');
+        play.textContent = 'Play';
+        play.onclick = () => this.play();
+
+        const stop = document.createElement('button');
+        stop.textContent = 'Stop';
+        stop.onclick = () => this.post('/playback/stop');
+
+        this.slider = document.createElement('input');
+        this.slider.type = 'range';
+        this.slider.min = 0;
+        this.slider.step = 0.1;
+        this.slider.value = 0;
+        this.slider.style.width = '100%';
+        this.slider.onchange = () => this.post(`/playback/seek?position=${this.slider.value}`);
+
+        this.append(header, record, stopRecord, this.select, play, stop, this.slider);
+    }
+
+    /**
+     * Load the names of the recordings into the selector.
+     */
+    async loadRecordings() {
+        const response = await fetch('/recordings');
+        const names = await response.json();
+
+        this.select.innerHTML = '';
+        for (const name of names.reverse()) {
+            const option = document.createElement('option');
+            option.value = name;
+            option.textContent = name;
+            this.select.appendChild(option);
+        }
+    }
+
+    /**
+     * Play the selected recording and keep the slider at the current position.
+     */
+    async play() {
+        const response = await this.post(`/playback/start/${this.select.value}`);
+        const playback = await response.json();
+
+        this.slider.max = playback.duration;
+        clearInterval(this.interval);
+        this.interval = setInterval(async () => {
+            const state = await (await fetch('/playback')).json();
+            if (!state.playing) {
+                clearInterval(this.interval);
+            }
+
+            if (document.activeElement !== this.slider && state.position !== undefined) {
+                this.slider.value = state.position;
+            }
+        }, 500);
+    }
+
+    /**
+     * Send a POST request.
+     *
+     * @param {string} url The url to post to.
+     * @returns {Promise<Response>} The response.
+     */
+    post(url) {
+        return fetch(url, { method: 'POST' });
+    }
+}
+
+// define the custom element
+customElements.define('telemetry-playback', PlaybackComponent);
@@ -47,7 +47,8 @@ class WebsocketImageComponent extends HTMLElement {
     /**
      * Establish a new websocket connection.
      * When a new message is received, update the image.
-     * The image is sent as a base64 encoded JPEG.
+     * The client asks for binary frames; older servers send the image as a base64 encoded JPEG instead.
+     * Every binary frame is acknowledged once it is displayed, so the server can adapt the quality.
      */
     connectWS() {
         // create a new websocket connection
@@ -56,11 +57,43 @@ class WebsocketImageComponent extends HTMLElement {
             console.error('Websocket error:', event);
         }
         this.ws.binaryType = 'arraybuffer';
-        // when a new message is received, update the image. the image is send as base64 encoded jpeg
+        this.img.onload = () => {
+            if (this.sequence !== undefined && this.ws.readyState === WebSocket.OPEN) {
+                this.ws.send(`ack ${this.sequence}`);
+            }
+        }
+        this.ws.onopen = () => {
+            this.ws.send('binary');
+        }
         this.ws.onmessage = (event) => {
-            const img_src = "data:image/jpeg;base64," + event.data;
-            // check if it is the same as the current image
-            this.img.src = img_src;
+            if (event.data instanceof ArrayBuffer) {
+                this.showFrame(event.data);
+            } else {
+                this.img.src = "data:image/jpeg;base64," + event.data;
+            }
+        }
+    }
+
+    /**
+     * Display a binary frame.
+     * The frame starts with a 16 byte header (version, encoding, channel name length, padding, sequence, timestamp),
+     * followed by the channel name and the JPEG image.
+     *
+     * @param {ArrayBuffer} buffer The binary frame.
+     */
+    showFrame(buffer) {
+        const view = new DataView(buffer);
+        const nameLength = view.getUint8(2);
+
+        this.sequence = view.getUint32(4, true);
+        this.timestamp = view.getFloat64(8, true);
+
+        const blob = new Blob([new Uint8Array(buffer, 16 + nameLength)], { type: 'image/jpeg' });
+        const previous = this.img.src;
+
+        this.img.src = URL.createObjectURL(blob);
+        if (previous.startsWith('blob:')) {
+            URL.revokeObjectURL(previous);
         }
     }
 }
@@ -0,0 +1,160 @@
+/**
+ * WebsocketSignalsComponent is a custom HTML element that plots numeric signals received from a websocket server.
+ * The server first sends the names of the signals as JSON, followed by binary batches of samples.
+ * It also includes a button to toggle sending of the signals.
+ */
+class WebsocketSignalsComponent extends HTMLElement {
+    /**
+     * Constructor of the WebsocketSignalsComponent.
+     * Calls the render method to create the component's UI and establishes a websocket connection.
+     */
+    constructor() {
+        super();
+
+        this.names = [];
+        this.timestamps = [];
+        this.samples = [];
+        this.window = Number(this.getAttribute('window') || 10) * 1000;
+
+        this.render();
+        this.connectWS();
+    }
+
+    /**
+     * Render the component by creating a canvas and a button.
+     * The button is used to toggle the websocket connection.
+     */
+    render() {
+        const header = document.createElement('h4')
+        header.textContent = this.getAttribute('id');
+
+        this.canvas = document.createElement('canvas');
+        this.canvas.width = 1000;
+        this.canvas.style.width = '100%';
+
+        const button = document.createElement('button');
+        button.textContent = 'Toggle';
+        button.onclick = () => this.toggleWS();
+
+        this.appendChild(header);
+        this.appendChild(button);
+        this.appendChild(this.canvas);
+    }
+
+    /**
+     * Send a 'toggle' message to the server to toggle the websocket connection.
+     */
+    toggleWS() {
+        this.ws.send('toggle');
+    }
+
+    /**
+     * Establish a new websocket connection.
+     * Text messages contain the names of the signals, binary messages contain the samples.
+     */
+    connectWS() {
+        this.ws = new WebSocket(`ws://${this.getAttribute('root-url')}/ws/${this.getAttribute('id')}`);
+        this.ws.onerror = (event) => {
+            console.error('Websocket error:', event);
+        }
+        this.ws.binaryType = 'arraybuffer';
+        this.ws.onmessage = (event) => {
+            if (event.data instanceof ArrayBuffer) {
+                this.addBatch(event.data);
+            } else {
+                this.names = JSON.parse(event.data).signals;
+                this.timestamps = [];
+                this.samples = [];
+            }
+        }
+    }
+
+    /**
+     * Add a batch of samples.
+     * The frame starts with a 16 byte header and the channel name, followed by the number of samples and signals,
+     * the timestamps of the samples (float64) and the values of the signals (float32, one row per sample).
+     *
+     * @param {ArrayBuffer} buffer The binary frame.
+     */
+    addBatch(buffer) {
+        const view = new DataView(buffer);
+        let offset = 16 + view.getUint8(2);
+
+        const rows = view.getUint16(offset, true);
+        const columns = view.getUint16(offset + 2, true);
+        offset += 4;
+
+        if (columns !== this.names.length) {
+            return;
+        }
+
+        for (let i = 0; i < rows; i++) {
+            this.timestamps.push(view.getFloat64(offset + i * 8, true));
+        }
+        offset += rows * 8;
+
+        for (let i = 0; i < rows; i++) {
+            const row = [];
+            for (let j = 0; j < columns; j++) {
+                row.push(view.getFloat32(offset + (i * columns + j) * 4, true));
+            }
+            this.samples.push(row);
+        }
+
+        // drop the samples that are outside the plotted window
+        const start = this.timestamps[this.timestamps.length - 1] - this.window;
+        const first = this.timestamps.findIndex((timestamp) => timestamp >= start);
+        this.timestamps.splice(0, first);
+        this.samples.splice(0, first);
+
+        requestAnimationFrame(() => this.draw());
+    }
+
+    /**
+     * Draw every signal in its own row, scaled to its own range, with its name and last value.
+     */
+    draw() {
+        const rowHeight = 60;
+        const ctx = this.canvas.getContext('2d');
+
+        this.canvas.height = Math.max(1, this.names.length) * rowHeight;
+        ctx.clearRect(0, 0, this.canvas.width, this.canvas.height);
+        if (this.timestamps.length === 0) {
+            return;
+        }
+
+        const end = this.timestamps[this.timestamps.length - 1];
+        const x = (timestamp) => this.canvas.width * (1 - (end - timestamp) / this.window);
+
+        this.names.forEach((name, j) => {
+            const values = this.samples.map((row) => row[j]).filter((value) => !Number.isNaN(value));
+            const min = Math.min(...values);
+            const range = Math.max(...values) - min || 1;
+            const top = j * rowHeight;
+            const y = (value) => top + rowHeight - 4 - (value - min) / range * (rowHeight - 20);
+
+            ctx.strokeStyle = '#ccc';
+            ctx.beginPath();
+            ctx.moveTo(0, top + rowHeight);
+            ctx.lineTo(this.canvas.width, top + rowHeight);
+            ctx.stroke();
+
+            ctx.strokeStyle = '#1f77b4';
+            ctx.beginPath();
+            this.samples.forEach((row, i) => {
+                if (!Number.isNaN(row[j])) {
+                    ctx.lineTo(x(this.timestamps[i]), y(row[j]));
+                }
+            });
+            ctx.stroke();
+
+            const last = this.samples[this.samples.length - 1][j];
+            ctx.fillStyle = '#333';
+            ctx.font = '12px Arial';
+            ctx.fillText(`${name}: ${last.toFixed(2)}`, 4, top + 12);
+        });
+    }
+}
+
+// define the custom element
+customElements.define('websocket-signals', WebsocketSignalsComponent);
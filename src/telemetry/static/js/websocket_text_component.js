@@ -53,15 +53,22 @@ class WebsocketTextComponent extends HTMLElement {
         this.ws.onerror = (event) => {
             console.error('Websocket error:', event);
         }
-        // when a new message is received, update the image. the image is sent as base64 encoded jpeg
+        // when a new message is received, update the text.
+        // appended messages may contain several lines, which are shown as separate paragraphs
         this.ws.onmessage = (event) => {
-            // convert to text
-            const text_elem = document.createElement('p');
-            text_elem.textContent = event.data;
             if(this.getAttribute('append') === 'true'){
-                // prepend child
-                this.text.prepend(text_elem);
+                for (const line of event.data.split('\n')) {
+                    const text_elem = document.createElement('p');
+                    text_elem.textContent = line;
+
+                    // prepend child
+                    this.text.prepend(text_elem);
+                }
             } else {
+                // convert to text
+                const text_elem = document.createElement('p');
+                text_elem.textContent = event.data;
+
                 this.text.innerHTML = '';
                 this.text.appendChild(text_elem);
             }
@@ -0,0 +1,209 @@
+import cv2
+import logging
+import numpy as np
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from src.utils.chunk_store import ChunkReader, ChunkWriter, RecordEncoding
+from src.utils.replay import CAMERAS, ReplaySource
+
+
+class CaptureWriter:
+    """Records camera frames into a chunk store.
+
+    The frames are encoded and written on a background thread pool, so capturing a frame only costs
+    a submission. If the pool falls too far behind, new frames are dropped instead of queued.
+
+    Attributes
+    ----------
+        dropped (int): The number of frames that were dropped.
+        encoding (RecordEncoding): The encoding of the frames.
+        path (Path): The directory of the capture.
+        quality (int): The JPEG quality or PNG compression level.
+
+    """
+
+    dropped: int = 0
+    encoding: RecordEncoding
+    path: Path
+    quality: int
+
+    __pending: threading.BoundedSemaphore
+    __pool: ThreadPoolExecutor
+    __streams: dict[str, int]
+    __writer: ChunkWriter
+
+    def __init__(
+            self,
+            path: Path | str,
+            encoding: RecordEncoding = RecordEncoding.JPEG,
+            quality: int | None = None,
+            workers: int = 4,
+            max_pending: int = 32,
+            chunk_size: int = 256 * 1024 * 1024
+    ) -> None:
+        """Initialize the capture writer.
+
+        :param path: The directory to write the capture to.
+        :param encoding: The encoding of the frames (RAW, JPEG or PNG).
+        :param quality: The JPEG quality (default 90) or PNG compression level (default 1).
+        :param workers: The number of threads that encode and write the frames.
+        :param max_pending: The maximum number of frames waiting to be written.
+        :param chunk_size: The size of a chunk file in bytes.
+        """
+        if encoding not in (RecordEncoding.RAW, RecordEncoding.JPEG, RecordEncoding.PNG):
+            raise ValueError(f"Unsupported frame encoding: {encoding.name}")
+
+        if quality is None:
+            quality = 1 if encoding == RecordEncoding.PNG else 90
+
+        self.path = Path(path)
+        self.encoding = encoding
+        self.quality = quality
+
+        self.__pending = threading.BoundedSemaphore(max_pending)
+        self.__pool = ThreadPoolExecutor(max_workers=workers)
+        self.__streams = {}
+        self.__writer = ChunkWriter(self.path, chunk_size, metadata={"type": "capture"})
+
+    def write(self, camera: str, frame: np.ndarray, timestamp: int | None = None) -> bool:
+        """Submit a frame to be recorded.
+
+        The frame is not copied, so it should not be modified afterwards.
+
+        :param camera: The name of the camera.
+        :param frame: The frame to record.
+        :param timestamp: The timestamp of the frame in nanoseconds (defaults to now).
+        :return: Whether the frame was accepted.
+        """
+        if timestamp is None:
+            timestamp = time.time_ns()
+
+        if not self.__pending.acquire(blocking=False):
+            self.dropped += 1
+            return False
+
+        if camera not in self.__streams:
+            self.__streams[camera] = self.__writer.add_stream(camera)
+
+        self.__pool.submit(self.__store, self.__streams[camera], frame, timestamp)
+        return True
+
+    def close(self) -> None:
+        """Wait for the pending frames to be written and close the capture."""
+        self.__pool.shutdown(wait=True)
+        self.__writer.close()
+
+        if self.dropped > 0:
+            logging.warning("Dropped %d frames while capturing.", self.dropped)
+
+    def __store(self, stream: int, frame: np.ndarray, timestamp: int) -> None:
+        """Encode a frame and append it to the chunk store.
+
+        :param stream: The identifier of the stream.
+        :param frame: The frame to store.
+        :param timestamp: The timestamp of the frame in nanoseconds.
+        """
+        try:
+            match self.encoding:
+                case RecordEncoding.JPEG:
+                    data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])[1]
+                case RecordEncoding.PNG:
+                    data = cv2.imencode(".png", frame, [cv2.IMWRITE_PNG_COMPRESSION, self.quality])[1]
+                case _:
+                    data = np.ascontiguousarray(frame)
+
+            self.__writer.append(stream, timestamp, data, self.encoding, frame.shape)
+        except Exception as e:
+            logging.error("Failed to store frame: %s", e)
+        finally:
+            self.__pending.release()
+
+
+class CaptureReader(ReplaySource):
+    """Provides random access to the frames of a capture by index or timestamp.
+
+    The frames of the center camera determine the order of the replay. The frames of the other cameras
+    are matched to them by timestamp. If a camera was not recorded, the center camera is used in its place.
+
+    Attributes
+    ----------
+        cameras (tuple[str, ...]): The names of the cameras.
+        path (Path): The directory of the capture.
+        timestamps (np.ndarray): The timestamps of the center camera frames in nanoseconds.
+
+    """
+
+    cameras: tuple[str, ...]
+    path: Path
+    timestamps: np.ndarray
+
+    __reader: ChunkReader
+
+    def __init__(self, path: Path | str, cameras: tuple[str, ...] = CAMERAS) -> None:
+        """Initialize the capture reader.
+
+        :param path: The directory of the capture.
+        :param cameras: The names of the cameras to replay.
+        """
+        self.path = Path(path)
+        self.cameras = cameras
+
+        self.__reader = ChunkReader(self.path)
+        if "center" not in self.__reader.streams:
+            raise ValueError(f"No frames of the center camera found in {self.path}")
+
+        self.timestamps = self.__reader.records(self.__stream("center"))["timestamp"]
+
+    def __len__(self) -> int:
+        """The number of frames in the replay."""
+        return len(self.timestamps)
+
+    def frame_at(self, camera: str, timestamp: int) -> np.ndarray | None:
+        """Get the last frame of a camera at or before the given timestamp.
+
+        :param camera: The name of the camera.
+        :param timestamp: The timestamp in nanoseconds.
+        :return: The frame, or None if the camera has no frames.
+        """
+        entry = self.__reader.find(self.__stream(camera), timestamp)
+        if entry is None:
+            return None
+
+        return self.__decode(entry)
+
+    def read(self, index: int) -> dict[str, np.ndarray]:
+        """Read the frames of all cameras at the given index.
+
+        :param index: The index of the frame.
+        :return: The frames, keyed by camera name.
+        """
+        timestamp = self.timestamps[index]
+        return {camera: self.frame_at(camera, timestamp) for camera in self.cameras}
+
+    def __decode(self, entry: np.void) -> np.ndarray:
+        """Decode a frame.
+
+        :param entry: The index entry of the frame.
+        :return: The decoded frame. Raw frames are returned as read-only views of the capture.
+        """
+        data = self.__reader.read(entry)
+        if entry["encoding"] == RecordEncoding.RAW:
+            shape = (int(entry["height"]), int(entry["width"]), int(entry["channels"]))
+            return data.reshape(shape if shape[2] > 1 else shape[:2])
+
+        return cv2.imdecode(data, cv2.IMREAD_UNCHANGED)
+
+    def __stream(self, camera: str) -> int:
+        """Get the identifier of the stream of a camera.
+
+        :param camera: The name of the camera.
+        :return: The identifier of the stream.
+        """
+        if camera not in self.__reader.streams:
+            camera = "center"
+
+        return self.__reader.streams.index(camera)
@@ -0,0 +1,254 @@
+import json
+import numpy as np
+import os
+import threading
+
+from enum import IntEnum
+from pathlib import Path
+from typing import BinaryIO
+
+
+INDEX_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("stream", "<u2"),
+    ("encoding", "u1"),
+    ("channels", "u1"),
+    ("height", "<u2"),
+    ("width", "<u2"),
+    ("chunk", "<u4"),
+    ("offset", "<u8"),
+    ("length", "<u4"),
+])
+
+
+class RecordEncoding(IntEnum):
+    """The encoding of a record in a chunk store."""
+
+    RAW = 0
+    JPEG = 1
+    PNG = 2
+    BINARY = 3
+    TEXT = 4
+
+
+class ChunkWriter:
+    """Appends records to large, preallocated and memory-mapped chunk files.
+
+    Every record is described by a fixed-size entry in an append-only index file, which allows
+    the records to be looked up without scanning the chunks.
+
+    Attributes
+    ----------
+        chunk_size (int): The size of a chunk file in bytes.
+        path (Path): The directory of the chunk store.
+        streams (list[str]): The names of the streams in the chunk store.
+
+    """
+
+    chunk_size: int
+    path: Path
+    streams: list[str]
+
+    __chunk: np.memmap | None = None
+    __chunk_idx: int = -1
+    __closed: bool = False
+    __index: BinaryIO
+    __lock: threading.Lock
+    __metadata: dict
+    __offset: int = 0
+
+    def __init__(self, path: Path | str, chunk_size: int = 256 * 1024 * 1024, metadata: dict | None = None) -> None:
+        """Initialize the chunk writer.
+
+        :param path: The directory to write the chunk store to.
+        :param chunk_size: The size of a chunk file in bytes.
+        :param metadata: Additional metadata to store alongside the records.
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        self.chunk_size = chunk_size
+        self.streams = []
+
+        self.__lock = threading.Lock()
+        self.__metadata = metadata or {}
+        self.__index = open(self.path / "index.bin", "ab")  # noqa: SIM115
+        self.__write_metadata()
+
+    def add_stream(self, name: str) -> int:
+        """Get the identifier of a stream, adding it if it does not exist yet.
+
+        :param name: The name of the stream.
+        :return: The identifier of the stream.
+        """
+        with self.__lock:
+            if name not in self.streams:
+                self.streams.append(name)
+                self.__write_metadata()
+
+            return self.streams.index(name)
+
+    def append(
+            self,
+            stream: int,
+            timestamp: int,
+            data: bytes | np.ndarray,
+            encoding: RecordEncoding,
+            shape: tuple[int, ...] = (0, 0, 0)
+    ) -> None:
+        """Append a record to the chunk store.
+
+        :param stream: The identifier of the stream.
+        :param timestamp: The timestamp of the record in nanoseconds.
+        :param data: The data of the record.
+        :param encoding: The encoding of the data.
+        :param shape: The shape of the (decoded) image (height, width, channels).
+        """
+        buffer = np.frombuffer(data, dtype=np.uint8) if isinstance(data, bytes) else data.reshape(-1).view(np.uint8)
+        height, width, channels = (*shape, 1)[:3]
+
+        with self.__lock:
+            if self.__closed:
+                raise ValueError("Cannot append to a closed chunk store.")
+
+            if self.__chunk is None or self.__offset + len(buffer) > len(self.__chunk):
+                self.__next_chunk(len(buffer))
+
+            self.__chunk[self.__offset:self.__offset + len(buffer)] = buffer
+
+            entry = np.array(
+                [(timestamp, stream, encoding, channels, height, width, self.__chunk_idx, self.__offset, len(buffer))],
+                dtype=INDEX_DTYPE
+            )
+
+            self.__index.write(entry.tobytes())
+            self.__offset += len(buffer)
+
+    def close(self) -> None:
+        """Close the chunk store, truncating the last chunk to its used size."""
+        with self.__lock:
+            if self.__closed:
+                return
+
+            self.__closed = True
+            self.__finish_chunk()
+            self.__index.close()
+
+    def __finish_chunk(self) -> None:
+        """Flush the current chunk and truncate it to its used size."""
+        if self.__chunk is None:
+            return
+
+        self.__chunk.flush()
+        self.__chunk = None
+
+        os.truncate(self.__chunk_path(self.__chunk_idx), self.__offset)
+        self.__index.flush()
+
+    def __next_chunk(self, min_size: int) -> None:
+        """Start a new chunk file.
+
+        :param min_size: The minimum size of the chunk.
+        """
+        self.__finish_chunk()
+
+        self.__chunk_idx += 1
+        self.__offset = 0
+
+        size = max(self.chunk_size, min_size)
+        path = self.__chunk_path(self.__chunk_idx)
+
+        with open(path, "wb") as file:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(file.fileno(), 0, size)
+            else:
+                file.truncate(size)
+
+        self.__chunk = np.memmap(path, dtype=np.uint8, mode="r+", shape=(size,))
+
+    def __chunk_path(self, idx: int) -> Path:
+        """Get the path of a chunk file.
+
+        :param idx: The index of the chunk.
+        :return: The path of the chunk file.
+        """
+        return self.path / f"chunk_{idx:05d}.bin"
+
+    def __write_metadata(self) -> None:
+        """Write the metadata of the chunk store."""
+        metadata = {**self.__metadata, "streams": self.streams}
+        (self.path / "metadata.json").write_text(json.dumps(metadata, indent=4))
+
+
+class ChunkReader:
+    """Provides random access to the records of a chunk store.
+
+    Attributes
+    ----------
+        index (np.ndarray): The index of the records, sorted by stream and timestamp.
+        metadata (dict): The metadata of the chunk store.
+        path (Path): The directory of the chunk store.
+        streams (list[str]): The names of the streams in the chunk store.
+
+    """
+
+    index: np.ndarray
+    metadata: dict
+    path: Path
+    streams: list[str]
+
+    __bounds: np.ndarray
+    __chunks: dict[int, np.memmap]
+
+    def __init__(self, path: Path | str) -> None:
+        """Initialize the chunk reader.
+
+        :param path: The directory of the chunk store.
+        """
+        self.path = Path(path)
+        if not (self.path / "index.bin").exists():
+            raise FileNotFoundError(f"Chunk store not found: {self.path}")
+
+        self.metadata = json.loads((self.path / "metadata.json").read_text())
+        self.streams = self.metadata["streams"]
+
+        index = np.fromfile(self.path / "index.bin", dtype=INDEX_DTYPE)
+        self.index = index[np.lexsort((index["timestamp"], index["stream"]))]
+
+        self.__bounds = np.searchsorted(self.index["stream"], np.arange(len(self.streams) + 1))
+        self.__chunks = {}
+
+    def records(self, stream: int) -> np.ndarray:
+        """Get the index entries of a stream, sorted by timestamp.
+
+        :param stream: The identifier of the stream.
+        :return: The index entries of the stream.
+        """
+        return self.index[self.__bounds[stream]:self.__bounds[stream + 1]]
+
+    def find(self, stream: int, timestamp: int) -> np.ndarray | None:
+        """Find the last record of a stream at or before the given timestamp.
+
+        :param stream: The identifier of the stream.
+        :param timestamp: The timestamp in nanoseconds.
+        :return: The index entry of the record, or the first record if the timestamp is before the stream started.
+        """
+        records = self.records(stream)
+        if len(records) == 0:
+            return None
+
+        idx = np.searchsorted(records["timestamp"], timestamp, side="right") - 1
+        return records[max(0, idx)]
+
+    def read(self, entry: np.void) -> np.ndarray:
+        """Read the data of a record without copying it.
+
+        :param entry: The index entry of the record.
+        :return: A read-only view of the data.
+        """
+        chunk_idx = int(entry["chunk"])
+        if chunk_idx not in self.__chunks:
+            self.__chunks[chunk_idx] = np.memmap(self.path / f"chunk_{chunk_idx:05d}.bin", dtype=np.uint8, mode="r")
+
+        offset = int(entry["offset"])
+        return self.__chunks[chunk_idx][offset:offset + int(entry["length"])]
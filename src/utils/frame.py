@@ -0,0 +1,73 @@
+import cv2
+import numpy as np
+import time
+
+from collections.abc import Callable, Hashable
+from threading import Lock
+from typing import Any
+
+
+class Frame:
+    """A captured frame that is shared by all of its consumers.
+
+    Derived views of the frame (e.g. grayscale) are computed on first use and cached,
+    so every transform runs at most once per frame, regardless of how many consumers need it.
+
+    Attributes
+    ----------
+        image (np.ndarray): The captured image (BGR).
+        sequence (int): The sequence number of the frame in its stream.
+        timestamp (float): The time the frame was captured (time.perf_counter).
+
+    """
+
+    image: np.ndarray
+    sequence: int
+    timestamp: float
+
+    __lock: Lock
+    __locks: dict[Hashable, Lock]
+    __views: dict[Hashable, Any]
+
+    def __init__(self, image: np.ndarray, sequence: int, timestamp: float | None = None) -> None:
+        """Initialize the frame.
+
+        :param image: The captured image (BGR).
+        :param sequence: The sequence number of the frame in its stream.
+        :param timestamp: The time the frame was captured (defaults to now).
+        """
+        self.image = image
+        self.sequence = sequence
+        self.timestamp = time.perf_counter() if timestamp is None else timestamp
+
+        self.__lock = Lock()
+        self.__locks = {}
+        self.__views = {}
+
+    @property
+    def gray(self) -> np.ndarray:
+        """The frame in grayscale."""
+        return self.view("gray", cv2.cvtColor, self.image, cv2.COLOR_BGR2GRAY)
+
+    def view(self, key: Hashable, transform: Callable[..., Any], *args: Any) -> Any:
+        """Get a derived view of the frame, computing it if no consumer has done so yet.
+
+        Consumers that request a view while it is being computed wait for the result instead of
+        computing it again. Views must not be modified, as they are shared.
+
+        :param key: The key of the view, which should include all parameters of the transform.
+        :param transform: The function that computes the view.
+        :param args: The arguments of the function.
+        :return: The view.
+        """
+        if key in self.__views:
+            return self.__views[key]
+
+        with self.__lock:
+            lock = self.__locks.setdefault(key, Lock())
+
+        with lock:
+            if key not in self.__views:
+                self.__views[key] = transform(*args)
+
+        return self.__views[key]
@@ -1,2 +1,3 @@
-from .base_lidar import BaseLidar
+from .base_lidar import BaseLidar, SectorQuery
+from .express_scan import ExpressScanReader
 from .lidar import Lidar
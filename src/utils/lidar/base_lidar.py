@@ -1,101 +1,352 @@
+import dataclasses
+import math
 import numpy as np
+import time
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable
+from threading import Condition
+
+from src.config import config
+
+
+@dataclasses.dataclass
+class SectorQuery:
+    """The answers for several sectors of a scan, one element per sector.
+
+    Attributes
+    ----------
+        nearest_distance: The distance to the closest point in the sector (inf if there is none).
+        nearest_angle: The angle of the closest point in the sector (-1 if there is none).
+        lowest_angle: The lowest angle with a distance in range (-1 if there is none).
+        highest_angle: The highest angle with a distance in range (-1 if there is none).
+        count: The number of points with a distance in range.
+
+    """
+
+    nearest_distance: np.ndarray
+    nearest_angle: np.ndarray
+    lowest_angle: np.ndarray
+    highest_angle: np.ndarray
+    count: np.ndarray
 
 
 class BaseLidar(ABC):
     """Interface for the lidar classes.
 
+    Implementations publish every scan with `update_scan` (or call `scan_completed` after updating the scan
+    data themselves), so waiting code can evaluate its conditions once per scan instead of polling.
+
+    The scan is a polar grid with a configurable resolution. The queries take and return angles in degrees,
+    regardless of the resolution, and the angle of a bin is the angle at its start.
+
     Attributes
     ----------
-        scan_data: A numpy array containing the scan data from the lidar.
+        aggregation: How the measurements in a bin are combined (min or median).
+        resolution: The size of a bin of the scan in degrees.
+        revolution: The number of completed scans.
+        scan_data: A numpy array containing the scan data from the lidar, the distance per bin.
+        scan_time: The time the last scan was completed (time.perf_counter).
 
     """
 
+    aggregation: str
+    resolution: float
+    revolution: int
     scan_data: np.ndarray
+    scan_time: float
+
+    __back_buffer: np.ndarray
+    __closest: np.ndarray
+    __scan_condition: Condition
+    __seen: np.ndarray
+
+    def __init__(self) -> None:
+        """Initialize the lidar."""
+        self.aggregation = config["lidar"]["aggregation"]
+        self.resolution = config["lidar"]["resolution"]
+        self.revolution = 0
+        self.scan_data = np.full(round(360 / self.resolution), np.inf)
+        self.scan_time = 0.0
+
+        self.__back_buffer = self.scan_data.copy()
+        self.__closest = np.empty_like(self.scan_data)
+        self.__scan_condition = Condition()
+        self.__seen = np.empty(len(self.scan_data), dtype=bool)
+
+    def scan_completed(self) -> None:
+        """Signal that a scan was completed, waking up everyone who waits for a scan."""
+        with self.__scan_condition:
+            self.revolution += 1
+            self.scan_time = time.perf_counter()
+            self.__scan_condition.notify_all()
+
+    def update_scan(self, angles: np.ndarray, distances: np.ndarray) -> None:
+        """Publish the measurements of a scan.
+
+        The measurements are binned, keeping the closest or the median distance in every bin. Bins without
+        measurements keep their distance from the previous scan. The scan is built in a back buffer that is
+        then swapped with `scan_data`, so readers never see a partially updated scan.
+
+        :param angles: The angles of the measurements in degrees [0, 360).
+        :param distances: The distances of the measurements (inf for invalid measurements).
+        """
+        bins = np.minimum(np.floor(angles / self.resolution).astype(np.intp), len(self.scan_data) - 1)
+
+        self.__closest.fill(np.inf)
+        if self.aggregation == "median":
+            self.__aggregate_median(bins, distances)
+        else:
+            np.minimum.at(self.__closest, bins, distances)
+
+        self.__seen.fill(False)
+        self.__seen[bins] = True
+
+        np.copyto(self.__back_buffer, self.scan_data)
+        np.copyto(self.__back_buffer, self.__closest, where=self.__seen)
+        self.scan_data, self.__back_buffer = self.__back_buffer, self.scan_data
+
+        self.scan_completed()
+
+    def distance_at(self, angle: float) -> float:
+        """Get the distance at an angle.
+
+        :param angle: The angle in degrees.
+        :return: The distance in the bin of the angle.
+        """
+        return self.scan_data[self.__bin(angle) % len(self.scan_data)]
+
+    def wait_for_scan(self, revolution: int | None = None, timeout: float | None = None) -> bool:
+        """Wait until a scan is completed.
+
+        :param revolution: Wait for a scan after this revolution (defaults to the current revolution).
+        :param timeout: The maximum time to wait in seconds.
+        :return: Whether a scan was completed before the timeout.
+        """
+        if revolution is None:
+            revolution = self.revolution
+
+        with self.__scan_condition:
+            return self.__scan_condition.wait_for(lambda: self.revolution > revolution, timeout)
+
+    def scan_trigger(self) -> Callable[[float | None], bool]:
+        """Get a function that waits for the scans one by one, e.g. to trigger the condition of a manoeuvre step.
+
+        Every call waits for a scan after the one the previous call waited for, so no scan is missed, and
+        the first call waits for a scan after the current one.
+
+        :return: A function that waits for the next scan with a timeout, returning whether it was completed.
+        """
+        revolution = None
+
+        def wait(timeout: float | None = None) -> bool:
+            nonlocal revolution
+            if revolution is None:
+                revolution = self.revolution
+
+            if not self.wait_for_scan(revolution, timeout):
+                return False
+
+            revolution = self.revolution
+            return True
+
+        return wait
 
-    def find_obstacle_distance(self, angle_min: int, angle_max: int) -> int:
+    def find_obstacle_distance(self, angle_min: float, angle_max: float) -> float:
         """A function that finds the distance to the closest obstacle in a certain angle range.
 
-        :param angle_min: The minimum angle to check.
+        :param angle_min: The minimum angle to check (may be negative to wrap around 0 degrees).
         :param angle_max: The maximum angle to check.
         :return: The distance to the closest obstacle.
         """
-        if angle_min < 0:
-            return min(*self.scan_data[359 + angle_min :], *self.scan_data[:angle_max])
-
-        return min(self.scan_data[angle_min:angle_max])
+        distances, _ = self.__sector(self.__bin(angle_min), self.__bin(angle_max))
+        return distances.min(initial=np.inf)
 
-    def find_rightmost_point(self, angle_min: int, angle_max: int, min_dist: int, max_dist: int) -> float:
+    def find_rightmost_point(self, angle_min: float, angle_max: float, min_dist: int, max_dist: int) -> float:
         """A function that returns the distance to rightmost object in range.
 
+        The range of angles excludes angle_min and includes angle_max.
+
         :param angle_min: The minimum angle to check.
         :param angle_max: The maximum angle to check.
         :param min_dist: The distance threshold to check.
         :param max_dist: The distance threshold to check.
         :return: The distance to the closest obstacle.
         """
-        for i in range(angle_max, angle_min, -1):
-            if min_dist < self.scan_data[i] < max_dist:
-                return self.scan_data[i]
+        distances, _ = self.__sector(self.__bin(angle_min) + 1, self.__bin(angle_max) + 1)
 
-        return np.inf
+        in_range = (min_dist < distances) & (distances < max_dist)
+        if not in_range.any():
+            return np.inf
 
-    def find_nearest_angle(self, angle_min: int, angle_max: int) -> int:
+        return distances[len(in_range) - 1 - np.argmax(in_range[::-1])]
+
+    def find_nearest_angle(self, angle_min: float, angle_max: float) -> float:
         """A function that finds the angle to the closest obstacle in a certain angle range.
 
         :param angle_min: The minimum angle to check.
         :param angle_max: The maximum angle to check.
-        :return: The distance to the closest obstacle.
+        :return: The angle to the closest obstacle, or -1 if there is none.
         """
-        if np.all(np.isinf(self.scan_data[angle_min:angle_max])):
+        distances, start = self.__sector(self.__bin(angle_min), self.__bin(angle_max))
+        if np.all(np.isinf(distances)):
             return -1
 
-        return np.argmin(self.scan_data[angle_min:angle_max]) + angle_min
+        return self.__angle(start + np.argmin(distances))
 
-    def find_highest_index(self, angle_min: int, angle_max: int, min_dist: int, max_dist: int) -> int:
-        """A function that returns the highest index with a distance in range.
+    def find_highest_index(self, angle_min: float, angle_max: float, min_dist: int, max_dist: int) -> float:
+        """A function that returns the highest angle with a distance in range.
+
+        The range of angles excludes angle_min and includes angle_max.
 
         :param angle_min: The minimum angle to check.
         :param angle_max: The maximum angle to check.
         :param min_dist: The minimum distance to check.
         :param max_dist: The maximum distance to check.
-        :return: The highest index with a distance in range.
+        :return: The highest angle with a distance in range, or -1 if there is none.
         """
-        for i in range(angle_max, angle_min, -1):
-            if min_dist < self.scan_data[i] < max_dist:
-                return i
+        distances, start = self.__sector(self.__bin(angle_min) + 1, self.__bin(angle_max) + 1)
+
+        in_range = (min_dist < distances) & (distances < max_dist)
+        if not in_range.any():
+            return -1
 
-        return -1
+        return self.__angle(start + len(in_range) - 1 - np.argmax(in_range[::-1]))
 
-    def find_lowest_index(self, angle_min: int, angle_max: int, min_dist: int, max_dist: int) -> int:
-        """A function that returns the lowest index with a distance in range.
+    def find_lowest_index(self, angle_min: float, angle_max: float, min_dist: int, max_dist: int) -> float:
+        """A function that returns the lowest angle with a distance in range.
 
         :param angle_min: The minimum angle to check.
         :param angle_max: The maximum angle to check.
         :param min_dist: The minimum distance to check.
         :param max_dist: The maximum distance to check.
-        :return: The lowest index with a distance in range.
+        :return: The lowest angle with a distance in range, or -1 if there is none.
         """
-        for i in range(angle_min, angle_max):
-            if min_dist < self.scan_data[i] < max_dist:
-                return i
+        distances, start = self.__sector(self.__bin(angle_min), self.__bin(angle_max))
+
+        in_range = (min_dist < distances) & (distances < max_dist)
+        if not in_range.any():
+            return -1
 
-        return -1
+        return self.__angle(start + np.argmax(in_range))
 
-    def free_range(self, angle_min: int, angle_max: int, distance: int, max_points: int = 0) -> bool:
+    def free_range(self, angle_min: float, angle_max: float, distance: int, max_points: int = 0) -> bool:
         """A function that checks if the side between angle_min and angle_max of the car is free.
 
         :param angle_min: The minimum angle to check. (180 is the front of the car)
         :param angle_max: The maximum angle to check. (180 is the front of the car)
         :param distance: The minimum distance to check.
-        :param max_points: The maximum allowed points in the range (to avoid false positives).
+        :param max_points: The maximum allowed points in the range at a resolution of one degree (to avoid
+            false positives).
         :return: Whether the side is free.
         """
-        distances = self.scan_data[angle_min:angle_max]
-        within_range = np.sum(distances < distance)
+        distances, _ = self.__sector(self.__bin(angle_min), self.__bin(angle_max))
+        within_range = np.count_nonzero(distances < distance)
+
+        return within_range <= max_points / self.resolution
+
+    def query_sectors(
+            self,
+            sectors: np.ndarray | list[tuple[float, float]],
+            min_dist: np.ndarray | float = 0,
+            max_dist: np.ndarray | float = np.inf
+    ) -> SectorQuery:
+        """Answer the queries for several sectors of the same scan at once.
+
+        Every sector includes its minimum angle and excludes its maximum angle, and wraps around 0 degrees if
+        its minimum angle is negative or larger than its maximum angle.
+
+        :param sectors: The sectors as minimum and maximum angles (N, 2).
+        :param min_dist: The minimum distance of the points in range, for all sectors or per sector.
+        :param max_dist: The maximum distance of the points in range, for all sectors or per sector.
+        :return: The answers for every sector.
+        """
+        scan_data = self.scan_data
+        sectors = np.asarray(sectors, dtype=np.float64).reshape(-1, 2)
+
+        starts = np.floor(sectors[:, 0] / self.resolution + 1e-9).astype(np.intp)
+        ends = np.floor(sectors[:, 1] / self.resolution + 1e-9).astype(np.intp)
+        ends = np.where(ends < starts, ends + len(scan_data), ends)
+
+        # Pad the sectors to the same length, so they can be answered as the rows of one matrix.
+        offsets = np.arange(max((ends - starts).max(initial=0), 1))
+        bins = (starts[:, None] + offsets) % len(scan_data)
+        in_sector = offsets < (ends - starts)[:, None]
+        distances = np.where(in_sector, scan_data[bins], np.inf)
+
+        min_dist = np.reshape(min_dist, (-1, 1))
+        max_dist = np.reshape(max_dist, (-1, 1))
+        in_range = in_sector & (min_dist < distances) & (distances < max_dist)
+
+        rows = np.arange(len(sectors))
+        any_in_range = in_range.any(axis=1)
+
+        def angles(columns: np.ndarray, found: np.ndarray) -> np.ndarray:
+            """Get the angles of a column per sector, or -1 for the sectors without a result."""
+            return np.where(found, bins[rows, columns] * self.resolution, -1.0)
+
+        nearest_distance = distances.min(axis=1)
+        return SectorQuery(
+            nearest_distance=nearest_distance,
+            nearest_angle=angles(np.argmin(distances, axis=1), np.isfinite(nearest_distance)),
+            lowest_angle=angles(np.argmax(in_range, axis=1), any_in_range),
+            highest_angle=angles(len(offsets) - 1 - np.argmax(in_range[:, ::-1], axis=1), any_in_range),
+            count=np.count_nonzero(in_range, axis=1),
+        )
+
+    def __aggregate_median(self, bins: np.ndarray, distances: np.ndarray) -> None:
+        """Take the median distance of the valid measurements in every bin.
+
+        :param bins: The bins of the measurements.
+        :param distances: The distances of the measurements.
+        """
+        if len(bins) == 0:
+            return
+
+        order = np.lexsort((distances, bins))
+        bins = bins[order]
+        distances = distances[order]
+
+        # Within a bin, the valid measurements are sorted before the invalid (inf) ones, so a bin without
+        # valid measurements gets inf.
+        used, starts = np.unique(bins, return_index=True)
+        valid = np.add.reduceat(np.isfinite(distances), starts)
+
+        lower = starts + np.maximum(valid - 1, 0) // 2
+        upper = starts + valid // 2
+        self.__closest[used] = (distances[lower] + distances[upper]) / 2
+
+    def __angle(self, index: int) -> float:
+        """Get the angle of a bin.
+
+        :param index: The index of the bin, which may be outside of the scan to wrap around.
+        :return: The angle at the start of the bin in degrees.
+        """
+        return (index % len(self.scan_data)) * self.resolution
+
+    def __bin(self, angle: float) -> int:
+        """Get the bin of an angle.
+
+        :param angle: The angle in degrees.
+        :return: The bin of the angle (the small offset compensates for rounding errors of the division).
+        """
+        return math.floor(angle / self.resolution + 1e-9)
+
+    def __sector(self, start: int, end: int) -> tuple[np.ndarray, int]:
+        """Get the distances in a range of bins, wrapping around at 0 degrees.
+
+        :param start: The first bin of the range (may be negative).
+        :param end: The bin after the range (may be smaller than the start, or beyond the last bin).
+        :return: The distances in the range, and the first bin of the range.
+        """
+        scan_data = self.scan_data
+        if end < start:
+            end += len(scan_data)
+
+        if start >= 0 and end <= len(scan_data):
+            return scan_data[start:end], start
 
-        return within_range <= max_points
+        return scan_data.take(np.arange(start, end), mode="wrap"), start
 
     @abstractmethod
     def start(self) -> None:
@@ -0,0 +1,281 @@
+import numpy as np
+import serial
+import time
+
+from collections.abc import Generator
+
+
+CAPSULE_SIZE = 84
+DESCRIPTOR_SIZE = 7
+
+LEGACY_CAPSULE = 0x82
+DENSE_CAPSULE = 0x85
+
+MOTOR_PWM = 660
+
+LEGACY_CAPSULE_DTYPE = np.dtype([
+    ("sync", np.uint8, 2),
+    ("start_angle", "<u2"),
+    ("cabins", [("distance", "<u2", 2), ("offsets", np.uint8)], 16),
+])
+DENSE_CAPSULE_DTYPE = np.dtype([
+    ("sync", np.uint8, 2),
+    ("start_angle", "<u2"),
+    ("distances", "<u2", 40),
+])
+
+
+class ExpressScanReader:
+    """A reader for the express scans of an RPLidar, which decodes whole serial reads at once.
+
+    The lidar sends its measurements in capsules of 84 bytes, either legacy capsules (32 measurements with an
+    angle compensation each) or dense capsules (40 measurements). Every read is validated and decoded as a
+    batch of capsules with numpy. The angles of the measurements in a capsule are interpolated between its
+    start angle and the start angle of the next capsule, so the last capsule is kept until the next read.
+    The reader owns the serial port, so it also controls the motor of the lidar.
+
+    Attributes
+    ----------
+        capsule_type: The type of the capsules the lidar sends (LEGACY_CAPSULE or DENSE_CAPSULE).
+        capsules_per_read: The number of capsules to read from the serial port at once.
+        min_measurements: The minimum number of measurements in a yielded scan.
+        port: The serial port of the lidar (anything with the methods of serial.Serial that are used, e.g. a
+            fake port replaying a capture).
+
+    """
+
+    capsule_type: int = LEGACY_CAPSULE
+    capsules_per_read: int
+    min_measurements: int
+    port: serial.Serial
+
+    __buffer: bytearray
+    __last_angle: float = 0.0
+    __pending: np.ndarray | None = None
+    __scan: list[tuple[np.ndarray, np.ndarray]]
+
+    def __init__(self, port: serial.Serial, capsules_per_read: int = 8, min_measurements: int = 5) -> None:
+        """Initialize the reader.
+
+        :param port: The serial port of the lidar.
+        :param capsules_per_read: The number of capsules to read from the serial port at once.
+        :param min_measurements: The minimum number of measurements in a yielded scan.
+        """
+        self.port = port
+        self.capsules_per_read = capsules_per_read
+        self.min_measurements = min_measurements
+
+        self.__buffer = bytearray()
+        self.__scan = []
+
+    def start(self, mode: int = 0) -> None:
+        """Start an express scan.
+
+        :param mode: The scan mode of the lidar (0 is the legacy express scan, other modes are the boost modes).
+        """
+        self.reset()
+
+        # The lidar may still be sending a previous scan, whose bytes would be read instead of the descriptor.
+        self.stop()
+        time.sleep(0.01)
+        self.port.reset_input_buffer()
+
+        self.__send(0x82, bytes([mode, 0, 0, 0, 0]))
+
+        descriptor = self.port.read(DESCRIPTOR_SIZE)
+        if len(descriptor) != DESCRIPTOR_SIZE or not descriptor.startswith(b"\xa5\x5a"):
+            raise ValueError("The lidar did not reply to the express scan request.")
+
+        size = int.from_bytes(descriptor[2:6], "little") & 0x3FFFFFFF
+        if size != CAPSULE_SIZE or descriptor[6] not in (LEGACY_CAPSULE, DENSE_CAPSULE):
+            raise ValueError(f"Unsupported express scan reply (size {size}, type {descriptor[6]:#x}).")
+
+        self.capsule_type = descriptor[6]
+
+    def stop(self) -> None:
+        """Stop scanning."""
+        self.port.write(b"\xa5\x25")
+
+    def start_motor(self, pwm: int = MOTOR_PWM) -> None:
+        """Start the motor of the lidar.
+
+        :param pwm: The duty cycle of the motor (0 to 1023), for the lidars that control it with PWM.
+        """
+        self.port.setDTR(False)
+        self.__send(0xF0, pwm.to_bytes(2, "little"))
+
+    def stop_motor(self) -> None:
+        """Stop the motor of the lidar."""
+        self.__send(0xF0, bytes(2))
+        time.sleep(0.001)
+        self.port.setDTR(True)
+
+    def reset(self) -> None:
+        """Forget the data of the previous scans."""
+        self.__buffer.clear()
+        self.__last_angle = 0.0
+        self.__pending = None
+        self.__scan = []
+
+    def iter_scans(self, mode: int = 0) -> Generator[tuple[np.ndarray, np.ndarray], None, None]:
+        """Start an express scan and yield the scans.
+
+        :param mode: The scan mode of the lidar.
+        :return: The angles (degrees) and distances (millimeters, 0 if invalid) of the measurements of the scans.
+        """
+        self.start(mode)
+
+        while True:
+            data = self.port.read(self.capsules_per_read * CAPSULE_SIZE)
+            yield from self.feed(data)
+
+    def feed(self, data: bytes) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Decode data read from the lidar.
+
+        :param data: The data read from the serial port.
+        :return: The scans that were completed by the data, as angles and distances of their measurements.
+        """
+        self.__buffer += data
+
+        scans = []
+        for capsules in self.__take_capsules():
+            if self.__pending is not None:
+                capsules = np.concatenate((self.__pending, capsules))
+
+            # A capsule that restarts the scan cannot be interpolated with the capsule before it.
+            restarts = np.flatnonzero(capsules["start_angle"][1:] >> 15) + 1
+            for run in np.split(capsules, restarts):
+                scans += self.__decode(run)
+
+        return scans
+
+    def __decode(self, capsules: np.ndarray) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Decode a run of consecutive capsules, keeping the last one until the next capsule is read.
+
+        :param capsules: The capsules.
+        :return: The completed scans.
+        """
+        self.__pending = capsules[-1:]
+        if len(capsules) < 2:
+            return []
+
+        start_angles = (capsules["start_angle"] & 0x7FFF) / 64
+        angle_steps = (np.diff(start_angles) % 360)[:, None]
+        capsules = capsules[:-1]
+
+        if self.capsule_type == DENSE_CAPSULE:
+            distances = capsules["distances"].astype(np.float64)
+            base_angles = start_angles[:-1, None] + angle_steps * np.arange(40) / 40
+            angles = base_angles % 360
+        else:
+            raw = capsules["cabins"]["distance"].reshape(len(capsules), 32)
+            offsets = capsules["cabins"]["offsets"]
+            offsets = np.stack((offsets & 0x0F, offsets >> 4), axis=-1).reshape(len(capsules), 32)
+
+            # The angle compensation is a signed 6-bit number of eighths of a degree, whose 2 high bits are
+            # the low bits of the distance.
+            compensation = (offsets | ((raw & 0x3) << 4)).astype(np.int16)
+            compensation = np.where(compensation & 0x20, compensation - 64, compensation) / 8
+
+            distances = (raw >> 2).astype(np.float64)
+            base_angles = start_angles[:-1, None] + angle_steps * np.arange(32) / 32
+            angles = (base_angles - compensation) % 360
+
+        return self.__split_scans(angles.ravel(), distances.ravel(), base_angles.ravel() % 360)
+
+    def __split_scans(
+            self,
+            angles: np.ndarray,
+            distances: np.ndarray,
+            base_angles: np.ndarray
+    ) -> list[tuple[np.ndarray, np.ndarray]]:
+        """Split the measurements into scans where the angle wraps around.
+
+        :param angles: The angles of the measurements.
+        :param distances: The distances of the measurements.
+        :param base_angles: The angles of the measurements without their compensation.
+        :return: The completed scans.
+        """
+        wraps = np.flatnonzero(np.diff(base_angles, prepend=self.__last_angle) < 0)
+        self.__last_angle = base_angles[-1]
+
+        scans = []
+        start = 0
+        for end in wraps:
+            self.__scan.append((angles[start:end], distances[start:end]))
+            scan_angles, scan_distances = (np.concatenate(parts) for parts in zip(*self.__scan, strict=True))
+            if len(scan_angles) > self.min_measurements:
+                scans.append((scan_angles, scan_distances))
+
+            self.__scan = []
+            start = end
+
+        self.__scan.append((angles[start:], distances[start:]))
+        return scans
+
+    def __send(self, command: int, payload: bytes) -> None:
+        """Send a command with a payload to the lidar.
+
+        :param command: The command.
+        :param payload: The payload of the command.
+        """
+        request = bytes([0xA5, command, len(payload)]) + payload
+        self.port.write(request + bytes([np.bitwise_xor.reduce(np.frombuffer(request, np.uint8))]))
+
+    def __take_capsules(self) -> Generator[np.ndarray, None, None]:
+        """Take the valid capsules from the buffer, resynchronizing on corrupted data.
+
+        :return: Runs of consecutive valid capsules.
+        """
+        dtype = DENSE_CAPSULE_DTYPE if self.capsule_type == DENSE_CAPSULE else LEGACY_CAPSULE_DTYPE
+        data = np.frombuffer(bytes(self.__buffer), np.uint8)
+        offset = 0
+
+        while len(data) - offset >= CAPSULE_SIZE:
+            count = (len(data) - offset) // CAPSULE_SIZE
+            blocks = data[offset:offset + count * CAPSULE_SIZE].reshape(count, CAPSULE_SIZE)
+
+            invalid = np.flatnonzero(~self.__is_valid(blocks))
+            valid = invalid[0] if len(invalid) > 0 else count
+            if valid > 0:
+                yield blocks[:valid].view(dtype).ravel()
+                offset += valid * CAPSULE_SIZE
+
+            if valid == count:
+                break
+
+            # The data is corrupted, so the capsules before it cannot be interpolated with the next ones.
+            self.__pending = None
+            offset = self.__find_capsule(data, offset + 1)
+
+        del self.__buffer[:offset]
+
+    @staticmethod
+    def __find_capsule(data: np.ndarray, offset: int) -> int:
+        """Find the next valid capsule in the data.
+
+        :param data: The data.
+        :param offset: The offset to search from.
+        :return: The offset of the next valid capsule, or of the data that could still start one.
+        """
+        candidates = np.flatnonzero(((data[offset:-1] >> 4) == 0xA) & ((data[offset + 1:] >> 4) == 0x5)) + offset
+        for candidate in candidates:
+            if candidate + CAPSULE_SIZE > len(data):
+                return candidate
+
+            if ExpressScanReader.__is_valid(data[candidate:candidate + CAPSULE_SIZE].reshape(1, -1))[0]:
+                return candidate
+
+        return max(offset, len(data) - 1)
+
+    @staticmethod
+    def __is_valid(blocks: np.ndarray) -> np.ndarray:
+        """Check the synchronization bits and the checksums of capsules.
+
+        :param blocks: The bytes of the capsules (N, 84).
+        :return: Whether every capsule is valid.
+        """
+        synchronized = ((blocks[:, 0] >> 4) == 0xA) & ((blocks[:, 1] >> 4) == 0x5)
+        checksums = (blocks[:, 0] & 0x0F) | ((blocks[:, 1] & 0x0F) << 4)
+
+        return synchronized & (np.bitwise_xor.reduce(blocks[:, 2:], axis=1) == checksums)
@@ -1,39 +1,56 @@
 import logging
 import numpy as np
+import serial
 
-from math import floor
 from rplidar import RPLidar
 from threading import Thread
 from typing import Generator, Optional
 
 from src.config import config
 from src.utils.lidar import BaseLidar
+from src.utils.lidar.express_scan import ExpressScanReader
 
 
 class Lidar(BaseLidar):
     """Class to read data from the lidar and process the data from it.
 
-    The lidar can be used to find the distance to the obstacles around the car.
+    The lidar can be used to find the distance to the obstacles around the car. The measurements of a scan
+    are collected in preallocated arrays and published at once when the scan is complete. In express scan
+    mode, the measurements are decoded from the serial port directly, which yields more measurements per scan,
+    and the reader opens the serial port itself instead of the RPLidar object.
 
     Attributes
     ----------
-        lidar: The lidar object.
+        express_scan: The reader for express scans, or None to use standard scans.
+        lidar: The lidar object, or None in express scan mode.
         scan_data: The data from the lidar.
         thread: The thread that captures the data from the lidar.
 
     """
 
-    lidar: RPLidar
+    express_scan: ExpressScanReader | None = None
+    lidar: RPLidar | None = None
     scan_data: np.ndarray
     thread: Thread
 
+    __angles: np.ndarray
+    __distances: np.ndarray
+
     def __init__(self) -> None:
         """Initializes the lidar."""
-        self.lidar = RPLidar(config["lidar"]["port_name"], timeout=3)
-        self.lidar.stop_motor()
+        super().__init__()
+
+        if config["lidar"]["scan_mode"] == "express":
+            self.express_scan = ExpressScanReader(serial.Serial(config["lidar"]["port_name"], 115200, timeout=3))
+        else:
+            self.lidar = RPLidar(config["lidar"]["port_name"], timeout=3)
+
+        self.__stop_motor()
 
         self.thread = Thread(target=self.__listen, daemon=True)
-        self.scan_data = np.full(360, np.inf)
+
+        self.__angles = np.empty(1024)
+        self.__distances = np.empty(1024)
 
     def start(self) -> None:
         """Start the lidar."""
@@ -43,35 +60,49 @@ class Lidar(BaseLidar):
     def stop(self) -> None:
         """Stop the lidar."""
         self.thread.join()
-        self.lidar.stop()
-        self.lidar.stop_motor()
-        self.lidar.disconnect()
+        self.__stop_motor()
+
+        if self.express_scan is not None:
+            self.express_scan.port.close()
+        else:
+            self.lidar.disconnect()
 
     def __capture(self) -> None:
         """A function that captures the data from the lidar and filters it."""
-        self.lidar.start_motor()
-        for scan in self.__iter_scans():
-            for _, angle, distance in scan:
-                angle = min(359, floor(angle))
-                if distance < config["lidar"]["min_distance"]:
-                    self.scan_data[angle] = np.inf
-                    continue
+        min_distance = config["lidar"]["min_distance"]
 
-                self.scan_data[angle] = distance
+        if self.express_scan is not None:
+            self.express_scan.start_motor()
+            scans = self.express_scan.iter_scans(config["lidar"]["express_mode"])
+        else:
+            self.lidar.start_motor()
+            scans = self.__iter_scans()
 
-    def __iter_scans(self) -> Generator[np.ndarray, None, None]:
+        for angles, distances in scans:
+            distances[distances < min_distance] = np.inf
+            self.update_scan(angles, distances)
+
+    def __iter_scans(self) -> Generator[tuple[np.ndarray, np.ndarray], None, None]:
         """Yield the scans from the lidar.
 
-        :return: The scans from the lidar.
+        The yielded arrays are views of the preallocated buffers, which are reused for the next scan.
+
+        :return: The angles and distances of the measurements of the scans.
         """
-        scan_list = []
-        for new_scan, quality, angle, distance in self.lidar.iter_measures():
+        count = 0
+        for new_scan, _, angle, distance in self.lidar.iter_measures():
             if new_scan:
-                if len(scan_list) > 5:
-                    yield scan_list
-                scan_list = []
+                if count > 5:
+                    yield self.__angles[:count], self.__distances[:count]
+                count = 0
 
-            scan_list.append((quality, angle, distance))
+            if count == len(self.__angles):
+                self.__angles = np.resize(self.__angles, 2 * count)
+                self.__distances = np.resize(self.__distances, 2 * count)
+
+            self.__angles[count] = angle
+            self.__distances[count] = distance
+            count += 1
 
     def __listen(self) -> None:
         """Listen for data from the lidar sensor."""
@@ -80,9 +111,16 @@ class Lidar(BaseLidar):
                 self.__capture()
             except Exception as e:
                 logging.error("Failed to capture data from the lidar: %s", e)
-
-                self.lidar.stop()
-                self.lidar.stop_motor()
+                self.__stop_motor()
+
+    def __stop_motor(self) -> None:
+        """Stop scanning and stop the motor of the lidar."""
+        if self.express_scan is not None:
+            self.express_scan.stop()
+            self.express_scan.stop_motor()
+        else:
+            self.lidar.stop()
+            self.lidar.stop_motor()
 
     @classmethod
     def safe_init(cls) -> Optional["Lidar"]:
@@ -0,0 +1,283 @@
+import dataclasses
+import logging
+import time
+
+from collections.abc import Callable
+from threading import Condition, Thread
+
+from src.config import config
+
+
+@dataclasses.dataclass
+class ManoeuvreStep:
+    """A step of a manoeuvre: an action, followed by a wait for a duration or a condition.
+
+    Attributes
+    ----------
+        name: The name of the step, used in the timing report.
+        action: The function to run at the start of the step. Returning False ends the manoeuvre.
+        duration: The time the step takes in seconds, measured from its planned start.
+        condition: The condition to wait for after the action.
+        consecutive: The number of consecutive evaluations the condition should hold.
+        timeout: The maximum time to wait for the condition in seconds, after which the manoeuvre is cancelled.
+        trigger: A function that waits (with a timeout) until the condition should be evaluated again,
+            e.g. until the next lidar scan. Without a trigger, the condition is polled.
+
+    """
+
+    name: str
+    action: Callable[[], bool | None] | None = None
+    duration: float | None = None
+    condition: Callable[[], bool] | None = None
+    consecutive: int = 1
+    timeout: float | None = None
+    trigger: Callable[[float], bool] | None = None
+
+
+@dataclasses.dataclass
+class StepReport:
+    """The timing of a step of a manoeuvre, relative to the start of the manoeuvre.
+
+    Attributes
+    ----------
+        name: The name of the step.
+        planned: The time the step was planned to start in seconds.
+        started: The time the step started in seconds.
+        finished: The time the step finished in seconds.
+        outcome: How the step ended (done, aborted, cancelled, timeout or failed).
+
+    """
+
+    name: str
+    planned: float
+    started: float
+    finished: float
+    outcome: str
+
+    @property
+    def lateness(self) -> float:
+        """The time the step started after its planned start in seconds."""
+        return self.started - self.planned
+
+
+@dataclasses.dataclass
+class Manoeuvre:
+    """A manoeuvre, declared as a sequence of steps.
+
+    Attributes
+    ----------
+        name: The name of the manoeuvre.
+        steps: The steps of the manoeuvre.
+        on_end: The function that is called with the outcome of the manoeuvre when it ends, e.g. to restore
+            the go-kart when the manoeuvre was cancelled or failed.
+
+    """
+
+    name: str
+    steps: list[ManoeuvreStep]
+    on_end: Callable[[str], None] | None = None
+
+
+class ManoeuvreExecutor:
+    """Runs manoeuvres on a timer thread, one at a time.
+
+    The steps are scheduled on the monotonic clock: the planned start of a step is the end of the duration
+    of the previous step, so delays do not add up over a manoeuvre. The last moments before a deadline are
+    busy-waited, which makes the timing precise to the millisecond instead of depending on the granularity
+    of sleeping. A running manoeuvre can be cancelled, or preempted by a new one.
+
+    Attributes
+    ----------
+        report: The timing of the steps of the last manoeuvre.
+
+    """
+
+    report: list[StepReport]
+
+    __cancelled: bool = False
+    __condition: Condition
+    __current: Manoeuvre | None = None
+    __pending: Manoeuvre | None = None
+    __thread: Thread
+
+    def __init__(self, name: str = "manoeuvre") -> None:
+        """Initialize the executor and start its timer thread.
+
+        :param name: The name of the timer thread.
+        """
+        self.report = []
+        self.__condition = Condition()
+        self.__thread = Thread(target=self.__run, name=name, daemon=True)
+        self.__thread.start()
+
+    @property
+    def running(self) -> bool:
+        """Whether a manoeuvre is running or about to run."""
+        with self.__condition:
+            return self.__current is not None or self.__pending is not None
+
+    def start(self, manoeuvre: Manoeuvre, preempt: bool = False) -> bool:
+        """Start a manoeuvre.
+
+        :param manoeuvre: The manoeuvre to start.
+        :param preempt: Whether to cancel the running manoeuvre, instead of not starting this one.
+        :return: Whether the manoeuvre was started.
+        """
+        with self.__condition:
+            if self.__current is not None or self.__pending is not None:
+                if not preempt:
+                    return False
+
+                self.__cancelled = True
+
+            self.__pending = manoeuvre
+            self.__condition.notify_all()
+
+        return True
+
+    def cancel(self) -> None:
+        """Cancel the running manoeuvre."""
+        with self.__condition:
+            self.__pending = None
+            self.__cancelled = self.__current is not None
+            self.__condition.notify_all()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Wait until no manoeuvre is running.
+
+        :param timeout: The maximum time to wait in seconds.
+        :return: Whether no manoeuvre is running.
+        """
+        with self.__condition:
+            return self.__condition.wait_for(lambda: self.__current is None and self.__pending is None, timeout)
+
+    def __run(self) -> None:
+        """Run the manoeuvres as they are started."""
+        while True:
+            with self.__condition:
+                self.__condition.wait_for(lambda: self.__pending is not None)
+                self.__current, self.__pending = self.__pending, None
+                self.__cancelled = False
+
+            report = self.__execute(self.__current)
+
+            with self.__condition:
+                self.report = report
+                self.__current = None
+                self.__condition.notify_all()
+
+    def __execute(self, manoeuvre: Manoeuvre) -> list[StepReport]:
+        """Execute the steps of a manoeuvre, until one of them does not end as planned.
+
+        :param manoeuvre: The manoeuvre to execute.
+        :return: The timing of the executed steps.
+        """
+        report = []
+        start = time.monotonic()
+        planned = start
+        outcome = "done"
+
+        for step in manoeuvre.steps:
+            started = time.monotonic()
+            outcome = self.__execute_step(step, planned)
+            finished = time.monotonic()
+
+            report.append(StepReport(step.name, planned - start, started - start, finished - start, outcome))
+            logging.debug(
+                "Manoeuvre %s, step %s: %s after %.1f ms (started %.1f ms late).",
+                manoeuvre.name, step.name, outcome, (finished - started) * 1000, (started - planned) * 1000
+            )
+
+            if outcome != "done":
+                break
+
+            # Conditions end at an unknown time, so the next step is planned from the end of the wait.
+            planned = planned + step.duration if step.duration is not None and step.condition is None else finished
+
+        logging.info("Manoeuvre %s %s after %.3f seconds.", manoeuvre.name, outcome, time.monotonic() - start)
+
+        if manoeuvre.on_end is not None:
+            try:
+                manoeuvre.on_end(outcome)
+            except Exception as e:
+                logging.error("Ending the manoeuvre %s failed: %s", manoeuvre.name, e)
+        return report
+
+    def __execute_step(self, step: ManoeuvreStep, planned: float) -> str:
+        """Execute a step of a manoeuvre.
+
+        :param step: The step to execute.
+        :param planned: The planned start of the step (time.monotonic).
+        :return: How the step ended.
+        """
+        if self.__cancelled:
+            return "cancelled"
+
+        try:
+            if step.action is not None and step.action() is False:
+                return "aborted"
+
+            if step.duration is not None and not self.__sleep_until(planned + step.duration):
+                return "cancelled"
+
+            if step.condition is not None:
+                return self.__wait_for_condition(step)
+        except Exception as e:
+            logging.error("The step %s of the manoeuvre failed: %s", step.name, e)
+            return "failed"
+
+        return "done"
+
+    def __sleep_until(self, deadline: float, precise: bool = True) -> bool:
+        """Sleep until a deadline, busy-waiting the last moments before it if it should be precise.
+
+        :param deadline: The deadline (time.monotonic).
+        :param precise: Whether to busy-wait the last moments before the deadline.
+        :return: Whether the deadline was reached without the manoeuvre being cancelled.
+        """
+        spin_time = config["manoeuvres"]["spin_time"] if precise else 0.0
+
+        with self.__condition:
+            while not self.__cancelled:
+                remaining = deadline - time.monotonic() - spin_time
+                if remaining <= 0:
+                    break
+
+                self.__condition.wait(remaining)
+
+            if self.__cancelled:
+                return False
+
+        while time.monotonic() < deadline:
+            time.sleep(0)
+
+        return True
+
+    def __wait_for_condition(self, step: ManoeuvreStep) -> str:
+        """Wait until the condition of a step holds for a number of consecutive evaluations.
+
+        :param step: The step to wait for.
+        :return: How the wait ended.
+        """
+        poll_interval = config["manoeuvres"]["poll_interval"]
+        deadline = None if step.timeout is None else time.monotonic() + step.timeout
+
+        count = 0
+        while count < step.consecutive:
+            if self.__cancelled:
+                return "cancelled"
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                return "timeout"
+
+            wait_time = poll_interval if deadline is None else min(poll_interval, deadline - now)
+            if step.trigger is None:
+                if not self.__sleep_until(now + wait_time, precise=False):
+                    return "cancelled"
+            elif not step.trigger(wait_time):
+                continue
+
+            count = count + 1 if step.condition() else 0
+
+        return "done"
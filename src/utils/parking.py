@@ -1,9 +1,8 @@
 import logging
 import math
 import numpy as np
-import time
 
-from typing import Callable
+from collections.abc import Callable
 
 from src.config import config
 from src.constants import Gear
@@ -11,11 +10,16 @@ from src.driving.can import ICANController
 from src.driving.speed_controller import ISpeedController, SpeedControllerState
 from src.lane_assist.lane_assist import LaneAssist
 from src.utils.lidar import BaseLidar
+from src.utils.manoeuvre import Manoeuvre, ManoeuvreStep
 
 
 class ParkingManoeuvre:
-    """A parking manoeuvre that uses the lidar sensor to park the go-kart."""
+    """A parking manoeuvre that uses the lidar sensor to park the go-kart.
 
+    The manoeuvre is declared as steps for a manoeuvre executor, whose conditions are evaluated once per scan.
+    """
+
+    __available_space: float = 0.0
     __can_controller: ICANController
     __lane_assist: LaneAssist
     __lengths: list[float]
@@ -34,76 +38,121 @@ class ParkingManoeuvre:
         self.__speed_controller = lane_assist.speed_controller
         self.__can_controller = lane_assist.can_controller
 
-    def park(self) -> None:
-        """Park the go-kart."""
-        self.__speed_controller.target_speed = config["parking"]["max_speed"]
-        logging.info("Parking the go-kart.")
-
-        self.__wait_until_wall()
-        self.__wait_until_opening()
-        self.__wait_until_wall(estimate_length=True)
-
-        available_space = self.__get_available_space()
-        logging.info("Estimated parking space length: %.2f meters.", available_space)
-
-        if available_space < config["kart"]["dimensions"]["length"]:
-            self.__speed_controller.state = SpeedControllerState.STOPPED
-
-            logging.error("Parking space is too small.")
-            return
-
-        # Drive into the parking spot
-        self.__wait_until(self.__should_start_steering)
-        self.__lane_assist.stop()
-        self.__start_steering()
-
-        # Straighten the wheels when the go-kart is at a 45-degree angle
-        self.__wait_until(self.__is_at_45_degree_angle)
-        self.__straighten_wheels()
-
-        # Stop backing up once the front of the go-kart is past the barrier, then start steering back
-        self.__wait_until(self.__is_past_barrier)
-        self.__start_steering_back()
-
-        # Wait until the go-kart has parked, then stop driving
-        self.__wait_until(self.__is_straight)
-        self.__straighten_wheels()
-
-        self.__wait_until(lambda: self.__is_centered(available_space))
-        self.__speed_controller.state = SpeedControllerState.STOPPED
+    def manoeuvre(self, on_end: Callable[[str], None] | None = None) -> Manoeuvre:
+        """Declare the manoeuvre that parks the go-kart.
 
-    def __angle_to_xy(self, angle: int) -> tuple[float, float]:
+        :param on_end: The function that is called with the outcome of the manoeuvre when it ends.
+        :return: The parking manoeuvre.
+        """
+        trigger = self.__lidar.scan_trigger
+
+        steps = [
+            ManoeuvreStep("drive slowly", self.__drive_slowly),
+            ManoeuvreStep("wait for the wall", condition=self.__found_wall, consecutive=3, trigger=trigger()),
+            ManoeuvreStep(
+                "wait for the opening",
+                condition=lambda: self.__lidar.free_range(265, 290, 3000),
+                consecutive=3,
+                trigger=trigger()
+            ),
+            ManoeuvreStep(
+                "measure the parking space",
+                condition=lambda: self.__found_wall(estimate_length=True),
+                consecutive=3,
+                trigger=trigger()
+            ),
+            ManoeuvreStep("check the parking space", self.__check_available_space),
+
+            # Drive into the parking spot
+            ManoeuvreStep("wait to steer in", condition=self.__should_start_steering, trigger=trigger()),
+            *self.__reverse_steps("steer in", 1.25, self.__lane_assist.stop),
+
+            # Straighten the wheels when the go-kart is at a 45-degree angle
+            ManoeuvreStep("wait for 45 degrees", condition=self.__is_at_45_degree_angle, trigger=trigger()),
+            ManoeuvreStep("straighten", self.__straighten_wheels),
+
+            # Stop backing up once the front of the go-kart is past the barrier, then start steering back
+            ManoeuvreStep("wait for the barrier", condition=self.__is_past_barrier, trigger=trigger()),
+            *self.__reverse_steps("steer back", -1.25),
+
+            # Wait until the go-kart has parked, then stop driving
+            ManoeuvreStep("wait until straight", condition=self.__is_straight, trigger=trigger()),
+            ManoeuvreStep("straighten again", self.__straighten_wheels),
+            ManoeuvreStep("wait until centered", condition=self.__is_centered, trigger=trigger()),
+            ManoeuvreStep("stop", self.__stop),
+        ]
+
+        def end(outcome: str) -> None:
+            """Stop the go-kart if the manoeuvre did not finish, then pass the outcome on."""
+            if outcome not in ("done", "aborted"):
+                self.__stop()
+
+            if on_end is not None:
+                on_end(outcome)
+
+        return Manoeuvre("parking", steps, end)
+
+    def __angle_to_xy(self, angle: float) -> tuple[float, float]:
         """Convert an angle and distance to x, y coordinates.
 
         :param angle: The angle to convert.
         :return: The x, y coordinates.
         """
         radians = math.radians((angle + 90) % 360)
-        distance = self.__lidar.scan_data[angle]
+        distance = self.__lidar.distance_at(angle)
 
         x = distance * math.cos(radians)
         y = distance * math.sin(radians)
 
         return x, y
 
-    def __estimate_length(self) -> None:
-        """Estimate the length of the parking space."""
-        angle_front = self.__lidar.find_nearest_angle(200, 250)
-        angle_back = self.__lidar.find_nearest_angle(280, 320)
-        if angle_front == -1 or angle_back == -1:
-            return
+    def __check_available_space(self) -> bool:
+        """Check if the parking space is large enough, stopping the go-kart if it is not.
 
-        angle_diff = math.radians(angle_back - angle_front)
+        :return: Whether the parking space is large enough.
+        """
+        self.__available_space = self.__get_available_space()
+        logging.info("Estimated parking space length: %.2f meters.", self.__available_space)
+
+        if self.__available_space < config["kart"]["dimensions"]["length"]:
+            self.__speed_controller.state = SpeedControllerState.STOPPED
 
-        dist_front = self.__lidar.scan_data[angle_front]
-        dist_back = self.__lidar.scan_data[angle_back]
+            logging.error("Parking space is too small.")
+            return False
+
+        return True
+
+    def __drive_slowly(self) -> None:
+        """Drive slowly while looking for the parking space."""
+        self.__speed_controller.target_speed = config["parking"]["max_speed"]
+        logging.info("Parking the go-kart.")
+
+    def __estimate_length(self) -> None:
+        """Estimate the length of the parking space."""
+        # Both sectors are answered from the same scan.
+        query = self.__lidar.query_sectors([(200, 250), (280, 320)])
+        angle_front, angle_back = query.nearest_angle
+        dist_front, dist_back = query.nearest_distance
 
         if np.isinf(dist_front) or np.isinf(dist_back):
             return
 
+        angle_diff = math.radians(angle_back - angle_front)
+
         distance = math.sqrt(dist_front**2 + dist_back**2 - 2 * dist_front * dist_back * math.cos(angle_diff))
         self.__lengths.append(distance)
 
+    def __found_wall(self, estimate_length: bool = False) -> bool:
+        """Check if the lidar sensor sees the wall.
+
+        :param estimate_length: Whether to estimate the length of the parking space.
+        :return: Whether the wall is seen.
+        """
+        if estimate_length and not config["parking"]["available_space"]["static"]:
+            self.__estimate_length()
+
+        return not self.__lidar.free_range(265, 275, 3000)
+
     def __get_available_space(self) -> float:
         """Get the available space in the parking spot.
 
@@ -148,10 +197,9 @@ class ParkingManoeuvre:
 
         return np.mean(angles) <= 45 + config["parking"]["angle_tolerance"]
 
-    def __is_centered(self, available_space: float) -> bool:
+    def __is_centered(self) -> bool:
         """Check if the go-kart is centered in the parking spot.
 
-        :param available_space: The available space in the parking spot.
         :return: Whether the go-kart is centered in the parking spot.
         """
         frontal_distance = self.__lidar.find_obstacle_distance(175, 185)
@@ -163,7 +211,7 @@ class ParkingManoeuvre:
         margin = (config["kart"]["dimensions"]["length"] / 2) - config["kart"]["lidar_offset"]
         margin += self.__speed_controller.get_braking_distance()
 
-        center = available_space / 2 * 1000
+        center = self.__available_space / 2 * 1000
 
         return frontal_distance + margin * 1000 >= center
 
@@ -210,6 +258,37 @@ class ParkingManoeuvre:
 
         return min_angle <= angle <= max_angle
 
+    def __reverse_steps(
+            self,
+            name: str,
+            steering: float,
+            before: Callable[[], None] | None = None
+    ) -> list[ManoeuvreStep]:
+        """Declare the steps that stop the go-kart, turn the wheels and start reversing.
+
+        :param name: The name of the steps.
+        :param steering: The steering to reverse with.
+        :param before: The function to call before stopping the go-kart.
+        :return: The steps.
+        """
+        def stop() -> None:
+            """Stop the go-kart before proceeding."""
+            if before is not None:
+                before()
+
+            self.__speed_controller.toggle()
+
+        def reverse() -> None:
+            """Start reversing."""
+            self.__speed_controller.toggle()
+            self.__speed_controller.gear = Gear.REVERSE
+
+        return [
+            ManoeuvreStep(f"{name}: stop", stop, 1.0),
+            ManoeuvreStep(f"{name}: turn the wheels", lambda: self.__can_controller.set_steering(steering), 1.0),
+            ManoeuvreStep(f"{name}: reverse", reverse),
+        ]
+
     def __should_start_steering(self) -> bool:
         """Keep driving until we can start steering into the parking spot.
 
@@ -228,8 +307,8 @@ class ParkingManoeuvre:
         if wall_angle > 100:
             return False
 
-        nearest_dist = self.__lidar.scan_data[nearest_angle]
-        rightmost_dist = self.__lidar.scan_data[rightmost_angle]
+        nearest_dist = self.__lidar.distance_at(nearest_angle)
+        rightmost_dist = self.__lidar.distance_at(rightmost_angle)
 
         if rightmost_dist <= nearest_dist:
             return False
@@ -242,68 +321,14 @@ class ParkingManoeuvre:
 
         return distance > threshold
 
-    def __start_steering(self) -> None:
-        """Start steering into the parking spot."""
-        # Stop the go-kart before proceeding
-        self.__speed_controller.toggle()
-        time.sleep(1)
-
-        # Reverse into the parking spot
-        self.__can_controller.set_steering(1.25)
-        time.sleep(1)
-
-        self.__speed_controller.toggle()
-        self.__speed_controller.gear = Gear.REVERSE
-
-    def __start_steering_back(self) -> None:
-        """Start steering back into the parking spot."""
-        # Stop the go-kart before proceeding
-        self.__speed_controller.toggle()
-        time.sleep(1)
-
-        # Turn the wheels all the way to the left
-        self.__can_controller.set_steering(-1.25)
-        time.sleep(1)
-
-        self.__speed_controller.toggle()
-        self.__speed_controller.gear = Gear.REVERSE
+    def __stop(self) -> None:
+        """Stop the go-kart."""
+        self.__speed_controller.state = SpeedControllerState.STOPPED
 
     def __straighten_wheels(self) -> None:
         """Straighten the wheels."""
         self.__can_controller.set_steering(0)
 
-    def __wait_until_opening(self, consecutive: int = 3) -> None:
-        """Wait until the opening is reached.
-
-        :param consecutive: The amount of consecutive scans that need to detect an opening.
-        """
-        found_opening = 0
-        while found_opening < consecutive:
-            if self.__lidar.free_range(265, 290, 3000):
-                found_opening += 1
-            else:
-                found_opening = 0
-
-            time.sleep(0.1)
-
-    def __wait_until_wall(self, consecutive: int = 3, estimate_length: bool = False) -> None:
-        """Wait until the lidar sensor detects a wall.
-
-        :param consecutive: The amount of consecutive scans that need to detect a wall.
-        :param estimate_length: Whether to estimate the length of the parking space.
-        """
-        found_wall = 0
-        while found_wall < consecutive:
-            if estimate_length and not config["parking"]["available_space"]["static"]:
-                self.__estimate_length()
-
-            if self.__lidar.free_range(265, 275, 3000):
-                found_wall = 0
-            else:
-                found_wall += 1
-
-            time.sleep(0.1)
-
     @staticmethod
     def __angle_from_points(a: tuple[float, float], b: tuple[float, float]) -> float:
         """Calculate the angle between two points.
@@ -318,11 +343,3 @@ class ParkingManoeuvre:
         angle = math.degrees(math.atan2(dy, dx))
         return (180 - angle) % 360
 
-    @staticmethod
-    def __wait_until(condition: Callable[[], bool]) -> None:
-        """Wait until a certain condition is met.
-
-        :param condition: The condition to check.
-        """
-        while not condition():
-            time.sleep(0.01)
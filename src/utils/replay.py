@@ -0,0 +1,143 @@
+import cv2
+import logging
+import numpy as np
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+from src.utils.frame import Frame
+
+
+CAMERAS = ("left", "center", "right")
+
+
+class ReplaySource(ABC):
+    """Interface for the sources of recorded camera frames."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """The number of frames in the replay."""
+        pass
+
+    @abstractmethod
+    def read(self, index: int) -> dict[str, np.ndarray]:
+        """Read the frames of all cameras at the given index.
+
+        :param index: The index of the frame.
+        :return: The frames, keyed by camera name.
+        """
+        pass
+
+
+class ImageFolderReplay(ReplaySource):
+    """A replay source for the images captured by the data driving script.
+
+    The folder should contain images named `{timestamp}_{camera}.jpg`. If a camera was not recorded,
+    the frames of the center camera will be used in its place.
+
+    Attributes
+    ----------
+        cameras (tuple[str, ...]): The names of the cameras.
+        folder (Path): The folder containing the images.
+        timestamps (np.ndarray): The timestamps of the frames in milliseconds.
+
+    """
+
+    cameras: tuple[str, ...]
+    folder: Path
+    timestamps: np.ndarray
+
+    __fallback: dict[str, str]
+
+    def __init__(self, folder: Path | str, cameras: tuple[str, ...] = CAMERAS) -> None:
+        """Initialize the replay source.
+
+        :param folder: The folder containing the images.
+        :param cameras: The names of the cameras to replay.
+        """
+        self.folder = Path(folder)
+        if not self.folder.is_dir():
+            raise FileNotFoundError(f"Replay folder not found: {self.folder}")
+
+        self.cameras = cameras
+        self.timestamps = np.array(
+            sorted(int(path.stem.split("_")[0]) for path in self.folder.glob("*_center.jpg")), dtype=np.int64
+        )
+
+        if len(self.timestamps) == 0:
+            raise ValueError(f"No frames found in {self.folder}")
+
+        self.__fallback = {}
+        for camera in cameras:
+            if not (self.folder / f"{self.timestamps[0]}_{camera}.jpg").exists():
+                logging.warning("Camera '%s' was not recorded, using the center camera instead.", camera)
+                self.__fallback[camera] = "center"
+
+    def __len__(self) -> int:
+        """The number of frames in the replay."""
+        return len(self.timestamps)
+
+    def read(self, index: int) -> dict[str, np.ndarray]:
+        """Read the frames of all cameras at the given index.
+
+        :param index: The index of the frame.
+        :return: The frames, keyed by camera name.
+        """
+        timestamp = self.timestamps[index]
+        frames = {}
+
+        for camera in self.cameras:
+            name = self.__fallback.get(camera, camera)
+            if name not in frames:
+                frames[name] = cv2.imread(str(self.folder / f"{timestamp}_{name}.jpg"))
+
+            frames[camera] = frames[name]
+
+        return frames
+
+
+class ReplayStream:
+    """A replacement for a video stream that returns the frames pushed by a replay driver.
+
+    This allows the replayed frames to be fed through the same pipeline as the camera frames.
+    """
+
+    __frame: Frame | None = None
+    __sequence: int = 0
+    __stopped: bool = False
+
+    @property
+    def stopped(self) -> bool:
+        """Whether the replay stream is stopped."""
+        return self.__stopped
+
+    def has_next(self) -> bool:
+        """Checks if the replay stream has a frame available."""
+        return not self.__stopped and self.__frame is not None
+
+    def next(self) -> np.ndarray:
+        """Returns the most recently pushed frame."""
+        return self.__frame.image
+
+    def next_frame(self) -> Frame:
+        """Returns the most recently pushed frame, including its cached views."""
+        return self.__frame
+
+    def push(self, frame: np.ndarray | Frame) -> None:
+        """Push a new frame to the replay stream.
+
+        :param frame: The frame to push. A shared frame keeps the views that other consumers computed.
+        """
+        if not isinstance(frame, Frame):
+            self.__sequence += 1
+            frame = Frame(frame, self.__sequence)
+
+        self.__frame = frame
+
+    def start(self) -> None:
+        """Starts the replay stream."""
+        self.__stopped = False
+
+    def stop(self) -> None:
+        """Stops the replay stream."""
+        self.__stopped = True
@@ -2,9 +2,10 @@ import cv2
 import numpy as np
 import sys
 
-from threading import Thread
+from threading import Condition, Thread
 
 from src.constants import CameraFramerate, CameraResolution
+from src.utils.frame import Frame
 
 
 def get_camera_backend() -> int:
@@ -26,6 +27,9 @@ def get_camera_backend() -> int:
 class VideoStream:
     """A class to read frames from a video stream.
 
+    There is a single instance per camera, which publishes every captured frame once as a `Frame`. All
+    consumers of the camera share the frame and the views derived from it.
+
     Attributes
     ----------
         id (int): The camera ID.
@@ -43,8 +47,10 @@ class VideoStream:
     __initialized: bool = False
     __instances: dict[int, "VideoStream"] = {}
 
-    __frame: np.ndarray
+    __frame: Frame
+    __new_frame: Condition
     __ret: bool
+    __sequence: int = 0
     __stopped: bool = True
     __thread: Thread
 
@@ -88,6 +94,8 @@ class VideoStream:
         self.resolution = resolution
         self.frame_rate = frame_rate
 
+        self.__new_frame = Condition()
+
     @property
     def stopped(self) -> bool:
         """Whether the video stream is stopped."""
@@ -99,8 +107,23 @@ class VideoStream:
 
     def next(self) -> np.ndarray:
         """Reads the next frame from the video stream."""
+        return self.__frame.image
+
+    def next_frame(self) -> Frame:
+        """Reads the next frame from the video stream, including its cached views."""
         return self.__frame
 
+    def wait_frame(self, sequence: int, timeout: float | None = None) -> Frame:
+        """Wait for a frame that is newer than the given one, instead of polling the stream.
+
+        :param sequence: The sequence number of the last frame that was read.
+        :param timeout: The maximum time to wait in seconds.
+        :return: The newest frame, which is not newer if the stream stopped or the wait timed out.
+        """
+        with self.__new_frame:
+            self.__new_frame.wait_for(lambda: self.__sequence > sequence or self.__stopped, timeout)
+            return self.__frame
+
     def start(self) -> None:
         """Starts the video stream."""
         if not self.__stopped:
@@ -127,7 +150,10 @@ class VideoStream:
         if self.__stopped:
             return
 
-        self.__stopped = True
+        with self.__new_frame:
+            self.__stopped = True
+            self.__new_frame.notify_all()
+
         self.__thread.join()
         self.capture.release()
 
@@ -137,11 +163,24 @@ class VideoStream:
             if self.__stopped:
                 break
 
-            self.__ret, self.__frame = self.capture.read()
+            self.__ret, image = self.capture.read()
             if not self.__ret:
                 self.stop()
                 break
 
+            self.__publish(image)
+
+    def __publish(self, image: np.ndarray) -> None:
+        """Publish a captured image to the consumers of the stream.
+
+        :param image: The captured image.
+        """
+        frame = Frame(image, self.__sequence + 1)
+        with self.__new_frame:
+            self.__sequence += 1
+            self.__frame = frame
+            self.__new_frame.notify_all()
+
     def __init_capture(self) -> None:
         """Initializes the video capture object."""
         self.capture = cv2.VideoCapture(self.id, get_camera_backend())
@@ -153,6 +192,8 @@ class VideoStream:
         self.capture.set(cv2.CAP_PROP_FPS, self.frame_rate)
 
         # Initialize the video stream.
-        self.__ret, self.__frame = self.capture.read()
+        self.__ret, image = self.capture.read()
         if not self.__ret:
             raise ValueError(f"Failed to open camera {self.id}.")
+
+        self.__publish(image)
@@ -0,0 +1,169 @@
+import numpy as np
+import pytest
+
+from src.utils.lidar.express_scan import CAPSULE_SIZE, LEGACY_CAPSULE, ExpressScanReader
+
+
+DESCRIPTOR = bytes([0xA5, 0x5A, CAPSULE_SIZE, 0, 0, 0x40, LEGACY_CAPSULE])
+ANGLE_STEP = 11.25
+
+
+class FakePort:
+    """A serial port that replays a recorded stream of the lidar.
+
+    Attributes
+    ----------
+        dtr: The state of the DTR line.
+        stale: The bytes that were received before the scan request, e.g. from a previous scan.
+        stream: The bytes the lidar sends after the scan request.
+        written: The bytes written to the port.
+
+    """
+
+    dtr: bool = True
+    stale: bytes
+    stream: bytes
+    written: bytes
+
+    def __init__(self, stream: bytes, stale: bytes = b"") -> None:
+        """Initialize the port.
+
+        :param stream: The bytes the lidar sends after the scan request.
+        :param stale: The bytes that were received before the scan request.
+        """
+        self.stale = stale
+        self.stream = stream
+        self.written = b""
+
+    def write(self, data: bytes) -> None:
+        """Write to the port.
+
+        :param data: The bytes to write.
+        """
+        self.written += data
+
+    def read(self, size: int) -> bytes:
+        """Read from the port, first the stale bytes and then the recorded stream.
+
+        :param size: The number of bytes to read.
+        :return: The bytes that were read.
+        """
+        if self.stale:
+            data, self.stale = self.stale[:size], self.stale[size:]
+            return data
+
+        if not self.stream:
+            raise EOFError("The recorded stream is over.")
+
+        data, self.stream = self.stream[:size], self.stream[size:]
+        return data
+
+    def reset_input_buffer(self) -> None:
+        """Discard the stale bytes."""
+        self.stale = b""
+
+    def setDTR(self, value: bool) -> None:  # noqa: N802
+        """Set the DTR line.
+
+        :param value: The state of the line.
+        """
+        self.dtr = value
+
+
+def legacy_capsule(start_angle: float, distances: np.ndarray, compensations: np.ndarray, new_scan: bool) -> bytes:
+    """Encode a legacy express capsule.
+
+    :param start_angle: The start angle of the capsule in degrees.
+    :param distances: The 32 distances of the capsule in millimeters.
+    :param compensations: The 32 angle compensations of the capsule in eighths of a degree (-32 to 31).
+    :param new_scan: Whether the capsule starts a new scan.
+    :return: The bytes of the capsule.
+    """
+    capsule = bytearray(CAPSULE_SIZE)
+    capsule[2:4] = (int(start_angle * 64) | (int(new_scan) << 15)).to_bytes(2, "little")
+
+    compensations = compensations & 0x3F
+    for cabin in range(16):
+        offset = 4 + 5 * cabin
+        for i in range(2):
+            measurement = 2 * cabin + i
+            raw = (int(distances[measurement]) << 2) | (int(compensations[measurement]) >> 4)
+            capsule[offset + 2 * i:offset + 2 * i + 2] = raw.to_bytes(2, "little")
+            capsule[offset + 4] |= (int(compensations[measurement]) & 0x0F) << (4 * i)
+
+    checksum = np.bitwise_xor.reduce(np.frombuffer(bytes(capsule[2:]), np.uint8))
+    capsule[0] = 0xA0 | (checksum & 0x0F)
+    capsule[1] = 0x50 | (checksum >> 4)
+    return bytes(capsule)
+
+
+@pytest.fixture
+def recording() -> tuple[bytes, np.ndarray, np.ndarray]:
+    """A recorded stream of 2 revolutions and a capsule, with the expected measurements.
+
+    :return: The stream, and the angles and distances of the measurements of the first revolution.
+    """
+    rng = np.random.default_rng(0)
+    count = 2 * 32 + 1
+
+    distances = rng.integers(0, 16000, (count, 32))
+    compensations = rng.integers(-32, 32, (count, 32))
+    start_angles = np.arange(count) * ANGLE_STEP % 360
+
+    stream = b"".join(
+        legacy_capsule(start_angles[i], distances[i], compensations[i], i == 0) for i in range(count)
+    )
+
+    base_angles = start_angles[:32, None] + ANGLE_STEP * np.arange(32) / 32
+    angles = (base_angles - compensations[:32] / 8) % 360
+    return stream, angles.ravel(), distances[:32].ravel().astype(np.float64)
+
+
+def test_replay(recording: tuple[bytes, np.ndarray, np.ndarray]) -> None:
+    """Test that a recorded stream is decoded, after the bytes of a previous scan are discarded."""
+    stream, angles, distances = recording
+    port = FakePort(DESCRIPTOR + stream, stale=stream[10:300])
+
+    reader = ExpressScanReader(port, capsules_per_read=3)
+    scans = reader.iter_scans()
+    scan_angles, scan_distances = next(scans)
+
+    assert port.written == b"\xa5\x25" + bytes([0xA5, 0x82, 5, 0, 0, 0, 0, 0, 0x22])
+    assert reader.capsule_type == LEGACY_CAPSULE
+    np.testing.assert_allclose(scan_angles, angles)
+    np.testing.assert_array_equal(scan_distances, distances)
+
+
+def test_resynchronize(recording: tuple[bytes, np.ndarray, np.ndarray]) -> None:
+    """Test that the reader resynchronizes on the capsules after corrupted data."""
+    stream, angles, distances = recording
+    corrupted = 5 * CAPSULE_SIZE
+    stream = stream[:corrupted + 20] + b"\xa5\x5a\x00" + stream[corrupted + 30:]
+
+    reader = ExpressScanReader(FakePort(DESCRIPTOR + stream), capsules_per_read=4)
+    scan_angles, scan_distances = next(reader.iter_scans())
+
+    # The capsule before the corrupted one cannot be interpolated, so its measurements are dropped.
+    kept = np.r_[:(corrupted // CAPSULE_SIZE - 1) * 32, (corrupted // CAPSULE_SIZE + 1) * 32:len(angles)]
+    np.testing.assert_allclose(scan_angles, angles[kept])
+    np.testing.assert_array_equal(scan_distances, distances[kept])
+
+
+def test_no_descriptor() -> None:
+    """Test that a missing reply to the scan request is an error."""
+    with pytest.raises(ValueError):
+        ExpressScanReader(FakePort(b"\xa5\x5a")).start()
+
+
+def test_motor() -> None:
+    """Test the commands that start and stop the motor."""
+    port = FakePort(b"")
+    reader = ExpressScanReader(port)
+
+    reader.start_motor()
+    assert not port.dtr
+    assert port.written == bytes([0xA5, 0xF0, 2, 0x94, 0x02, 0xA5 ^ 0xF0 ^ 2 ^ 0x94 ^ 0x02])
+
+    reader.stop_motor()
+    assert port.dtr
+    assert port.written.endswith(bytes([0xA5, 0xF0, 2, 0, 0, 0xA5 ^ 0xF0 ^ 2]))